@@ -0,0 +1,198 @@
+"""ASGI entry point for the student app.
+
+    python asgi.py --workers 4 --port 8000
+    uvicorn asgi:app --workers 4
+
+The listing, add, edit and delete routes run as async handlers on an
+aiosqlite engine with a bounded connection pool (ASGI_DB_POOL_SIZE); every
+other route (search, import, export, bulk operations, /_metrics) is served by
+the Flask app through a WSGI adapter. Templates are rendered by the Flask app
+so both modes produce the same pages. create_app() creates the schema and
+applies pending migrations before the server starts; workers starting
+together take turns on the database write lock.
+
+Needs sqlalchemy[asyncio], starlette, uvicorn, aiosqlite, python-multipart
+and a2wsgi.
+"""
+import argparse
+import os
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from flask import render_template
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import HTMLResponse, RedirectResponse, Response
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MultiDict
+
+from student_management import LISTING_COLUMNS, Student, create_app, db
+from student_management.database import sqlite_pragma_listener
+from student_management.listing import (STALE_CURSOR, VERSION_SQL, StaleCursor, cache_listing,
+                                        cached_listing, cursor_key, cursor_statement,
+                                        listing_filters, listing_not_modified, listing_statement,
+                                        listing_validators, page_args, render_listing, split_page)
+from student_management.validation import ValidationError, validate_student
+
+ASGI_DB_POOL_SIZE = int(os.environ.get('ASGI_DB_POOL_SIZE', 10))
+
+
+def render(request, template, **context):
+    # url_for(), the Jinja globals and the listing cache need a Flask
+    # request context.
+    flask_app = request.app.state.flask_app
+    with flask_app.test_request_context(request.url.path, query_string=request.url.query):
+        if template == 'index.html':
+            return render_listing(**context)
+        return render_template(template, **context)
+
+
+def listing_cache(request, call, *args):
+    with request.app.state.flask_app.app_context():
+        return call(*args)
+
+
+async def listing_page(conn, after, limit, sort, filters):
+    key, lookup = None, cursor_statement(after, sort)
+    try:
+        if lookup is not None:
+            key = cursor_key((await conn.execute(lookup)).first(), after)
+    except StaleCursor:
+        raise HTTPException(400, STALE_CURSOR) from None
+    rows = (await conn.execute(listing_statement(after, limit, sort, filters, key=key))).all()
+    return split_page(rows, limit)
+
+
+async def index(request):
+    args = MultiDict(request.query_params.multi_items())
+    after, limit, sort = page_args(args)
+    filters = listing_filters(args)
+    async with request.app.state.engine.connect() as conn:
+        try:
+            version, updated_at = (await conn.execute(VERSION_SQL)).one()
+        except OperationalError:
+            # AUTO_MIGRATE=0 and no migration 3 yet: render uncached.
+            await conn.rollback()
+            students, next_after = await listing_page(conn, after, limit, sort, filters)
+            return HTMLResponse(render(request, 'index.html', students=students, next_after=next_after,
+                                       after=after, limit=limit, sort=sort, filters=filters))
+        key, etag, last_modified = listing_validators(version, updated_at, after, limit, sort, filters)
+        environ = {'REQUEST_METHOD': 'GET'}
+        for header in ('if-none-match', 'if-modified-since'):
+            if header in request.headers:
+                environ['HTTP_' + header.upper().replace('-', '_')] = request.headers[header]
+        if listing_not_modified(environ, etag, updated_at):
+            response = Response(status_code=304)
+        else:
+            html = listing_cache(request, cached_listing, version, key)
+            if html is None:
+                students, next_after = await listing_page(conn, after, limit, sort, filters)
+                html = render(request, 'index.html', students=students, next_after=next_after,
+                              after=after, limit=limit, sort=sort, filters=filters)
+                listing_cache(request, cache_listing, version, key, html)
+            response = HTMLResponse(html)
+    response.headers['ETag'] = f'"{etag}"'
+    response.headers['Last-Modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+async def write_student(request, statement):
+    """Validate the posted form and run statement; returns (errors, rowcount)."""
+    form = await request.form()
+    try:
+        values = validate_student(form)
+    except ValidationError as exc:
+        return exc.errors, 0
+    try:
+        async with request.app.state.engine.begin() as conn:
+            result = await conn.execute(statement, values)
+    except IntegrityError:
+        return {'email': 'is already in use'}, 0
+    return None, result.rowcount
+
+
+async def add_student(request):
+    if request.method == 'POST':
+        errors, _ = await write_student(request, db.insert(Student.__table__))
+        if not errors:
+            return RedirectResponse('/', status_code=302)
+        return HTMLResponse(render(request, 'add_student.html', form=await request.form(),
+                                   errors=errors), status_code=400)
+    return HTMLResponse(render(request, 'add_student.html', form={}, errors={}))
+
+
+async def edit_student(request):
+    id = request.path_params['id']
+    if request.method == 'POST':
+        errors, rowcount = await write_student(
+            request, db.update(Student.__table__).where(Student.id == id))
+        if errors:
+            return HTMLResponse(render(request, 'edit_student.html', student=await request.form(),
+                                       errors=errors), status_code=400)
+        if not rowcount:
+            raise HTTPException(404)
+        return RedirectResponse('/', status_code=302)
+    async with request.app.state.engine.connect() as conn:
+        student = (await conn.execute(
+            db.select(*LISTING_COLUMNS).where(Student.id == id))).first()
+    if student is None:
+        raise HTTPException(404)
+    return HTMLResponse(render(request, 'edit_student.html', student=student, errors={}))
+
+
+async def delete(request):
+    async with request.app.state.engine.begin() as conn:
+        result = await conn.execute(
+            db.delete(Student.__table__).where(Student.id == request.path_params['id']))
+    if not result.rowcount:
+        raise HTTPException(404)
+    return RedirectResponse('/', status_code=302)
+
+
+def create_asgi_app(config=None):
+    flask_app = create_app(config)
+    with flask_app.app_context():
+        database_url = db.engine.url.set(drivername='sqlite+aiosqlite')
+    engine = create_async_engine(database_url, poolclass=AsyncAdaptedQueuePool,
+                                 pool_size=ASGI_DB_POOL_SIZE, max_overflow=0, pool_timeout=30)
+    db.event.listen(engine.sync_engine, 'connect',
+                    sqlite_pragma_listener(flask_app.config['SQLITE_PRAGMAS']))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    asgi_app = Starlette(routes=[
+        Route('/', index),
+        Route('/add', add_student, methods=['GET', 'POST']),
+        Route('/edit/{id:int}', edit_student, methods=['GET', 'POST']),
+        Route('/delete/{id:int}', delete),
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ], lifespan=lifespan)
+    asgi_app.state.flask_app = flask_app
+    asgi_app.state.engine = engine
+    return asgi_app
+
+
+app = create_asgi_app()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Serve the student app over ASGI.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    uvicorn.run('asgi:app', host=args.host, port=args.port, workers=args.workers,
+                log_level='warning', access_log=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,402 @@
+"""Concurrent load test for the Perfmetric manager and CFO dashboard APIs.
+
+    python -m benchmarks.api_load --base-url http://127.0.0.1:8000 --users 50 --ramp-up 10 --duration 60
+    python -m benchmarks.api_load --stub --employees 2000 --tasks 200000 --output load.json
+    python -m benchmarks.api_load --stub --baseline load.json
+
+Each virtual user logs in once through /auth/login-json, then replays
+weighted scenarios until --duration runs out: a scenario is one dashboard
+page load, so its requests go out together the way the frontend fires them.
+Users start evenly spread over --ramp-up seconds and keep a small pool of
+keep-alive HTTP/1.1 connections (--connections per user). Replaces the
+test_*.ps1 scripts: endpoints that list expected fields count a 200 without
+them as an error.
+
+--stub seeds a temporary database and runs python -m stub_api against it.
+Reports per-endpoint p50/p90/p95/p99 latency, error rate and throughput as a
+table, and as JSON with --output; --baseline diffs against an earlier report.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from benchmarks.load import wait_for_port
+from benchmarks.run import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = 'Perfmetric@123'
+MANAGER_FIELDS = ('total_tasks', 'approved_tasks', 'in_progress_tasks', 'overdue_tasks')
+SCORE_FIELDS = ('manager_score_current', 'team_score_current', 'manager_personal_score_current',
+                'manager_score_delta_percent')
+
+# (label, method, path, expected fields); paths are str.format()ed with the
+# date variables from date_variables() and a random page number.
+MANAGER_ENDPOINTS = {
+    'manager_dashboard': ('GET', '/dashboard/manager', MANAGER_FIELDS),
+    'manager_today': ('GET', '/dashboard/manager/today', ()),
+    'manager_analytics': ('GET', '/dashboard/manager/analytics', SCORE_FIELDS),
+    'manager_analytics_range': (
+        'GET', '/dashboard/manager/analytics?from_date={previous_start}&to_date={previous_end}', SCORE_FIELDS),
+    'team_performance': ('GET', '/dashboard/manager/team-performance', ()),
+    'team_performance_range': (
+        'GET', '/dashboard/manager/team-performance?from_date={month_start}&to_date={today}', ()),
+    'employee_risk': ('GET', '/dashboard/manager/employee-risk', ()),
+    'manager_trends': ('GET', '/dashboard/manager/trends?days=30', ()),
+    'team_tasks': ('GET', '/tasks/team?page={page}&limit=20', ('items', 'total')),
+    'notifications': ('GET', '/notifications?limit=20', ()),
+    'manager_export_pdf': ('GET', '/reports/manager/export-pdf', ()),
+}
+CFO_ENDPOINTS = {
+    'cfo_dashboard': ('GET', '/dashboard/cfo', ()),
+    'cfo_today': ('GET', '/dashboard/cfo/today', ()),
+    'cfo_departments': ('GET', '/dashboard/cfo/departments', ()),
+    'cfo_trends': ('GET', '/dashboard/cfo/trends?months=6', ()),
+    'cfo_org_metrics': ('GET', '/dashboard/cfo/org-metrics', ('org_avg_completion_rate',)),
+    'cfo_employees': ('GET', '/dashboard/cfo/employees-performance?limit=50', ()),
+    'okr_overview': ('GET', '/reports/cfo/okr/overview?from_date={month_start}&to_date={today}', ()),
+    'org_tree': ('GET', '/org/tree?depth=2', ('root',)),
+    'cfo_export_excel': ('GET', '/reports/cfo/export-excel?from_date={month_start}&to_date={today}', ()),
+    'notifications': ('GET', '/notifications?limit=20', ()),
+}
+# role -> [(weight, scenario, endpoint labels requested together)]
+SCENARIOS = {
+    'MANAGER': [
+        (30, 'manager_home', ('manager_dashboard', 'manager_analytics', 'manager_today', 'notifications')),
+        (20, 'manager_team', ('team_performance', 'employee_risk', 'manager_trends')),
+        (15, 'manager_history', ('manager_analytics_range', 'team_performance_range')),
+        (25, 'manager_tasks', ('team_tasks',)),
+        (2, 'manager_export', ('manager_export_pdf',)),
+    ],
+    'CFO': [
+        (35, 'cfo_home', ('cfo_dashboard', 'cfo_org_metrics', 'cfo_today', 'notifications')),
+        (25, 'cfo_departments', ('cfo_departments', 'cfo_trends', 'cfo_employees')),
+        (15, 'cfo_okr', ('okr_overview',)),
+        (15, 'cfo_org', ('org_tree',)),
+        (2, 'cfo_export', ('cfo_export_excel',)),
+    ],
+}
+ENDPOINTS = {'MANAGER': MANAGER_ENDPOINTS, 'CFO': CFO_ENDPOINTS}
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection (Content-Length and chunked bodies)."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def request(self, method, target, headers, body=b''):
+        head = [f'{method} {target} HTTP/1.1'] + [f'{name}: {value}' for name, value in headers.items()]
+        if body:
+            head.append(f'Content-Length: {len(body)}')
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('server closed the connection')
+        status = int(status_line.split(b' ', 2)[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append((await self.reader.readexactly(size + 2))[:-2])
+            payload = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            payload = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            payload = await self.reader.read()
+            self.reusable = False
+        if response_headers.get('connection', '').lower() == 'close':
+            self.reusable = False
+        return status, payload
+
+    def close(self):
+        self.writer.close()
+
+
+class Pool:
+    """Up to `size` keep-alive connections to one origin, reused across requests."""
+
+    def __init__(self, base_url, size, counters):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.prefix = parts.path.rstrip('/')
+        self.host_header = parts.netloc
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.counters = counters
+
+    async def request(self, method, path, headers=None, body=b''):
+        async with self.slots:
+            if self.idle:
+                connection = self.idle.pop()
+            else:
+                connection = Connection(*await asyncio.open_connection(self.host, self.port, ssl=self.ssl))
+                self.counters['connections_opened'] += 1
+            headers = dict(headers or {}, Host=self.host_header)
+            try:
+                result = await connection.request(method, self.prefix + path, headers, body)
+            except BaseException:
+                connection.close()
+                raise
+            if connection.reusable:
+                self.idle.append(connection)
+            else:
+                connection.close()
+            return result
+
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = Counter()
+        self.statuses = {}
+
+    def add(self, label, seconds, status, ok):
+        self.samples.setdefault(label, []).append(seconds)
+        self.statuses.setdefault(label, Counter())[str(status)] += 1
+        if not ok:
+            self.errors[label] += 1
+
+
+def summarize(samples, errors, elapsed):
+    ordered = sorted(samples)
+    if not ordered:
+        return {'requests': 0, 'errors': errors, 'error_rate': 0.0}
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'error_rate': round(errors / len(ordered), 4),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 90) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'rps': round(len(ordered) / elapsed, 1),
+    }
+
+
+def date_variables(today):
+    month_start = today.replace(day=1)
+    previous_end = month_start - datetime.timedelta(days=1)
+    return {'today': today.isoformat(), 'month_start': month_start.isoformat(),
+            'previous_start': previous_end.replace(day=1).isoformat(), 'previous_end': previous_end.isoformat()}
+
+
+async def timed(pool, recorder, label, method, path, headers, expected=(), body=b''):
+    started = time.perf_counter()
+    try:
+        status, payload = await pool.request(method, path, headers, body)
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        recorder.add(label, time.perf_counter() - started, 'connection_error', False)
+        return None, None
+    ok = status < 400 and all(f'"{field}"'.encode() in payload for field in expected)
+    recorder.add(label, time.perf_counter() - started, status, ok)
+    return status, payload
+
+
+async def login(pool, recorder, emp_id, password):
+    body = json.dumps({'emp_id': emp_id, 'password': password}).encode()
+    status, payload = await timed(pool, recorder, 'login', 'POST', '/auth/login-json',
+                                  {'Content-Type': 'application/json'}, ('access_token',), body)
+    if status != 200:
+        return None
+    return json.loads(payload)['access_token']
+
+
+async def virtual_user(role, emp_id, args, recorder, counters, start_delay, stop_at, rng):
+    await asyncio.sleep(start_delay)
+    pool = Pool(args.base_url, args.connections, counters)
+    loop = asyncio.get_running_loop()
+    try:
+        token = await login(pool, recorder, emp_id, args.password)
+        if token is None:
+            counters['failed_logins'] += 1
+            return
+        headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+        endpoints = ENDPOINTS[role]
+        weights = [weight for weight, _, _ in SCENARIOS[role]]
+        variables = date_variables(args.today)
+        while loop.time() < stop_at:
+            _, scenario, labels = rng.choices(SCENARIOS[role], weights)[0]
+            counters[f'scenario:{scenario}'] += 1
+            requests = []
+            for label in labels:
+                method, path, expected = endpoints[label]
+                path = path.format(page=rng.randint(1, 5), **variables)
+                requests.append(timed(pool, recorder, label, method, path, headers, expected))
+            await asyncio.gather(*requests)
+            if args.think:
+                await asyncio.sleep(rng.expovariate(1000 / args.think))
+    finally:
+        pool.close()
+
+
+async def manager_ids(args, recorder, counters):
+    """Manager ids to log in as: --managers, else the active managers the CFO can list."""
+    if args.managers:
+        return args.managers.split(',')
+    pool = Pool(args.base_url, 1, counters)
+    try:
+        token = await login(pool, recorder, args.cfo, args.password)
+        if token is not None:
+            status, payload = await pool.request('GET', '/employees?role=MANAGER&active=true',
+                                                 {'Authorization': f'Bearer {token}'})
+            if status == 200:
+                return [row['emp_id'] for row in json.loads(payload)] or ['MGR_AP']
+    finally:
+        pool.close()
+    return ['MGR_AP']
+
+
+async def run(args):
+    recorder, counters = Recorder(), Counter()
+    managers = await manager_ids(args, Recorder(), Counter())
+    cfo_users = round(args.users * args.cfo_share)
+    rng = random.Random(args.seed)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    stop_at = started + args.ramp_up + args.duration
+    users = []
+    for index in range(args.users):
+        role, emp_id = ('CFO', args.cfo) if index < cfo_users else ('MANAGER', managers[index % len(managers)])
+        delay = args.ramp_up * index / args.users
+        users.append(virtual_user(role, emp_id, args, recorder, counters, delay, stop_at,
+                                  random.Random(rng.getrandbits(64))))
+    await asyncio.gather(*users)
+    elapsed = loop.time() - started
+    endpoints = {label: summarize(samples, recorder.errors[label], elapsed)
+                 for label, samples in sorted(recorder.samples.items())}
+    for label, summary in endpoints.items():
+        summary['statuses'] = dict(recorder.statuses[label])
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'base_url': args.base_url,
+        'users': args.users,
+        'cfo_users': cfo_users,
+        'ramp_up_s': args.ramp_up,
+        'duration_s': args.duration,
+        'elapsed_s': round(elapsed, 3),
+        'seed': args.seed,
+        'connections_per_user': args.connections,
+        'counters': dict(sorted(counters.items())),
+        'totals': summarize(all_samples, sum(recorder.errors.values()), elapsed),
+        'endpoints': endpoints,
+    }
+
+
+def compare(current, baseline):
+    print(f"{'endpoint':<26}{'req':>8}{'err %':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'req/s':>10}{'vs base p95':>14}{'vs base req/s':>15}")
+    rows = list(current['endpoints'].items()) + [('TOTAL', current['totals'])]
+    for name, stats in rows:
+        base = (baseline['totals'] if name == 'TOTAL' else baseline['endpoints'].get(name)) if baseline else None
+        if not stats['requests']:
+            print(f"{name:<26}{0:>8}")
+            continue
+        p95_delta = rps_delta = 'n/a'
+        if base and base.get('requests'):
+            p95_delta = f"{(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.1f}%" if base['p95_ms'] else 'n/a'
+            rps_delta = f"{(stats['rps'] / base['rps'] - 1) * 100:+.1f}%" if base['rps'] else 'n/a'
+        print(f"{name:<26}{stats['requests']:>8}{stats['error_rate'] * 100:>8.2f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['rps']:>10.1f}{p95_delta:>14}{rps_delta:>15}")
+
+
+def start_stub(args, tmp):
+    db_path = os.path.join(tmp, 'stub.db')
+    command = [sys.executable, '-m', 'stub_api', '--db', db_path, '--port', str(args.port),
+               '--workers', str(args.stub_workers), '--employees', str(args.employees),
+               '--tasks', str(args.tasks), '--seed', str(args.seed), '--today', args.today.isoformat()]
+    subprocess.run(command + ['--seed-only'], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(args.port)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', help='API to load (default: the --stub server)')
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--cfo-share', type=float, default=0.2, help='fraction of users logged in as the CFO')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users start')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load after the ramp-up')
+    parser.add_argument('--think', type=float, default=0, help='mean pause between scenarios, ms')
+    parser.add_argument('--connections', type=int, default=4, help='keep-alive connections per user')
+    parser.add_argument('--managers', help='comma-separated manager ids (default: ask the API)')
+    parser.add_argument('--cfo', default='CFO001')
+    parser.add_argument('--password', default=PASSWORD)
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', help='JSON report from an earlier run to compare against')
+    stub = parser.add_argument_group('stand-in server')
+    stub.add_argument('--stub', action='store_true', help='seed and start python -m stub_api for the run')
+    stub.add_argument('--port', type=int, default=8766)
+    stub.add_argument('--stub-workers', type=int, default=1)
+    stub.add_argument('--employees', type=int, default=200)
+    stub.add_argument('--tasks', type=int, default=20_000)
+    args = parser.parse_args()
+    if not args.stub and not args.base_url:
+        parser.error('give --base-url or --stub')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.stub:
+            server = start_stub(args, tmp)
+            args.base_url = args.base_url or f'http://127.0.0.1:{args.port}'
+        try:
+            report = asyncio.run(run(args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    compare(report, baseline)
+    counters = report['counters']
+    print(f"{report['users']} users, {counters.get('connections_opened', 0)} connections opened, "
+          f"{counters.get('failed_logins', 0)} failed logins")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
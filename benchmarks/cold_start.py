@@ -0,0 +1,70 @@
+"""Cold-start time of the student app: import, create_app, schema, first request.
+
+    python -m benchmarks.cold_start --runs 10 --max-ms 500 --output cold-start.json
+
+Every run is a fresh interpreter against an in-memory database, so module
+import costs are measured for real. Exits non-zero when the median total
+exceeds --max-ms, which makes it usable as a CI gate.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, time
+t0 = time.perf_counter()
+from student_management import create_app, init_db
+t1 = time.perf_counter()
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+t2 = time.perf_counter()
+with app.app_context():
+    init_db()
+t3 = time.perf_counter()
+status = app.test_client().get('/').status_code
+t4 = time.perf_counter()
+assert status == 200, status
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'init_db_ms': (t3 - t2) * 1000,
+    'first_request_ms': (t4 - t3) * 1000,
+    'total_ms': (t4 - t0) * 1000,
+}))
+'''
+
+
+def measure(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: round(statistics.median(sample[key] for sample in samples), 2)
+            for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, help='fail if the median total exceeds this')
+    parser.add_argument('--output', help='write the medians as JSON here')
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    for key, value in result.items():
+        print(f'{key:<18}{value:>10.2f}')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(result, runs=args.runs), f, indent=2)
+    if args.max_ms is not None and result['total_ms'] > args.max_ms:
+        print(f"cold start {result['total_ms']:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
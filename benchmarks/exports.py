@@ -0,0 +1,94 @@
+"""Time-to-first-byte and peak memory of the stand-in API's report exports.
+
+    python -m benchmarks.exports --employees 2000 --tasks 1000000
+
+Seeds a database, starts python -m stub_api on it and downloads every
+report export for a date range covering all tasks, one at a time. Prints
+time to first byte, total time, size and the server's peak resident memory
+(VmHWM) after each download; with streaming exports the peak should not
+grow with --tasks.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load import wait_for_port
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORTS = (
+    '/reports/performance.csv?from_date={start}&to_date={today}',
+    '/reports/performance.xlsx?from_date={start}&to_date={today}',
+    '/reports/performance.pdf?from_date={start}&to_date={today}',
+    '/reports/cfo/export-excel?from_date={start}&to_date={today}',
+    '/reports/manager/export-pdf?from_date={start}&to_date={today}&department_id=AP',
+)
+
+
+def peak_rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def download(port, path, token):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    started = time.perf_counter()
+    conn.request('GET', path, headers={'Authorization': f'Bearer {token}'})
+    response = conn.getresponse()
+    size = len(response.read(1))
+    first_byte = time.perf_counter() - started
+    while True:
+        chunk = response.read(1 << 16)
+        if not chunk:
+            break
+        size += len(chunk)
+    total = time.perf_counter() - started
+    conn.close()
+    return response.status, first_byte, total, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=datetime.date(2026, 4, 8))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'stub.db')
+        command = [sys.executable, '-m', 'stub_api', '--db', db_path, '--port', str(args.port),
+                   '--employees', str(args.employees), '--tasks', str(args.tasks),
+                   '--today', args.today.isoformat()]
+        subprocess.run(command + ['--seed-only'], cwd=ROOT, check=True)
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(args.port)
+            conn = http.client.HTTPConnection('127.0.0.1', args.port)
+            conn.request('POST', '/auth/login-json', json.dumps({'emp_id': 'CFO001', 'password': 'Perfmetric@123'}),
+                         {'Content-Type': 'application/json'})
+            token = json.loads(conn.getresponse().read())['access_token']
+            conn.close()
+            print(f'server idle peak RSS {peak_rss_mb(server.pid):.1f} MB')
+            print(f"{'export':<34}{'status':>7}{'first byte ms':>15}{'total s':>9}{'MB':>9}{'peak RSS MB':>13}")
+            start = (args.today - datetime.timedelta(days=366)).isoformat()
+            for template in EXPORTS:
+                path = template.format(start=start, today=args.today.isoformat())
+                status, first_byte, total, size = download(args.port, path, token)
+                print(f"{path.split('?')[0]:<34}{status:>7}{first_byte * 1000:>15.1f}{total:>9.2f}"
+                      f"{size / 1e6:>9.1f}{peak_rss_mb(server.pid):>13.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
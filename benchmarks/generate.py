@@ -0,0 +1,84 @@
+"""Seeded synthetic data generator for the student app.
+
+    python -m benchmarks.generate --size 100k --db /tmp/students-100k.db
+
+The same --seed and size always produce the same rows. The schema is created
+through the app itself (create_all + migrations) so indexes, the FTS table
+and the version triggers match what the app runs against.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+
+from student_management import create_app, db, init_db
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+BATCH_SIZE = 10_000
+
+FIRST_NAMES = ('Aarav', 'Aisha', 'Ben', 'Chen', 'Diego', 'Elena', 'Fatima', 'George',
+               'Hana', 'Ivan', 'Jia', 'Kofi', 'Leila', 'Mateo', 'Nadia', 'Omar',
+               'Priya', 'Quinn', 'Rosa', 'Sarath', 'Tariq', 'Uma', 'Victor', 'Wen',
+               'Xavier', 'Yara', 'Zane')
+LAST_NAMES = ('Ahmed', 'Brown', 'Costa', 'Das', 'Evans', 'Fischer', 'Garcia', 'Haddad',
+              'Ito', 'Jones', 'Khan', 'Lopez', 'Martin', 'Nair', 'Okafor', 'Patel',
+              'Rossi', 'Silva', 'Tanaka', 'Usman', 'Varga', 'Wang', 'Yilmaz', 'Zhou')
+COURSES = ('Computer Science', 'Mechanical Engineering', 'Electrical Engineering',
+           'Business Administration', 'Economics', 'Physics', 'Mathematics',
+           'Biology', 'Chemistry', 'Civil Engineering', 'Psychology', 'Law',
+           'Medicine', 'Architecture', 'Data Science', 'Accounting')
+
+
+def create_schema(path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(path)}'})
+    with app.app_context():
+        init_db()
+        db.engine.dispose()
+
+
+def rows(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield (f'{first} {last}', f'{first.lower()}.{last.lower()}{i}@example.com',
+               rng.choice(COURSES), rng.randint(17, 35))
+
+
+def generate(path, count, seed=42):
+    if os.path.exists(path):
+        os.remove(path)
+    create_schema(path)
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.execute('PRAGMA synchronous = OFF')
+    source = rows(count, seed)
+    with connection:
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), source)]
+            if not batch:
+                break
+            connection.executemany(
+                'INSERT INTO student (name, email, course, age) VALUES (?, ?, ?, ?)', batch)
+    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    connection.execute('ANALYZE')
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=SIZES, default='10k')
+    parser.add_argument('--rows', type=int, help='exact row count, overrides --size')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', required=True)
+    args = parser.parse_args()
+
+    count = args.rows or SIZES[args.size]
+    started = time.perf_counter()
+    generate(args.db, count, args.seed)
+    elapsed = time.perf_counter() - started
+    print(f'Generated {count} students in {args.db} in {elapsed:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Recursive walks vs the closure-table hierarchy index on a synthetic org.
+
+    python -m benchmarks.hierarchy --employees 100000 --span 8
+
+Builds an org where every manager has about --span reports (depth grows as
+log_span(employees); --span 3 gives a deep, narrow org), indexes it with
+stub_api.hierarchy and times the queries the team-scoped endpoints make,
+once as a recursive CTE over employee.manager_emp_id and once against
+employee_closure. Also times rebuilding the index and the incremental
+add/move maintenance.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from stub_api import hierarchy, store
+
+SUBTREE_CTE = '''
+    WITH RECURSIVE walk(emp_id, depth) AS (
+        SELECT ?, 0
+        UNION ALL
+        SELECT e.emp_id, walk.depth + 1 FROM employee e JOIN walk ON e.manager_emp_id = walk.emp_id
+        WHERE walk.depth < ?
+    )
+    SELECT COUNT(*) FROM walk JOIN employee e USING (emp_id) WHERE e.active = 1
+'''
+SUBTREE_CLOSURE = '''
+    SELECT COUNT(*) FROM employee_closure c JOIN employee e ON e.emp_id = c.descendant_emp_id
+    WHERE c.ancestor_emp_id = ? AND c.depth <= ? AND e.active = 1
+'''
+ANCESTORS_CTE = '''
+    WITH RECURSIVE up(emp_id) AS (
+        SELECT manager_emp_id FROM employee WHERE emp_id = ?
+        UNION ALL
+        SELECT e.manager_emp_id FROM employee e JOIN up ON e.emp_id = up.emp_id WHERE e.manager_emp_id IS NOT NULL
+    )
+    SELECT COUNT(*) FROM up WHERE emp_id IS NOT NULL
+'''
+ANCESTORS_CLOSURE = 'SELECT COUNT(*) FROM employee_closure WHERE descendant_emp_id = ? AND depth > 0'
+UNBOUNDED = 1 << 30
+
+
+def build(connection, employees, span, seed):
+    """Employees E0..E{n-1}; E0 is the root and each level fills breadth-first."""
+    rng = random.Random(seed)
+    rows = [('E0', 'Root', 'CFO', 'D0', None)]
+    for index in range(1, employees):
+        manager = (index - 1) // span
+        rows.append((f'E{index}', f'Employee {index}', 'EMPLOYEE', f'D{manager % 500}', f'E{manager}'))
+    connection.executemany('INSERT INTO employee VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                           [(emp_id, name, f'{emp_id}@example.com', role, dept, manager,
+                             int(rng.random() > 0.02), 'x') for emp_id, name, role, dept, manager in rows])
+
+
+def timed(connection, sql, args, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = connection.execute(sql, args).fetchone()[0]
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=100_000)
+    parser.add_argument('--span', type=int, default=8, help='reports per manager')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection = store.connect(os.path.join(tmp, 'org.db'))
+        store.create_schema(connection)
+        connection.execute('BEGIN')
+        build(connection, args.employees, args.span, args.seed)
+        started = time.perf_counter()
+        rows = hierarchy.rebuild(connection)
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        depth = connection.execute('SELECT MAX(depth) FROM employee_closure').fetchone()[0]
+        print(f'{args.employees} employees, span {args.span}, depth {depth}: '
+              f'{rows} closure rows built in {time.perf_counter() - started:.2f}s')
+
+        middle = f'E{(args.employees // args.span ** 2) or 1}'
+        leaf = f'E{args.employees - 1}'
+        cases = (
+            ('whole org', SUBTREE_CTE, SUBTREE_CLOSURE, ('E0', UNBOUNDED)),
+            ('whole org, depth <= 2', SUBTREE_CTE, SUBTREE_CLOSURE, ('E0', 2)),
+            (f'subtree of {middle}', SUBTREE_CTE, SUBTREE_CLOSURE, (middle, UNBOUNDED)),
+            (f'direct reports of {middle}', SUBTREE_CTE, SUBTREE_CLOSURE, (middle, 1)),
+            (f'ancestors of {leaf}', ANCESTORS_CTE, ANCESTORS_CLOSURE, (leaf,)),
+        )
+        print(f"{'query':<34}{'rows':>8}{'recursive ms':>14}{'closure ms':>12}{'speed-up':>10}")
+        for name, recursive_sql, closure_sql, query_args in cases:
+            recursive_ms, expected = timed(connection, recursive_sql, query_args, args.repeat)
+            closure_ms, result = timed(connection, closure_sql, query_args, args.repeat)
+            if result != expected:
+                raise SystemExit(f'{name}: closure returned {result}, recursive walk {expected}')
+            print(f'{name:<34}{result:>8}{recursive_ms:>14.3f}{closure_ms:>12.3f}'
+                  f'{recursive_ms / max(closure_ms, 1e-6):>9.1f}x')
+
+        started = time.perf_counter()
+        with connection:
+            connection.execute('BEGIN')
+            connection.execute("INSERT INTO employee VALUES ('NEW1', 'New', 'n@example.com', 'EMPLOYEE', 'D0', ?, 1, 'x')",
+                               (leaf,))
+            hierarchy.add(connection, 'NEW1', leaf)
+        print(f'add a leaf under {leaf}: {(time.perf_counter() - started) * 1000:.2f} ms')
+        size = connection.execute('SELECT COUNT(*) FROM employee_closure WHERE ancestor_emp_id = ?',
+                                  (middle,)).fetchone()[0]
+        started = time.perf_counter()
+        with connection:
+            connection.execute('BEGIN')
+            connection.execute("UPDATE employee SET manager_emp_id = 'E1' WHERE emp_id = ?", (middle,))
+            hierarchy.move(connection, middle, 'E1')
+        print(f'move {middle} ({size} people) under E1: {(time.perf_counter() - started) * 1000:.2f} ms')
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""HTTP load test: Werkzeug dev server vs the ASGI entry point.
+
+    python -m benchmarks.load --size 10k --clients 32 --seconds 10 --workers 4
+
+Each target is started as a subprocess against its own copy of a generated
+database, then hammered by --clients threads over keep-alive connections
+with a mix of listing pages (mostly cache-busting deep pages). Reports
+requests/sec and p50/p95 latency per target.
+"""
+import argparse
+import http.client
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.generate import COURSES, SIZES, generate
+from benchmarks.run import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def targets(port, workers):
+    return {
+        'dev': [sys.executable, '-c',
+                f'from app import app; app.run(port={port}, debug=False)'],
+        'asgi': [sys.executable, 'asgi.py', '--port', str(port), '--workers', str(workers)],
+    }
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def hammer(port, clients, seconds, max_id):
+    stop = time.monotonic() + seconds
+    samples, errors = [], [0]
+    lock = threading.Lock()
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        while time.monotonic() < stop:
+            roll = rng.random()
+            if roll < 0.2:
+                path = '/'
+            elif roll < 0.4:
+                path = f'/?course={rng.choice(COURSES).replace(" ", "+")}'
+            else:
+                path = f'/?after={rng.randrange(max_id)}'
+            t0 = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise http.client.HTTPException(response.status)
+                local.append(time.perf_counter() - t0)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    samples.sort()
+    return {
+        'rps': len(samples) / seconds,
+        'p50_ms': percentile(samples, 50) * 1000 if samples else 0,
+        'p95_ms': percentile(samples, 95) * 1000 if samples else 0,
+        'errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=SIZES, default='10k')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--targets', nargs='+', default=['dev', 'asgi'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.db')
+        generate(source, SIZES[args.size])
+        print(f"{'target':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for name in args.targets:
+            db_path = os.path.join(tmp, f'{name}.db')
+            shutil.copyfile(source, db_path)
+            env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', SQLITE_PROFILE='production')
+            server = subprocess.Popen(targets(args.port, args.workers)[name], cwd=ROOT, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(args.port)
+                result = hammer(args.port, args.clients, args.seconds, SIZES[args.size])
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{name:<8}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}"
+                  f"{result['p95_ms']:>10.2f}{result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Badge reads, page depth and fan-out against a large notification table.
+
+    python -m benchmarks.notifications --users 10000 --notifications 10000000
+
+Fills a database with --notifications rows spread over --users employees
+with a Zipf-like skew (a few very busy inboxes, a long tail of quiet ones),
+about --unread of them unread, and builds stub_api.inbox's counters. Then
+compares, for inboxes of different sizes, the old badge (COUNT(*) of unread
+rows) with the counter read, offset paging with cursor paging at growing
+depth, row-by-row with bulk fan-out, and times read-all.
+"""
+import argparse
+import datetime
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from stub_api import inbox, store
+
+KINDS = ('TASK_ASSIGNED', 'TASK_DUE_SOON', 'TASK_OVERDUE', 'TASK_APPROVED', 'TASK_REWORK')
+
+
+def fill(connection, users, count, unread, skew, rng):
+    """Rows in created_at order, as an append-only inbox would see them."""
+    weights = list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(users)))
+    start = datetime.datetime(2025, 1, 1)
+    step = 365 * 86400 / count
+    for offset in range(0, count, store.BATCH_SIZE * 10):
+        size = min(store.BATCH_SIZE * 10, count - offset)
+        owners = rng.choices(range(users), cum_weights=weights, k=size)
+        connection.executemany(
+            'INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            [(f'E{owner}', KINDS[n % 5], f'Notification {offset + n}', offset + n, int(rng.random() >= unread),
+              (start + datetime.timedelta(seconds=int((offset + n) * step))).isoformat())
+             for n, owner in enumerate(owners)])
+
+
+def timed(function, repeat=5):
+    """Median milliseconds of function() and its last result."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--notifications', type=int, default=10_000_000)
+    parser.add_argument('--unread', type=float, default=0.3, help='fraction of rows unread')
+    parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent of inbox sizes')
+    parser.add_argument('--limit', type=int, default=20, help='page size')
+    parser.add_argument('--fan-out', type=int, default=100_000, help='notifications in the fan-out test')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection = store.connect(os.path.join(tmp, 'notifications.db'))
+        store.create_schema(connection)
+        started = time.perf_counter()
+        connection.execute('BEGIN')
+        fill(connection, args.users, args.notifications, args.unread, args.skew, random.Random(args.seed))
+        connection.execute('COMMIT')
+        filled = time.perf_counter() - started
+        started = time.perf_counter()
+        connection.execute('BEGIN')
+        inbox.rebuild(connection)
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        print(f'{args.notifications} notifications for {args.users} users in {filled:.0f}s; '
+              f'counters built in {time.perf_counter() - started:.1f}s')
+
+        sizes = connection.execute('SELECT emp_id, COUNT(*) AS n FROM notification GROUP BY emp_id '
+                                   'ORDER BY n DESC').fetchall()
+        picks = {'largest': sizes[0], 'p99': sizes[len(sizes) // 100], 'median': sizes[len(sizes) // 2],
+                 'smallest': sizes[-1]}
+        print(f"\n{'badge':<10}{'inbox':>10}{'unread':>9}{'COUNT(*) ms':>13}{'counter ms':>12}")
+        for label, (emp_id, total) in picks.items():
+            count_ms, expected = timed(lambda: connection.execute(
+                'SELECT COUNT(*) FROM notification WHERE emp_id = ? AND is_read = 0', (emp_id,)).fetchone()[0])
+            counter_ms, unread = timed(lambda: inbox.unread_count(connection, emp_id))
+            if unread != expected:
+                raise SystemExit(f'{emp_id}: counter says {unread}, COUNT(*) {expected}')
+            print(f'{label:<10}{total:>10}{unread:>9}{count_ms:>13.3f}{counter_ms:>12.4f}')
+
+        emp_id, total = picks['largest']
+        print(f"\n{'page at row':<12}{'offset ms':>11}{'cursor ms':>11}   (inbox of {total})")
+        for depth in (0, 1_000, 10_000, 100_000, total - args.limit):
+            if depth < 0 or depth > total - args.limit:
+                continue
+            cursor = None
+            if depth:
+                row = connection.execute('SELECT created_at, notification_id FROM notification WHERE emp_id = ? '
+                                         'ORDER BY created_at DESC, notification_id DESC LIMIT 1 OFFSET ?',
+                                         (emp_id, depth - 1)).fetchone()
+                cursor = inbox.encode_cursor(row)
+            offset_ms, by_offset = timed(lambda: inbox.page(connection, emp_id, args.limit, offset=depth)[0])
+            cursor_ms, by_cursor = timed(lambda: inbox.page(connection, emp_id, args.limit, cursor=cursor)[0])
+            if [r['notification_id'] for r in by_offset] != [r['notification_id'] for r in by_cursor]:
+                raise SystemExit(f'page at {depth}: offset and cursor pages differ')
+            print(f'{depth:<12}{offset_ms:>11.3f}{cursor_ms:>11.3f}')
+
+        rows = [(f'E{n % args.users}', 'TASK_DUE_SOON', 'Fan-out', n) for n in range(args.fan_out)]
+
+        def row_by_row():
+            for row in rows:
+                connection.execute(inbox.INSERT, row + (store.now(),))
+                connection.execute(inbox.ADD_UNREAD, (row[0], 1))
+
+        def rolled_back(function):
+            connection.execute('BEGIN IMMEDIATE')
+            function()
+            connection.execute('ROLLBACK')
+
+        one_by_one, _ = timed(lambda: rolled_back(row_by_row), repeat=3)
+        bulk, _ = timed(lambda: rolled_back(lambda: inbox.fan_out(connection, rows)), repeat=3)
+        print(f'\nfan-out of {args.fan_out} to {args.users} users: {one_by_one:.1f} ms row by row, '
+              f'{bulk:.1f} ms as one bulk insert (both with counters, rolled back)')
+        unread = inbox.unread_count(connection, emp_id)
+        started = time.perf_counter()
+        updated = inbox.mark_all_read(connection, emp_id)
+        print(f'read-all for the largest inbox: {updated} rows in {(time.perf_counter() - started) * 1000:.1f} ms '
+              f'(badge {unread} -> {inbox.unread_count(connection, emp_id)})')
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
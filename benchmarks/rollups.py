@@ -0,0 +1,139 @@
+"""Dashboards from raw tasks vs the daily rollups, and the cost of keeping them.
+
+    python -m benchmarks.rollups --employees 2000 --tasks 1000000
+
+Seeds a database with stub_api.store.seed (which builds the rollups), then
+calls the manager and CFO dashboard handlers once with their statistics
+computed from the task table, as before, and once from
+stub_api.rollups, checking both give the same payload. Then times
+transitions with and without the incremental rollup update, moving the
+overdue counts to the next day, a full rebuild and the consistency check.
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+import types
+
+from stub_api import handlers, rollups, store
+
+
+@contextlib.contextmanager
+def raw_statistics():
+    """Answer rollup_stats() calls with stats_by() over task."""
+    rollup_stats = handlers.rollup_stats
+    handlers.rollup_stats = handlers.stats_by
+    try:
+        yield
+    finally:
+        handlers.rollup_stats = rollup_stats
+
+
+def context(connection, user, today, params):
+    request = types.SimpleNamespace(app=types.SimpleNamespace(state=types.SimpleNamespace(today=today, writes=0)))
+    return handlers.Context(request, connection, user, params, None)
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--transitions', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=datetime.date(2026, 4, 8))
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rollups.db')
+        started = time.perf_counter()
+        store.seed(path, args.employees, args.tasks, 0, args.seed, args.today)
+        connection = store.connect(path)
+        sizes = connection.execute('SELECT (SELECT COUNT(*) FROM employee_daily_stats), '
+                                   '(SELECT COUNT(*) FROM department_daily_stats)').fetchone()
+        print(f'{args.tasks} tasks seeded in {time.perf_counter() - started:.0f}s; '
+              f'{sizes[0]} employee-day and {sizes[1]} department-day rollup rows')
+
+        users = {row['emp_id']: dict(row) for row in connection.execute(
+            "SELECT * FROM employee WHERE emp_id IN ('MGR_AP', 'CFO001')")}
+        cases = (
+            ('/dashboard/manager/analytics', handlers.manager_dashboard_analytics, 'MGR_AP', {}),
+            ('/dashboard/manager/trends', handlers.manager_trends, 'MGR_AP', {'days': 30}),
+            ('/dashboard/manager/team-performance', handlers.team_performance, 'MGR_AP', {'limit': 100}),
+            ('/dashboard/cfo/trends?months=12', handlers.cfo_trends, 'CFO001', {'months': 12}),
+            ('/dashboard/cfo/departments', handlers.cfo_departments, 'CFO001', {}),
+            ('/dashboard/cfo/org-metrics', handlers.cfo_org_metrics, 'CFO001', {}),
+        )
+        print(f"\n{'dashboard':<38}{'raw ms':>10}{'rollups ms':>12}{'speed-up':>10}")
+        for name, handler, emp_id, params in cases:
+            def call():
+                return asyncio.run(handler(context(connection, users[emp_id], args.today, params)))
+            with raw_statistics():
+                raw_ms, expected = timed(call, args.repeat)
+            rollup_ms, result = timed(call, args.repeat)
+            if result != expected:
+                raise SystemExit(f'{name}: the rollups and the task table give different payloads')
+            print(f'{name:<38}{raw_ms:>10.2f}{rollup_ms:>12.2f}{raw_ms / max(rollup_ms, 1e-6):>9.1f}x')
+
+        rng = random.Random(args.seed)
+        picks = [(rng.randint(1, args.tasks), rng.choice(store.STATUSES)) for _ in range(args.transitions)]
+        update = 'UPDATE task SET status = ?, updated_at = ? WHERE task_id = ?'
+
+        def bare():
+            for task_id, status in picks:
+                connection.execute(update, (status, store.now(), task_id))
+
+        def tracked():
+            for task_id, status in picks:
+                with rollups.changing(connection, task_id):
+                    connection.execute(update, (status, store.now(), task_id))
+
+        def rolled_back(function):
+            connection.execute('BEGIN IMMEDIATE')
+            function()
+            connection.execute('ROLLBACK')
+
+        bare_ms, _ = timed(lambda: rolled_back(bare), 3)
+        tracked_ms, _ = timed(lambda: rolled_back(tracked), 3)
+        print(f'\n{args.transitions} status changes: {bare_ms / args.transitions * 1000:.0f} us each alone, '
+              f'{tracked_ms / args.transitions * 1000:.0f} us with the rollup update (rolled back)')
+
+        connection.execute('BEGIN IMMEDIATE')
+        tracked()
+        connection.execute('COMMIT')
+        for label, day in (('next day', args.today + datetime.timedelta(days=1)), ('back', args.today)):
+            started = time.perf_counter()
+            with connection:
+                connection.execute('BEGIN IMMEDIATE')
+                rollups.age(connection, day)
+            print(f'overdue counts moved to {day} ({label}): {(time.perf_counter() - started) * 1000:.1f} ms')
+        started = time.perf_counter()
+        differences = rollups.check(connection)
+        print(f'check after the changes: {len(differences)} differences in '
+              f'{time.perf_counter() - started:.2f}s')
+        started = time.perf_counter()
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            rollups.rebuild(connection, args.today)
+        print(f'full rebuild: {time.perf_counter() - started:.2f}s')
+        if differences:
+            raise SystemExit(differences[:10])
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Latency / throughput benchmark for the student app routes.
+
+    python -m benchmarks.run --size 10k --output bench-10k.json
+    python -m benchmarks.run --db /tmp/students-100k.db --baseline bench-100k.json
+
+Requests go through the Flask test client against a private copy of the
+database, so write scenarios never touch the source file and runs are
+repeatable. Each scenario reports p50/p95/p99 latency and requests/sec; the
+JSON report can be passed back as --baseline to diff two runs.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.generate import COURSES, SIZES, generate
+from student_management import create_app
+
+
+def percentile(sorted_values, pct):
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    ordered = sorted(samples)
+    return {
+        'requests': len(ordered),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'rps': round(len(ordered) / elapsed, 1),
+    }
+
+
+def scenarios(app, max_id, rng):
+    """Yield (name, request factory) pairs; factories return (method, url, data)."""
+    yield 'list_first_page', lambda: ('GET', '/', None)
+    yield 'list_deep_page', lambda: ('GET', f'/?after={rng.randrange(max_id)}', None)
+    yield 'list_by_course', lambda: ('GET', f'/?course={rng.choice(COURSES)}', None)
+    yield 'add', lambda: ('POST', '/add', {
+        'name': 'Bench Student', 'email': f'bench{rng.getrandbits(48)}@example.com',
+        'course': rng.choice(COURSES), 'age': str(rng.randint(17, 35))})
+    yield 'edit', lambda: ('POST', f'/edit/{rng.randrange(1, max_id)}', {
+        'name': 'Edited Student', 'email': f'edit{rng.getrandbits(48)}@example.com',
+        'course': rng.choice(COURSES), 'age': str(rng.randint(17, 35))})
+    yield 'delete', lambda: ('GET', f'/delete/{rng.randrange(1, max_id)}', None)
+    if 'students.search' in app.view_functions:
+        yield 'search', lambda: ('GET', f"/search?q={rng.choice(['nai', 'pat', 'comp', 'eco'])}", None)
+    if 'students.export_csv' in app.view_functions:
+        yield 'export_csv_by_course', lambda: ('GET', f'/export.csv?course={rng.choice(COURSES)}', None)
+
+
+def run(db_path, requests_per_scenario, seed):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(db_path)}'})
+    max_id = sqlite3.connect(db_path).execute('SELECT max(id) FROM student').fetchone()[0] or 1
+    rng = random.Random(seed)
+    client = app.test_client()
+    results = {}
+    for name, make_request in scenarios(app, max_id, rng):
+        samples = []
+        started = time.perf_counter()
+        for _ in range(requests_per_scenario):
+            method, url, data = make_request()
+            t0 = time.perf_counter()
+            response = client.open(url, method=method, data=data)
+            response.get_data()
+            samples.append(time.perf_counter() - t0)
+            if response.status_code >= 500:
+                raise RuntimeError(f'{name}: {method} {url} returned {response.status_code}')
+        results[name] = summarize(samples, time.perf_counter() - started)
+    return results
+
+
+def compare(current, baseline):
+    print(f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'vs base p95':>14}")
+    for name, stats in current['scenarios'].items():
+        base = baseline['scenarios'].get(name) if baseline else None
+        delta = f"{(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.1f}%" if base else 'n/a'
+        print(f"{name:<24}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['rps']:>10.1f}{delta:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--db', help='existing database from benchmarks.generate')
+    source.add_argument('--size', choices=SIZES, default='10k')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', help='JSON report from an earlier run to compare against')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'students.db')
+        if args.db:
+            shutil.copyfile(args.db, db_path)
+            rows = None
+        else:
+            rows = SIZES[args.size]
+            generate(db_path, rows, args.seed)
+        report = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': args.db or f'generated:{args.size}',
+            'rows': rows or sqlite3.connect(db_path).execute('SELECT count(*) FROM student').fetchone()[0],
+            'seed': args.seed,
+            'requests_per_scenario': args.requests,
+            'scenarios': run(db_path, args.requests, args.seed),
+        }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    compare(report, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Full sweeps vs the due-date queues for recurring tasks and reminders.
+
+    python -m benchmarks.scheduler --templates 100000 --tasks 1000000
+
+Fills a database with --templates recurring templates (two subtasks each)
+and --tasks tasks, queues them with stub_api.scheduler.rebuild and then,
+day by day, times the old handlers (scan every active template and every
+open task, insert row by row; rolled back) against a queued run producing
+the same instances and reminders. Ends with a run after --downtime days
+without one, which has to catch up every missed window, and a repeat of it.
+"""
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from stub_api import scheduler, store
+
+FREQUENCIES = ('WEEKLY', 'MONTHLY', 'YEARLY')
+
+
+def fill(connection, templates, tasks, today, rng):
+    created = store.now()
+    connection.execute("INSERT INTO employee VALUES ('CFO001', 'CFO', 'cfo@example.com', 'CFO', 'FIN', NULL, 1, 'x')")
+    start = (today - datetime.timedelta(days=365)).isoformat()
+    connection.executemany(
+        'INSERT INTO recurring_task (recurring_id, title, department_id, assigned_to_emp_id, assigned_by_emp_id, '
+        'frequency, weekly_day, monthly_day, yearly_month, yearly_day, start_date, last_run_date, created_at) '
+        "VALUES (?, ?, 'FIN', 'CFO001', 'CFO001', ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(n, f'Template {n}', rng.choice(FREQUENCIES), rng.randint(1, 7), rng.randint(1, 28), rng.randint(1, 12),
+          rng.randint(1, 28), start, (today - datetime.timedelta(days=1)).isoformat(), created)
+         for n in range(1, templates + 1)])
+    connection.executemany(
+        "INSERT INTO recurring_subtask (recurring_id, title, department_id, assigned_to_emp_id, sequence_no) "
+        "VALUES (?, ?, 'FIN', 'CFO001', ?)",
+        [(n, f'Step {step}', step) for n in range(1, templates + 1) for step in (1, 2)])
+    for offset in range(0, tasks, store.BATCH_SIZE):
+        rows = []
+        for task_id in range(offset + 1, min(offset + store.BATCH_SIZE, tasks) + 1):
+            due = (today + datetime.timedelta(days=rng.randint(-60, 120))).isoformat()
+            status = rng.choices(store.STATUSES, (15, 20, 10, 45, 6, 4))[0]
+            rows.append((task_id, 'Task', None, 'MEDIUM', status, 'CFO001', 'CFO001', 'FIN', None,
+                         today.isoformat(), due, None, 0, 0, created, created))
+        connection.executemany(store.INSERT_TASK, rows)
+
+
+def sweep_recurring(connection, day):
+    """The old /recurring-tasks/run: scan every active template and insert
+    instances one statement at a time."""
+    created, iso = store.now(), day.isoformat()
+    due_date = (day + scheduler.DUE_AFTER).isoformat()
+    instances = 0
+    for template in connection.execute('SELECT * FROM recurring_task WHERE is_active = 1').fetchall():
+        if template['last_run_date'] == iso or scheduler.next_fire(template, day - datetime.timedelta(days=1)) != day:
+            continue
+        subtasks = connection.execute('SELECT * FROM recurring_subtask WHERE recurring_id = ? ORDER BY sequence_no',
+                                      (template['recurring_id'],)).fetchall()
+        parent = None
+        for row in [template, *subtasks]:
+            connection.execute('SELECT * FROM employee WHERE emp_id = ?', (row['assigned_to_emp_id'],)).fetchone()
+            task_id = connection.execute(
+                'INSERT INTO task (title, priority, status, assigned_to_emp_id, assigned_by_emp_id, department_id, '
+                "parent_task_id, assigned_date, due_date, created_at, updated_at) VALUES (?, ?, 'NEW', ?, "
+                "'CFO001', 'FIN', ?, ?, ?, ?, ?)", (row['title'], row['priority'], row['assigned_to_emp_id'], parent,
+                                                   iso, due_date, created, created)).lastrowid
+            connection.execute('INSERT INTO task_history (task_id, action, to_status, actor_emp_id, created_at) '
+                               "VALUES (?, 'CREATE', 'NEW', 'CFO001', ?)", (task_id, created))
+            connection.execute('INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) '
+                               "VALUES (?, 'TASK_ASSIGNED', ?, ?, 0, ?)", (row['assigned_to_emp_id'], row['title'],
+                                                                           task_id, created))
+            parent = parent or task_id
+        connection.execute('UPDATE recurring_task SET last_run_date = ? WHERE recurring_id = ?',
+                           (iso, template['recurring_id']))
+        instances += 1
+    return instances
+
+
+def sweep_reminders(connection, day):
+    """The old /system/run-reminders: every open task due by tomorrow, every run."""
+    created, iso = store.now(), day.isoformat()
+    soon = (day + datetime.timedelta(days=1)).isoformat()
+    marks = ', '.join('?' * len(store.OPEN_STATUSES))
+    due = connection.execute(f'SELECT task_id, title, assigned_to_emp_id, due_date FROM task '
+                             f'WHERE status IN ({marks}) AND due_date <= ?', [*store.OPEN_STATUSES, soon]).fetchall()
+    connection.executemany('INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) '
+                           'VALUES (?, ?, ?, ?, 0, ?)',
+                           [(task['assigned_to_emp_id'], 'TASK_OVERDUE' if task['due_date'] < iso else 'TASK_DUE_SOON',
+                             task['title'], task['task_id'], created) for task in due])
+    return len(due)
+
+
+def queued_recurring(connection, day):
+    return len(scheduler.run_recurring(connection, day, 'CFO001'))
+
+
+def timed(connection, function, day, commit=True):
+    """Milliseconds and result of function(connection, day) in one write
+    transaction, committed or rolled back."""
+    started = time.perf_counter()
+    connection.execute('BEGIN IMMEDIATE')
+    result = function(connection, day)
+    connection.execute('COMMIT' if commit else 'ROLLBACK')
+    return (time.perf_counter() - started) * 1000, result
+
+
+def compare(connection, day):
+    """(instances, sweep ms, queued ms, reminders, sweep ms, queued ms) for day."""
+    old_recurring_ms, expected_instances = timed(connection, sweep_recurring, day, commit=False)
+    old_reminders_ms, expected_reminders = timed(connection, sweep_reminders, day, commit=False)
+    recurring_ms, instances = timed(connection, queued_recurring, day)
+    reminders_ms, reminders = timed(connection, scheduler.run_reminders, day)
+    if (instances, reminders) != (expected_instances, expected_reminders):
+        raise SystemExit(f'{day}: queued runs made {instances} instances and {reminders} reminders, '
+                         f'the sweeps {expected_instances} and {expected_reminders}')
+    return instances, old_recurring_ms, recurring_ms, reminders, old_reminders_ms, reminders_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--templates', type=int, default=100_000)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--downtime', type=int, default=30)
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=datetime.date(2026, 4, 8))
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection = store.connect(os.path.join(tmp, 'scheduler.db'))
+        store.create_schema(connection)
+        connection.execute('BEGIN')
+        fill(connection, args.templates, args.tasks, args.today, random.Random(args.seed))
+        started = time.perf_counter()
+        scheduler.rebuild(connection, args.today)
+        elapsed = time.perf_counter() - started
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        queue = connection.execute('SELECT (SELECT COUNT(*) FROM recurring_schedule), '
+                                   '(SELECT COUNT(*) FROM task_reminder)').fetchone()
+        print(f'{args.templates} templates, {args.tasks} tasks; queued {queue[0]} templates and '
+              f'{queue[1]} reminders in {elapsed:.2f}s')
+        print(f"{'':<12}{'----------- recurring -----------':>33}{'---------- reminders ----------':>33}")
+        print(f"{'run date':<12}{'instances':>11}{'sweep ms':>11}{'queued ms':>11}"
+              f"{'sent':>11}{'sweep ms':>11}{'queued ms':>11}")
+        day = args.today
+        for _ in range(args.days):
+            instances, old_recurring, recurring, sent, old_reminders, reminders = compare(connection, day)
+            print(f'{day.isoformat():<12}{instances:>11}{old_recurring:>11.1f}{recurring:>11.1f}'
+                  f'{sent:>11}{old_reminders:>11.1f}{reminders:>11.1f}')
+            day += datetime.timedelta(days=1)
+        day += datetime.timedelta(days=args.downtime - 1)
+        for label in (f'+{args.downtime} days', 'same day'):
+            recurring, instances = timed(connection, queued_recurring, day)
+            reminders, sent = timed(connection, scheduler.run_reminders, day)
+            print(f'{label:<12}{instances:>11}{"":>11}{recurring:>11.1f}{sent:>11}{"":>11}{reminders:>11.1f}')
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
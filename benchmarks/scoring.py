@@ -0,0 +1,69 @@
+"""Time performance_engine on a synthetic organisation.
+
+    python -m benchmarks.scoring --employees 100000 --tasks 10000000
+
+Tasks are generated as compact columns (integer ids, categorical status,
+datetime64 dates) with a fixed seed, then every employee and manager is
+scored and ranked. Prints the generation and scoring times.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from performance_engine import employee_scores, manager_scores, rank_order, task_counts
+
+STATUSES = ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'In Review', 'REWORK', 'APPROVED')
+STATUS_WEIGHTS = (0.10, 0.20, 0.05, 0.10, 0.05, 0.50)
+
+
+def generate(employees, tasks, team_size, seed=0):
+    rng = np.random.default_rng(seed)
+    managers = max(1, employees // team_size)
+    due = np.datetime64('2025-01-01') + rng.integers(0, 365, tasks).astype('timedelta64[D]')
+    completed = due + rng.integers(-5, 3, tasks).astype('timedelta64[D]')
+    return {
+        'manager_ids': np.arange(managers),
+        'employee_ids': np.arange(employees),
+        'employee_manager_ids': rng.integers(0, managers, employees),
+        'tasks': {
+            'employeeId': rng.integers(0, employees, tasks),
+            'status': (rng.choice(len(STATUSES), tasks, p=STATUS_WEIGHTS).astype(np.int8), STATUSES),
+            'reworkCount': rng.choice(np.array([0, 0, 0, 1, 2], dtype=np.int8), tasks),
+            'dueDate': due,
+            'completedDate': completed,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=100_000)
+    parser.add_argument('--tasks', type=int, default=10_000_000)
+    parser.add_argument('--team-size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    org = generate(args.employees, args.tasks, args.team_size, args.seed)
+    generated = time.perf_counter()
+    counts = task_counts(org['tasks'], org['employee_ids'])
+    counted = time.perf_counter()
+    employees = employee_scores(org['tasks'], org['employee_ids'], counts)
+    employee_ranking = rank_order(employees)
+    scored = time.perf_counter()
+    managers = manager_scores(org['tasks'], org['manager_ids'], org['employee_ids'],
+                              org['employee_manager_ids'], counts)
+    manager_ranking = rank_order(managers)
+    finished = time.perf_counter()
+
+    print(f'generate          {generated - start:8.2f}s  ({args.tasks:,} tasks)')
+    print(f'task counts       {counted - generated:8.2f}s')
+    print(f'employee scores   {scored - counted:8.2f}s  ({args.employees:,} employees)')
+    print(f'manager scores    {finished - scored:8.2f}s  ({len(managers):,} managers)')
+    print(f'top employee {employee_ranking[0]} ({employees[employee_ranking[0]]:.2f}), '
+          f'top manager {manager_ranking[0]} ({managers[manager_ranking[0]]:.2f})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Read throughput while writes are in flight, per SQLite profile.
+
+    python -m benchmarks.sqlite_concurrency --readers 8 --seconds 5
+
+Each profile gets a fresh database seeded with --rows students. One writer
+thread commits single-row inserts in a loop while the reader threads fetch
+listing pages; the table compares reads/sec, writes/sec and lock errors.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+
+from student_management.database import (SQLITE_PROFILES, sqlite_engine_options,
+                                         sqlite_pragma_listener)
+
+LISTING_SQL = text('SELECT id, name, email, course, age FROM student '
+                   'WHERE id > :after ORDER BY id LIMIT 50')
+INSERT_SQL = text('INSERT INTO student (name, email, course, age) '
+                  'VALUES (:name, :email, :course, :age)')
+
+
+def make_engine(path, profile, pool_name, readers):
+    engine = create_engine(f'sqlite:///{path}',
+                           **sqlite_engine_options(pool_name, readers + 1))
+    event.listen(engine, 'connect', sqlite_pragma_listener(SQLITE_PROFILES[profile]))
+    return engine
+
+
+def seed(engine, rows):
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE student (id INTEGER PRIMARY KEY, name VARCHAR(100), '
+                          'email VARCHAR(100) UNIQUE, course VARCHAR(100), age INTEGER)'))
+        conn.execute(INSERT_SQL, [
+            {'name': f'Student {i}', 'email': f'seed{i}@example.com',
+             'course': f'Course {i % 20}', 'age': 18 + i % 10}
+            for i in range(rows)
+        ])
+
+
+def run(profile, pool_name, readers, seconds, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, 'bench.db'), profile, pool_name, readers)
+        seed(engine, rows)
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def bump(key):
+            with lock:
+                counts[key] += 1
+
+        def reader():
+            rng = random.Random()
+            while not stop.is_set():
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(LISTING_SQL, {'after': rng.randrange(rows)}).all()
+                    bump('reads')
+                except Exception:
+                    bump('errors')
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                n += 1
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(INSERT_SQL, {'name': 'Writer', 'email': f'w{n}@example.com',
+                                                  'course': 'Bench', 'age': 20})
+                    bump('writes')
+                except Exception:
+                    bump('errors')
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--pool', choices=['queue', 'null', 'static', 'singleton'], default='queue')
+    parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'reads/s':>12}{'writes/s':>12}{'errors/s':>12}")
+    for profile in args.profiles:
+        result = run(profile, args.pool, args.readers, args.seconds, args.rows)
+        print(f"{profile:<12}{result['reads']:>12.0f}{result['writes']:>12.0f}{result['errors']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Apply declarative source patches from a JSON manifest.
+
+    python patch_engine.py patches/dashboards.json            # apply
+    python patch_engine.py patches/dashboards.json --dry-run  # show a diff only
+
+A manifest names a root directory (relative to the manifest) and a list of
+patches. Each patch selects files with a glob and has one of three shapes:
+
+    {"files": "src/**/X.jsx", "replace": "old text", "with": "new text"}
+    {"files": "...", "start": "anchor", "end": "anchor", "with_file": "blocks/y.jsx"}
+    {"files": "...", "whole_file": true, "with_file": "blocks/z.jsx"}
+
+"replace" swaps an exact block. "start"/"end" replace everything from the
+start anchor up to (not including) the end anchor. Any string value can be
+loaded from a file instead with a "_file" suffix ("replace_file",
+"with_file", ...). "if_contains" applies the patch only while that marker
+is present, and a patch whose text is already in place is skipped, so
+re-running the manifest is a no-op.
+
+Every file is read once and all of its patches are located against the
+original text before anything is spliced, so patches cannot see each other's
+output. Overlapping matches, ambiguous anchors and missing anchors are
+errors. Files are processed in parallel and written atomically. The exit
+status is non-zero when any patch fails.
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+TEXT_KEYS = ('replace', 'with', 'start', 'end', 'if_contains')
+
+
+class PatchError(Exception):
+    pass
+
+
+def load_manifest(path):
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    root = os.path.normpath(os.path.join(base, manifest.get('root', '.')))
+    patches = []
+    for number, patch in enumerate(manifest['patches'], start=1):
+        patch = dict(patch, id=patch.get('id', f'#{number}'))
+        for key in TEXT_KEYS:
+            source = patch.pop(f'{key}_file', None)
+            if source is not None:
+                with open(os.path.join(base, source), encoding='utf-8', newline='') as f:
+                    patch[key] = f.read()
+        if 'with' not in patch:
+            raise PatchError(f"patch {patch['id']}: missing 'with' / 'with_file'")
+        patches.append(patch)
+    return root, patches
+
+
+def expand(root, patches):
+    """Group patches by the files their globs match, in manifest order."""
+    by_file, errors = {}, []
+    for patch in patches:
+        matches = sorted(glob.glob(os.path.join(root, patch['files']), recursive=True))
+        if not matches:
+            errors.append(f"patch {patch['id']}: no files match {patch['files']!r}")
+        for path in matches:
+            by_file.setdefault(path, []).append(patch)
+    return by_file, errors
+
+
+def _find_unique(content, needle, what, patch_id):
+    index = content.find(needle)
+    if index < 0:
+        raise PatchError(f'patch {patch_id}: {what} not found')
+    if content.find(needle, index + 1) >= 0:
+        raise PatchError(f'patch {patch_id}: {what} is not unique')
+    return index
+
+
+def locate(content, patch):
+    """Return the (start, end) span the patch replaces, or None to skip it."""
+    if 'if_contains' in patch and patch['if_contains'] not in content:
+        return None
+    if patch.get('whole_file'):
+        return None if content == patch['with'] else (0, len(content))
+    if 'replace' in patch:
+        if patch['replace'] not in content and patch['with'] in content:
+            return None
+        start = _find_unique(content, patch['replace'], 'replace block', patch['id'])
+        return (start, start + len(patch['replace']))
+    if 'start' in patch and 'end' in patch:
+        start = _find_unique(content, patch['start'], 'start anchor', patch['id'])
+        end = content.find(patch['end'], start)
+        if end < 0:
+            raise PatchError(f"patch {patch['id']}: end anchor not found after start anchor")
+        return None if content[start:end] == patch['with'] else (start, end)
+    raise PatchError(f"patch {patch['id']}: needs 'replace', 'start'/'end' or 'whole_file'")
+
+
+def patch_text(content, patches):
+    """Apply all patches to content in one pass; returns (new content, applied ids)."""
+    spans = []
+    for patch in patches:
+        span = locate(content, patch)
+        if span is not None:
+            spans.append((span[0], span[1], patch))
+    spans.sort(key=lambda item: item[0])
+    for (_, prev_end, prev), (start, _, patch) in zip(spans, spans[1:]):
+        if start < prev_end:
+            raise PatchError(f"patches {prev['id']} and {patch['id']} overlap")
+    pieces, position = [], 0
+    for start, end, patch in spans:
+        pieces.append(content[position:start])
+        pieces.append(patch['with'])
+        position = end
+    pieces.append(content[position:])
+    return ''.join(pieces), [patch['id'] for _, _, patch in spans]
+
+
+def write_atomic(path, content):
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.patch-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        os.chmod(tmp, os.stat(path).st_mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def process_file(path, patches, dry_run, root):
+    """Worker: returns a result dict; never raises for patch errors."""
+    result = {'path': os.path.relpath(path, root), 'applied': [], 'error': None, 'diff': ''}
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            original = f.read()
+        updated, result['applied'] = patch_text(original, patches)
+    except (PatchError, OSError, UnicodeDecodeError) as exc:
+        result['error'] = str(exc)
+        return result
+    if updated != original:
+        if dry_run:
+            result['diff'] = ''.join(difflib.unified_diff(
+                original.splitlines(keepends=True), updated.splitlines(keepends=True),
+                f"a/{result['path']}", f"b/{result['path']}"))
+        else:
+            write_atomic(path, updated)
+    return result
+
+
+def run(manifest_path, dry_run=False, jobs=None):
+    root, patches = load_manifest(manifest_path)
+    by_file, errors = expand(root, patches)
+    results = []
+    if len(by_file) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(process_file, path, file_patches, dry_run, root)
+                       for path, file_patches in by_file.items()]
+            results = [future.result() for future in futures]
+    else:
+        results = [process_file(path, file_patches, dry_run, root)
+                   for path, file_patches in by_file.items()]
+    return results, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('manifest')
+    parser.add_argument('--dry-run', action='store_true', help='print a unified diff, write nothing')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    try:
+        results, errors = run(args.manifest, args.dry_run, args.jobs)
+    except (PatchError, OSError, ValueError, KeyError) as exc:
+        print(f'error: {exc}', file=sys.stderr)
+        return 2
+    for result in results:
+        if result['error']:
+            errors.append(f"{result['path']}: {result['error']}")
+        elif args.dry_run:
+            sys.stdout.write(result['diff'])
+        else:
+            applied = ', '.join(result['applied']) or 'nothing to do'
+            print(f"{result['path']}: {applied}")
+    for error in errors:
+        print(f'error: {error}', file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
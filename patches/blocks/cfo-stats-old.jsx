@@ -0,0 +1,7 @@
+            {/* Main Stats - Ultra Clean */}
+            <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
+                <StatsCard title="Total Volume" value={globalStats.totalTasks} icon={CheckSquare} color="primary" compact />
+                <StatsCard title="Approved" value={globalStats.completedTasks} icon={TrendingUp} color="success" compact />
+                <StatsCard title="Pending Review" value={globalStats.pendingTasks} icon={AlertTriangle} color="warning" compact />
+                <StatsCard title="Efficiency" value={`${globalStats.overallScore}%`} icon={Target} color="info" compact />
+            </div>
\ No newline at end of file
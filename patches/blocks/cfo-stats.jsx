@@ -1,18 +1,4 @@
-filepath = r'c:\Users\SARATH\Project UAE\Rolebased task MS\src\components\Dashboard\CFODashboard.jsx'
-
-with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-    content = f.read()
-
-# Find and replace the stat cards section
-old_stats = '''            {/* Main Stats - Ultra Clean */}
-            <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
-                <StatsCard title="Total Volume" value={globalStats.totalTasks} icon={CheckSquare} color="primary" compact />
-                <StatsCard title="Approved" value={globalStats.completedTasks} icon={TrendingUp} color="success" compact />
-                <StatsCard title="Pending Review" value={globalStats.pendingTasks} icon={AlertTriangle} color="warning" compact />
-                <StatsCard title="Efficiency" value={`${globalStats.overallScore}%`} icon={Target} color="info" compact />
-            </div>'''
-
-new_stats = '''            {/* Main Stats - Large Gradient Cards matching CFO image */}
+            {/* Main Stats - Large Gradient Cards matching CFO image */}
             <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
                 <div className="group relative overflow-hidden rounded-2xl bg-gradient-to-br from-blue-500 to-indigo-600 shadow-lg shadow-blue-300/40 py-5 px-6 transition-all duration-500 hover:scale-[1.03] hover:shadow-xl">
                     <div className="absolute -top-6 -right-6 w-24 h-24 rounded-full bg-blue-400/30 blur-2xl" />
@@ -62,17 +48,4 @@ new_stats = '''            {/* Main Stats - Large Gradient Cards matching CFO im
                         </div>
                     </div>
                 </div>
-            </div>'''
-
-if old_stats in content:
-    content = content.replace(old_stats, new_stats)
-    print("Stats section replaced!")
-else:
-    print("Could not find old stats section - searching for similar...")
-    idx = content.find('Main Stats')
-    print(f"'Main Stats' found at index: {idx}")
-    print("Context:", repr(content[idx-10:idx+200]))
-
-with open(filepath, 'w', encoding='utf-8') as f:
-    f.write(content)
-print("CFO Dashboard written. Size:", len(content))
+            </div>
\ No newline at end of file
@@ -0,0 +1,67 @@
+            {/* ══ MANAGER HEADER — CFO-STYLE CLEAN WHITE ══ */}
+            <div className="rounded-[2rem] bg-white shadow-sm border border-slate-100 relative overflow-hidden p-6 mb-2">
+                <div className="absolute top-0 right-0 w-72 h-72 bg-indigo-50 rounded-full blur-3xl -mr-36 -mt-36 opacity-60" />
+                <div className="absolute bottom-0 left-0 w-56 h-56 bg-emerald-50 rounded-full blur-3xl -ml-28 -mb-28 opacity-60" />
+
+                <div className="relative z-10 flex flex-col lg:flex-row items-center justify-between gap-6">
+                    <div className="flex items-center gap-5">
+                        <div className="bg-gradient-to-br from-indigo-500 to-violet-600 p-4 rounded-2xl shadow-lg shadow-indigo-200/50">
+                            <Users size={28} className="text-white" />
+                        </div>
+                        <div>
+                            <h2 className="text-2xl font-black text-slate-900 uppercase tracking-tight leading-none">
+                                Team <span className="text-indigo-600">Performance</span>
+                            </h2>
+                            <p className="text-slate-400 font-bold uppercase tracking-[0.3em] text-[10px] mt-2">
+                                {user.department || 'Management'} · {new Date().toLocaleDateString('en-US', { weekday: 'long', month: 'long', day: 'numeric' })}
+                            </p>
+                        </div>
+                    </div>
+
+                    <div className="flex flex-wrap items-center gap-3">
+                        <div className="flex items-center bg-slate-50 border border-slate-200 rounded-xl px-4 py-2 gap-3">
+                            <div className="flex flex-col">
+                                <span className="text-[8px] font-black text-slate-400 uppercase tracking-widest">Start Date</span>
+                                <input type="date" value={fromDate} onChange={(e) => setFromDate(e.target.value)}
+                                    className="bg-transparent text-slate-700 text-[11px] font-bold outline-none w-[110px] cursor-pointer" />
+                            </div>
+                            <div className="w-px h-6 bg-slate-200" />
+                            <div className="flex flex-col">
+                                <span className="text-[8px] font-black text-slate-400 uppercase tracking-widest">End Date</span>
+                                <input type="date" value={toDate} onChange={(e) => setToDate(e.target.value)}
+                                    className="bg-transparent text-slate-700 text-[11px] font-bold outline-none w-[110px] cursor-pointer" />
+                            </div>
+                        </div>
+
+                        <button onClick={() => navigate('/tasks/assign')}
+                            className="bg-slate-900 hover:bg-slate-800 text-white px-6 py-2.5 rounded-xl font-black text-[10px] uppercase tracking-[0.15em] shadow-md transition-all flex items-center gap-2 hover:-translate-y-0.5">
+                            <Plus size={14} /> Assign Task
+                        </button>
+
+                        {(fromDate || toDate) && (
+                            <button onClick={() => { setFromDate(''); setToDate(''); }}
+                                className="text-[9px] font-black text-slate-400 hover:text-rose-500 px-3 py-2.5 rounded-xl border border-slate-200 hover:border-rose-200 transition-all uppercase tracking-widest">
+                                ✕ Reset
+                            </button>
+                        )}
+                    </div>
+                </div>
+
+                <div className="relative z-10 mt-5 pt-4 border-t border-slate-100 flex flex-wrap items-center gap-6">
+                    <div className="flex items-center gap-2">
+                        <span className="text-[9px] font-black text-slate-400 uppercase tracking-widest">Team Members</span>
+                        <span className="text-xl font-black text-slate-900 tabular-nums">{reportTeam.length}</span>
+                    </div>
+                    <div className="w-px h-6 bg-slate-200" />
+                    <div className="flex items-center gap-2">
+                        <span className="text-[9px] font-black text-slate-400 uppercase tracking-widest">Active Pipeline</span>
+                        <span className="text-xl font-black text-indigo-600 tabular-nums">{stats.pending}</span>
+                    </div>
+                    <div className="w-px h-6 bg-slate-200" />
+                    <div className="flex items-center gap-2">
+                        <span className="text-[9px] font-black text-slate-400 uppercase tracking-widest">Efficiency</span>
+                        <span className="text-xl font-black text-emerald-600 tabular-nums">{stats.completionRate}%</span>
+                    </div>
+                </div>
+            </div>
+
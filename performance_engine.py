@@ -0,0 +1,308 @@
+"""Vectorized port of src/utils/performanceEngine.js and rankingEngine.js.
+
+    python performance_engine.py                       # rank src/data/mockData.js
+    python performance_engine.py --verify              # compare against the JS engine (needs node)
+
+The JS engine filters the whole task list once per employee. Here tasks are
+columns (employeeId, status, reworkCount, dueDate, completedDate) and every
+employee's and manager's counts come from one np.bincount pass per metric,
+so ranking is O(tasks + people). The arithmetic is done in the same order as
+the JS, and scores are rounded like Number.prototype.toFixed(2), so the
+results are bit-for-bit the numbers the dashboards show.
+
+``status`` may be an array of strings or a ``(codes, categories)`` pair; the
+latter keeps ten million tasks in a few hundred megabytes. Dates follow
+``new Date(value)``: ISO strings or datetime64 values, ``None`` counts as the
+epoch (``null``) while NaT, like a missing key (``undefined``), and
+unparsable values compare false. Date-times without an offset are
+read as UTC (the browser reads them as local time).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import warnings
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MOCK_DATA = os.path.join(ROOT, 'src', 'data', 'mockData.js')
+
+APPROVED = 'APPROVED'
+IN_REVIEW = 'In Review'
+COMPLETED_TARGET = 10
+TEAM_STABILITY = 95
+EMPLOYEE_WEIGHTS = (0.40, 0.25, 0.20, 0.15)  # completion, quality, timeliness, productivity
+MANAGER_WEIGHTS = (0.35, 0.30, 0.20, 0.15)   # completion, low rework, approval, stability
+UNDEFINED = np.datetime64('NaT')  # a missing date key: new Date(undefined) is NaN, not the epoch
+
+
+def encode(values, ids):
+    """Position of each value in ids, or -1 when it is not there."""
+    ids = np.asarray(ids)
+    values = np.asarray(values)
+    if ids.dtype == object or values.dtype == object:  # may hold None, which cannot be sorted
+        index = {key: position for position, key in enumerate(ids.tolist())}
+        return np.fromiter((index.get(value, -1) for value in values.tolist()),
+                           dtype=np.int64, count=len(values))
+    if len(ids) == 0:
+        return np.full(len(values), -1, dtype=np.int64)
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    slots = np.clip(np.searchsorted(sorted_ids, values), 0, len(ids) - 1)
+    return np.where(sorted_ids[slots] == values, order[slots], -1)
+
+
+def status_masks(status):
+    """(approved, in_review) boolean arrays for a status column."""
+    if isinstance(status, tuple):
+        codes, categories = status
+        categories = list(categories)
+        codes = np.asarray(codes)
+        approved = codes == categories.index(APPROVED) if APPROVED in categories else np.zeros(len(codes), bool)
+        in_review = codes == categories.index(IN_REVIEW) if IN_REVIEW in categories else np.zeros(len(codes), bool)
+        return approved, in_review
+    status = np.asarray(status)
+    return status == APPROVED, status == IN_REVIEW
+
+
+def date_ms(values):
+    """Milliseconds since the epoch as ``new Date(value).getTime()`` sees them."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        stamps = values.astype('datetime64[ms]')
+        result = stamps.astype(np.int64).astype(np.float64)
+        result[np.isnat(stamps)] = np.nan
+        return result
+    result = np.zeros(len(values), dtype=np.float64)
+    present = np.array([value is not None for value in values], dtype=bool)
+    if present.any():
+        strings = values[present].astype(str)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # 'Z' suffixes: already UTC
+            try:
+                parsed = strings.astype('datetime64[ms]')
+            except ValueError:
+                parsed = np.array([_parse_date(value) for value in strings], dtype='datetime64[ms]')
+        ms = parsed.astype(np.int64).astype(np.float64)
+        ms[np.isnat(parsed)] = np.nan
+        result[present] = ms
+    return result
+
+
+def _parse_date(value):
+    try:
+        return np.datetime64(value, 'ms')
+    except ValueError:
+        return np.datetime64('NaT')
+
+
+def task_counts(tasks, employee_ids):
+    """Per-employee task counts for every metric, in one pass over the tasks."""
+    owner = encode(tasks['employeeId'], employee_ids)
+    approved, in_review = status_masks(tasks['status'])
+    rework = np.asarray(tasks['reworkCount'])
+    on_time = date_ms(tasks['completedDate']) <= date_ms(tasks['dueDate'])
+    known = owner >= 0
+    size = len(employee_ids)
+
+    def count(mask=None):
+        selected = owner[known if mask is None else known & mask]
+        return np.bincount(selected, minlength=size).astype(np.float64)
+
+    return {
+        'assigned': count(),
+        'completed': count(approved),
+        'no_rework': count(approved & (rework == 0)),
+        'on_time': count(approved & on_time),
+        'in_review': count(in_review),
+    }
+
+
+def team_counts(counts, manager_ids, employee_manager_ids):
+    """Roll per-employee counts up to each manager's team."""
+    team_of = encode(employee_manager_ids, manager_ids)
+    member = team_of >= 0
+    return {key: np.bincount(team_of[member], weights=values[member], minlength=len(manager_ids))
+            for key, values in counts.items()}
+
+
+def to_fixed_2(scores):
+    """``parseFloat(score.toFixed(2))`` for every score.
+
+    toFixed rounds the exact binary value half away from zero, which
+    np.round does not; each distinct score goes through Decimal once.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    unique, inverse = np.unique(scores, return_inverse=True)
+    step = Decimal('0.01')
+    rounded = np.array([float(Decimal(value).quantize(step, ROUND_HALF_UP)) for value in unique.tolist()])
+    return rounded[inverse].reshape(scores.shape)
+
+
+def employee_scores(tasks, employee_ids, counts=None):
+    """calculateEmployeeScore for every id in employee_ids, in one pass."""
+    if counts is None:
+        counts = task_counts(tasks, employee_ids)
+    assigned, completed = counts['assigned'], counts['completed']
+    w_completion, w_quality, w_timeliness, w_productivity = EMPLOYEE_WEIGHTS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        completion = (completed / assigned) * 100
+        quality = np.where(completed > 0, (counts['no_rework'] / completed) * 100, 0.0)
+        timeliness = np.where(completed > 0, (counts['on_time'] / completed) * 100, 0.0)
+    productivity = np.minimum((completed / COMPLETED_TARGET) * 100, 100)
+    score = (completion * w_completion + quality * w_quality
+             + timeliness * w_timeliness + productivity * w_productivity)
+    return np.where(assigned > 0, to_fixed_2(np.nan_to_num(score)), 0.0)
+
+
+def manager_scores(tasks, manager_ids, employee_ids, employee_manager_ids, counts=None):
+    """calculateManagerScore for every manager, teams given by employee_manager_ids.
+
+    Pass the task_counts already computed for employee_scores to avoid a
+    second pass over the tasks; team totals are then O(employees).
+    """
+    if counts is None:
+        counts = task_counts(tasks, employee_ids)
+    counts = team_counts(counts, manager_ids, employee_manager_ids)
+    assigned, completed = counts['assigned'], counts['completed']
+    handled = completed + counts['in_review']
+    w_completion, w_rework, w_approval, w_stability = MANAGER_WEIGHTS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        completion = (completed / assigned) * 100
+        low_rework = np.where(completed > 0, (counts['no_rework'] / completed) * 100, 0.0)
+    approval = (completed / np.where(handled > 0, handled, 1)) * 100
+    score = (completion * w_completion + low_rework * w_rework
+             + approval * w_approval + TEAM_STABILITY * w_stability)
+    return np.where(assigned > 0, to_fixed_2(np.nan_to_num(score)), 0.0)
+
+
+def rank_order(scores):
+    """Indices sorted by score, highest first; ties keep input order like Array.sort."""
+    return np.argsort(-np.asarray(scores), kind='stable')
+
+
+def tasks_from_records(records):
+    """Columns for a list of task objects as they appear in mockData.js."""
+    return {
+        'employeeId': np.array([t.get('employeeId') for t in records], dtype=object),
+        'status': np.array([t.get('status') for t in records], dtype=object),
+        'reworkCount': np.array([t.get('reworkCount', np.nan) for t in records], dtype=np.float64),
+        'dueDate': np.array([t.get('dueDate', UNDEFINED) for t in records], dtype=object),
+        'completedDate': np.array([t.get('completedDate', UNDEFINED) for t in records], dtype=object),
+    }
+
+
+def datetime_columns(tasks):
+    """tasks with dueDate and completedDate as datetime64[ms] columns: null
+    becomes the epoch, missing and unparsable dates NaT."""
+    columns = dict(tasks)
+    for key in ('dueDate', 'completedDate'):
+        ms = date_ms(tasks[key])
+        known = ~np.isnan(ms)
+        column = np.full(len(ms), UNDEFINED, dtype='datetime64[ms]')
+        column[known] = ms[known].astype(np.int64).astype('datetime64[ms]')
+        columns[key] = column
+    return columns
+
+
+def rankings(users, task_records, datetimes=False):
+    """getEmployeeRankings and getManagerRankings for a USERS / TASKS pair,
+    with the dates as datetime64 columns when datetimes is set."""
+    tasks = tasks_from_records(task_records)
+    if datetimes:
+        tasks = datetime_columns(tasks)
+    employees = [u for u in users if u.get('role') == 'Employee']
+    managers = [u for u in users if u.get('role') == 'Manager']
+    employee_ids = np.array([e['id'] for e in employees], dtype=object)
+    counts = task_counts(tasks, employee_ids)
+    result = {}
+    scores = employee_scores(tasks, employee_ids, counts)
+    result['employees'] = [dict(employees[i], score=float(scores[i]), rank=rank)
+                           for rank, i in enumerate(rank_order(scores), start=1)]
+    scores = manager_scores(tasks, np.array([m['id'] for m in managers], dtype=object), employee_ids,
+                            np.array([e.get('managerId') for e in employees], dtype=object), counts)
+    result['managers'] = [dict(managers[i], score=float(scores[i]), rank=rank)
+                          for rank, i in enumerate(rank_order(scores), start=1)]
+    return result
+
+
+NODE_SCRIPT = '''
+const mock = await import(process.argv[1]);
+const engine = await import(process.argv[2]);
+const data = process.argv[3] ? { USERS: mock.USERS, TASKS: JSON.parse(process.argv[3]) } : mock;
+const employees = data.USERS.filter(u => u.role === 'Employee');
+const managers = data.USERS.filter(u => u.role === 'Manager');
+const rank = list => list.sort((a, b) => b.score - a.score).map((x, i) => ({ ...x, rank: i + 1 }));
+console.log(JSON.stringify({
+    users: data.USERS,
+    tasks: data.TASKS,
+    employees: rank(employees.map(e => ({ ...e, score: engine.calculateEmployeeScore(data.TASKS, e.id) }))),
+    managers: rank(managers.map(m => ({ ...m, score: engine.calculateManagerScore(
+        data.TASKS, m.id, employees.filter(e => e.managerId === m.id).map(e => e.id)) }))),
+}));
+'''
+
+
+def load_mock(path=MOCK_DATA, tasks=None):
+    """USERS, TASKS (or the given tasks) and the JS engine's own rankings, evaluated by node."""
+    engine = os.path.join(ROOT, 'src', 'utils', 'performanceEngine.js')
+    extra = [json.dumps(tasks)] if tasks is not None else []
+    output = subprocess.run(['node', '--input-type=module', '-e', NODE_SCRIPT, '--',
+                             os.path.abspath(path), engine, *extra],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def parity_tasks(users):
+    """Approved tasks whose dates new Date() reads in unusual ways, one
+    employee per case, for --verify."""
+    employees = [u['id'] for u in users if u.get('role') == 'Employee']
+    base = {'status': APPROVED, 'reworkCount': 0, 'dueDate': '2025-01-10'}
+    cases = [
+        dict(base),                                         # no completedDate: NaN, never on time
+        dict(base, completedDate=None),                     # null: the epoch, always on time
+        dict(base, completedDate='2025-01-09'),
+        dict(base, completedDate='2025-01-11'),
+        dict(base, completedDate='not a date'),
+        {'status': APPROVED, 'reworkCount': 0, 'completedDate': '2025-01-09'},  # no dueDate
+        dict(base, dueDate=None, completedDate=None),
+    ]
+    return [dict(case, employeeId=employees[n % len(employees)]) for n, case in enumerate(cases)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('data', nargs='?', default=MOCK_DATA, help='JS module exporting USERS and TASKS')
+    parser.add_argument('--verify', action='store_true',
+                        help='exit non-zero unless every score and rank matches the JS engine')
+    args = parser.parse_args(argv)
+
+    mock = load_mock(args.data)
+    result = rankings(mock['users'], mock['tasks'])
+    if not args.verify:
+        for group in ('employees', 'managers'):
+            for row in result[group]:
+                print(f"{group[:-1]:<9}{row['rank']:>4}  {row['id']:<8}{row['score']:>8.2f}  {row['name']}")
+        return 0
+    mismatches, total = [], 0
+    parity = load_mock(args.data, parity_tasks(mock['users']))
+    for label, expected in (('mock data', mock), ('parity cases', parity)):
+        for datetimes in (False, True):
+            result = rankings(expected['users'], expected['tasks'], datetimes)
+            path = 'datetime64 columns' if datetimes else 'records'
+            mismatches += [(label, path, group, js['id'], js['score'], py['id'], py['score'])
+                           for group in ('employees', 'managers')
+                           for js, py in zip(expected[group], result[group])
+                           if (js['id'], js['score']) != (py['id'], py['score'])]
+            total += len(result['employees']) + len(result['managers'])
+    for mismatch in mismatches:
+        print('%s (%s), %s: JS %s=%r, Python %s=%r' % mismatch, file=sys.stderr)
+    print(f'{total - len(mismatches)}/{total} scores and ranks match the JS engine')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,38 +1,429 @@
+"""Bracket checker for JavaScript/JSX source trees.
 
+    python scratch/check_braces.py src/
+    python scratch/check_braces.py src/components/Dashboard/ManagerDashboard.jsx --format text
+    python scratch/check_braces.py src/components src/pages --watch
+
+Brackets inside strings, template literal text, regex literals, comments and
+JSX text/attribute strings are ignored; ``${...}`` and ``{...}`` expressions
+inside templates and JSX are checked, as is the nesting of JSX elements.
+Scanning jumps between interesting characters with precompiled regexes and
+directories are checked in a process pool. Problems are reported as JSON
+(the default) or one per line, and the exit status is 1 when any are found.
+
+Results are cached per file (size, mtime and content hash) in
+scratch/.check_braces_cache.json, so unchanged files are not re-read on the
+next run. --watch keeps running and re-checks only files that change, using
+watchdog (inotify on Linux) when it is installed and stat polling otherwise.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # --watch falls back to polling
+    Observer = None
+
+EXTENSIONS = ('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx')
+JSX_EXTENSIONS = ('.js', '.jsx', '.mjs', '.cjs', '.tsx')
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage'}
+PARALLEL_THRESHOLD = 16
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.check_braces_cache.json')
+WRITE_EVENTS = ('created', 'modified', 'moved', 'closed')
+CACHE_VERSION = 1  # bump whenever check_source changes what it reports
+
+CODE_RE = re.compile(r"//[^\n]*|/\*.*?(?:\*/|\Z)|[{}()\[\]'\"`/<]", re.S)
+STRING_RES = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*'", re.S),
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*"', re.S),
+}
+TEMPLATE_RE = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?", re.S)
+REGEX_RE = re.compile(r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+TAG_NAME_RE = re.compile(r"[A-Za-z_$][\w$.:-]*")
+TAG_RE = re.compile(r"/>|>|[{}]|\"[^\"]*\"|'[^']*'")
+CHILDREN_RE = re.compile(r"[{}<]")
+CLOSING_TAG_RE = re.compile(r"</\s*([\w$.:-]*)\s*>")
+JSX_START_RE = re.compile(r"<(?=[A-Za-z_$>])")
+WORD_BEFORE_RE = re.compile(r"[\w$]+$")
+
+EXPRESSION_CHARS = frozenset('([{,;:?=&|!+-*%~^<>')
+EXPRESSION_KEYWORDS = frozenset(
+    ('return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+     'throw', 'case', 'do', 'else', 'yield', 'await'))
+CLOSERS = {')': '(', ']': '['}
+BRACE_OPENERS = ('{', '${', 'jsx{')
+
 
-def check_braces(filename):
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+def _expression_position(text, pos):
+    """True when a '/' or '<' at pos starts an operand (regex/JSX), not an operator."""
+    i = pos - 1
+    while i >= 0 and text[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return True
+    char = text[i]
+    if char in EXPRESSION_CHARS:
+        return True
+    if char.isalnum() or char in '_$':
+        word = WORD_BEFORE_RE.search(text, max(0, i - 16), i + 1)
+        return word is not None and word.group() in EXPRESSION_KEYWORDS
+    return False
+
+
+def check_source(text, jsx=True):
+    """Return a list of (offset, message) problems found in text."""
+    problems = []
+    # Frames are (kind, offset, tag name). '<tag' means inside a JSX opening
+    # tag, '<>' inside an element's children; every other kind is code.
     stack = []
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        for char in line:
-            if char == '{':
-                stack.append(('{', i + 1))
-            elif char == '}':
-                if not stack:
-                    print(f"Extra closing brace at line {i+1}")
-                else:
-                    stack.pop()
-            elif char == '[':
-                stack.append(('[', i + 1))
-            elif char == ']':
-                if not stack or stack[-1][0] != '[':
-                    print(f"Mismatched closing bracket at line {i+1}")
-                else:
-                    stack.pop()
-            elif char == '(':
-                stack.append(('(', i + 1))
-            elif char == ')':
-                if not stack or stack[-1][0] != '(':
-                    print(f"Mismatched closing parenthesis at line {i+1}")
-                else:
-                    stack.pop()
-    
-    for item, line in stack:
-        print(f"Unclosed {item} from line {line}")
-
-if __name__ == "__main__":
-    check_braces(sys.argv[1])
+
+    def close(kind, pos):
+        if stack and stack[-1][0] == kind or kind == '{' and stack and stack[-1][0] in BRACE_OPENERS:
+            return stack.pop()
+        want = '{' if kind == '{' else kind
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] in ('<tag', '<>'):
+                break
+            if stack[depth][0] == want or want == '{' and stack[depth][0] in BRACE_OPENERS:
+                for frame in stack[depth + 1:]:
+                    problems.append((frame[1], f'unclosed {_describe(frame)}'))
+                del stack[depth + 1:]
+                return stack.pop()
+        closer = '}' if kind == '{' else {'(': ')', '[': ']'}[kind]
+        problems.append((pos, f"unexpected '{closer}'"))
+        return None
+
+    def template(pos):
+        match = TEMPLATE_RE.match(text, pos)
+        end = match.group(1)
+        if end is None:
+            problems.append((pos - 1, 'unterminated template literal'))
+            return len(text)
+        if end == '${':
+            stack.append(('${', match.end() - 2, None))
+        return match.end()
+
+    def open_tag(pos):
+        name = TAG_NAME_RE.match(text, pos + 1)
+        stack.append(('<tag', pos, name.group() if name else ''))
+        return name.end() if name else pos + 1
+
+    pos, size = 0, len(text)
+    while pos < size:
+        mode = stack[-1][0] if stack else None
+        if mode == '<tag':
+            match = TAG_RE.search(text, pos)
+            if match is None:
+                break
+            token, pos = match.group(), match.end()
+            if token == '/>':
+                stack.pop()
+            elif token == '>':
+                _, start, name = stack.pop()
+                stack.append(('<>', start, name))
+            elif token == '{':
+                stack.append(('jsx{', match.start(), None))
+            elif token == '}':
+                problems.append((match.start(), "unexpected '}'"))
+            continue
+        if mode == '<>':
+            match = CHILDREN_RE.search(text, pos)
+            if match is None:
+                break
+            token, start = match.group(), match.start()
+            pos = match.end()
+            if token == '{':
+                stack.append(('jsx{', start, None))
+            elif token == '}':
+                problems.append((start, "unexpected '}'"))
+            elif text.startswith('</', start):
+                closing = CLOSING_TAG_RE.match(text, start)
+                if closing is None:
+                    problems.append((start, 'malformed closing tag'))
+                    continue
+                pos = closing.end()
+                name = stack[-1][2]
+                if closing.group(1) != name:
+                    problems.append((start, f'</{closing.group(1)}> does not close <{name}>'))
+                stack.pop()
+            elif JSX_START_RE.match(text, start):
+                pos = open_tag(start)
+            continue
+
+        match = CODE_RE.search(text, pos)
+        if match is None:
+            break
+        token, start = match.group(), match.start()
+        pos = match.end()
+        if len(token) > 1:
+            continue  # comment
+        if token in '([':
+            stack.append((token, start, None))
+        elif token in ')]':
+            close(CLOSERS[token], start)
+        elif token == '{':
+            stack.append(('{', start, None))
+        elif token == '}':
+            frame = close('{', start)
+            if frame is not None and frame[0] == '${':
+                pos = template(pos)
+        elif token == '`':
+            pos = template(pos)
+        elif token in '\'"':
+            string = STRING_RES[token].match(text, start)
+            if string is None:
+                problems.append((start, 'unterminated string'))
+                newline = text.find('\n', start)
+                pos = size if newline < 0 else newline
+            else:
+                pos = string.end()
+        elif token == '/':
+            if _expression_position(text, start):
+                regex = REGEX_RE.match(text, start)
+                if regex is not None:
+                    pos = regex.end()
+        elif token == '<':
+            if jsx and JSX_START_RE.match(text, start) and _expression_position(text, start):
+                pos = open_tag(start)
+
+    for frame in stack:
+        problems.append((frame[1], f'unclosed {_describe(frame)}'))
+    return problems
+
+
+def _describe(frame):
+    kind, _, name = frame
+    if kind == '<tag':
+        return f'<{name}> tag'
+    if kind == '<>':
+        return f'<{name}> element'
+    return f"'{kind}'"
+
+
+def check_file(path, text=None):
+    """Check one file; returns a list of problem dicts."""
+    if text is None:
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as exc:
+            return [{'file': path, 'line': 0, 'column': 0, 'message': str(exc)}]
+    problems = check_source(text, path.endswith(JSX_EXTENSIONS))
+    if not problems:
+        return []
+    newlines = [m.start() for m in re.finditer('\n', text)]
+
+    def position(offset):
+        line = bisect.bisect_left(newlines, offset)
+        column = offset - (newlines[line - 1] + 1 if line else 0)
+        return line + 1, column + 1
+
+    report = []
+    for offset, message in sorted(problems):
+        line, column = position(offset)
+        report.append({'file': path, 'line': line, 'column': column, 'message': message})
+    return report
+
+
+def source_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith(EXTENSIONS):
+                    yield os.path.join(directory, filename)
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(path, cache):
+    cache = {key: entry for key, entry in cache.items() if os.path.exists(key)}
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'files': cache}, f)
+    os.replace(tmp, path)
+
+
+def _check_entry(path, known_hash=None):
+    """Worker: fingerprint and check one file. Skips the check when the
+    content hash matches known_hash (the file was only touched)."""
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as exc:
+        return {'problems': [{'file': path, 'line': 0, 'column': 0, 'message': str(exc)}]}
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+             'hash': hashlib.blake2b(data, digest_size=16).hexdigest()}
+    if entry['hash'] != known_hash:
+        try:
+            entry['problems'] = check_file(path, data.decode('utf-8'))
+        except UnicodeDecodeError as exc:
+            entry['problems'] = [{'file': path, 'line': 0, 'column': 0, 'message': str(exc)}]
+    return entry
+
+
+def check_paths(paths, jobs=None, cache=None):
+    """Check every source file under paths; returns (files, problems).
+
+    With a cache dict, files whose size and mtime are unchanged reuse their
+    previous result without being read, and files whose content hash is
+    unchanged are not re-checked. The cache is updated in place.
+    """
+    files = list(source_files(paths))
+    cache = {} if cache is None else cache
+    results, stale = {}, []
+    for path in files:
+        key = os.path.abspath(path)
+        entry = cache.get(key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if entry and stat and (stat.st_size, stat.st_mtime_ns) == (entry['size'], entry['mtime_ns']):
+            results[path] = entry['problems']
+        else:
+            stale.append((path, entry['hash'] if entry else None))
+
+    if stale:
+        stale_paths, known = zip(*stale)
+        if jobs == 1 or len(stale) < PARALLEL_THRESHOLD:
+            entries = map(_check_entry, stale_paths, known)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                entries = list(pool.map(_check_entry, stale_paths, known, chunksize=8))
+        for path, entry in zip(stale_paths, entries):
+            key = os.path.abspath(path)
+            if 'problems' not in entry:
+                entry['problems'] = cache[key]['problems']
+            if 'hash' in entry:
+                cache[key] = entry
+            results[path] = entry['problems']
+
+    problems = [dict(problem, file=path) for path in files for problem in results[path]]
+    return files, problems
+
+
+def _poll_changes(files, interval):
+    """Yield sets of changed paths by comparing stat fingerprints."""
+    def snapshot():
+        seen = {}
+        for path in files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen[path] = (stat.st_size, stat.st_mtime_ns)
+        return seen
+
+    previous = snapshot()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        changed = {path for path, mark in current.items() if previous.get(path) != mark}
+        previous = current
+        if changed:
+            yield changed
+
+
+def _watchdog_changes(roots, interval):
+    """Yield sets of changed paths from filesystem events (inotify on Linux)."""
+    changed, lock = set(), threading.Lock()
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in WRITE_EVENTS:
+                return  # our own reads raise opened/closed_no_write events
+            for path in (event.src_path, getattr(event, 'dest_path', '')):
+                if path.endswith(EXTENSIONS):
+                    with lock:
+                        changed.add(os.path.relpath(path))
+
+    observer = Observer()
+    for root in roots:
+        observer.schedule(Handler(), root if os.path.isdir(root) else os.path.dirname(root) or '.',
+                          recursive=True)
+    observer.start()
+    try:
+        while True:
+            time.sleep(interval)  # debounce editors that write in several steps
+            with lock:
+                batch = {path for path in changed if os.path.isfile(path)}
+                changed.clear()
+            if batch:
+                yield batch
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def watch(paths, cache, report, interval=0.25, jobs=None, cache_path=None):
+    """Re-check files as they change until interrupted."""
+    if Observer is not None:
+        changes = _watchdog_changes(paths, interval)
+    else:
+        changes = _poll_changes(lambda: source_files(paths), interval)
+    try:
+        for changed in changes:
+            files, problems = check_paths(sorted(changed), jobs, cache)
+            report(files, problems)
+            if cache_path:
+                save_cache(cache_path, cache)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='files or directories to check')
+    parser.add_argument('--format', choices=('json', 'text'), default='json')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help='result cache file (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='check every file from scratch')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-check files as they change')
+    args = parser.parse_args(argv)
+
+    def report(files, problems):
+        if args.format == 'json':
+            indent = None if args.watch else 2
+            json.dump({'files': len(files), 'problems': problems}, sys.stdout, indent=indent)
+            sys.stdout.write('\n')
+        else:
+            for problem in problems:
+                print('{file}:{line}:{column}: {message}'.format(**problem))
+        sys.stdout.flush()
+
+    cache_path = None if args.no_cache else args.cache
+    cache = load_cache(cache_path) if cache_path else {}
+    files, problems = check_paths(args.paths, args.jobs, cache)
+    report(files, problems)
+    if cache_path:
+        save_cache(cache_path, cache)
+    if args.watch:
+        watch(args.paths, cache, report, jobs=args.jobs, cache_path=cache_path)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
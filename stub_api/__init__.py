@@ -0,0 +1,199 @@
+"""Stand-in for the Perfmetric FastAPI backend, driven by openapi.json.
+
+    python -m stub_api --employees 2000 --tasks 200000 --port 8000
+    STUB_API_LATENCY='GET /reports/*=200:50' python -m stub_api
+
+Every operation in the spec gets a route. Path/query parameters and JSON or
+form bodies are validated against the spec and rejected with the same 422
+body FastAPI sends; secured operations need the bearer token issued by
+/auth/login(-json). Operations with a handler in handlers.py are served from
+a seeded SQLite database (store.py); any other operation answers with a
+value generated from its response schema, so new spec entries work at once.
+
+GET responses are cached per user until the database changes (PRAGMA
+data_version covers other workers, a local counter this one) or the date
+does, since overdue counts and default periods follow it. Latency can be
+injected per route with "METHOD /path-glob=mean_ms[:jitter_ms]" rules,
+comma-separated, from --latency or STUB_API_LATENCY.
+"""
+import asyncio
+import datetime
+import fnmatch
+import json
+import os
+import random
+import secrets
+from collections import OrderedDict
+
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from . import handlers, hierarchy, inbox, rollups, scheduler, spec, store
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_PATH = os.path.join(ROOT, 'openapi.json')
+CACHE_SIZE = 2048
+JSON_MEDIA = 'application/json'
+FORM_MEDIA = ('application/x-www-form-urlencoded', 'multipart/form-data')
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content):
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+def parse_latency(text):
+    """[(method, path_glob, mean_ms, jitter_ms)] from 'GET /reports/*=200:50,...'."""
+    rules = []
+    for item in filter(None, (part.strip() for part in (text or '').split(','))):
+        target, _, timing = item.rpartition('=')
+        method, _, pattern = target.strip().partition(' ')
+        mean, _, jitter = timing.partition(':')
+        if not pattern:
+            method, pattern = '*', method
+        rules.append((method.upper(), pattern.strip(), float(mean), float(jitter or 0)))
+    return rules
+
+
+def route_delay(rules, method, path, rng):
+    """Seconds to wait for a request, from the first matching latency rule."""
+    for rule_method, pattern, mean, jitter in rules:
+        if fnmatch.fnmatchcase(method, rule_method) and fnmatch.fnmatchcase(path, pattern):
+            return max(0.0, rng.gauss(mean, jitter)) / 1000
+    return 0.0
+
+
+def error_response(status, detail, headers=None):
+    return FastJSONResponse({'detail': detail}, status_code=status, headers=headers)
+
+
+async def http_exception(request, exc):
+    return error_response(exc.status_code, exc.detail, exc.headers)
+
+
+def authenticate(request):
+    header = request.headers.get('authorization', '')
+    scheme, _, token = header.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        raise handlers.HTTPError(401, 'Not authenticated')
+    state = request.app.state
+    emp_id = handlers.token_subject(state.secret, token)
+    user = emp_id and state.db.execute('SELECT * FROM employee WHERE emp_id = ? AND active = 1',
+                                       (emp_id,)).fetchone()
+    if not user:
+        raise handlers.HTTPError(401, 'Could not validate credentials')
+    return dict(user)
+
+
+async def read_body(request, operation):
+    if operation.body_media is None:
+        return None
+    if operation.body_media in FORM_MEDIA:
+        form = await request.form()
+        body = {key: form[key] for key in form.keys()}
+        shadow = {key: value.filename if isinstance(value, UploadFile) else value for key, value in body.items()}
+        operation.validate_body(shadow if body else spec.MISSING)
+        return body
+    raw = await request.body()
+    if not raw:
+        return operation.validate_body(spec.MISSING)
+    try:
+        body = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError as exc:
+        raise spec.RequestValidationError([spec._error('json_invalid', ['body', 0], 'JSON decode error',
+                                                       {}, error=str(exc))])
+    return operation.validate_body(body)
+
+
+def data_version(state):
+    """What a cached GET depends on: the data, and the date dashboards count from."""
+    return (state.db.execute('PRAGMA data_version').fetchone()[0], state.writes,
+            state.today or datetime.date.today())
+
+
+def endpoint(operation):
+    handler = handlers.ROUTES.get((operation.method, operation.path))
+    cacheable = operation.method == 'GET'
+    rng = random.Random(operation.operation_id)
+
+    async def serve(request):
+        state = request.app.state
+        delay = route_delay(state.latency, operation.method, request.url.path, state.rng)
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            user = authenticate(request) if operation.secured else None
+            params = operation.coerce_parameters(request.path_params, request.query_params)
+            body = await read_body(request, operation)
+            if handler is None:
+                return FastJSONResponse(spec.example(operation.spec, operation.response_schema or {}, rng))
+            key = None
+            if cacheable:
+                key = (request.url.path, str(request.url.query), user and user['emp_id'])
+                version = data_version(state)
+                hit = state.cache.get(key)
+                if hit is not None and hit[0] == version:
+                    state.cache.move_to_end(key)
+                    return Response(hit[1], media_type=JSON_MEDIA, headers=hit[2])
+            ctx = handlers.Context(request, state.db, user, params, body)
+            result = await handler(ctx)
+        except spec.RequestValidationError as exc:
+            return FastJSONResponse({'detail': exc.errors}, status_code=422)
+        except handlers.HTTPError as exc:
+            headers = {'WWW-Authenticate': 'Bearer'} if exc.status == 401 else None
+            return error_response(exc.status, exc.detail, headers)
+        if isinstance(result, Response):
+            return result
+        response = FastJSONResponse(result, headers=ctx.headers)
+        if key is not None:
+            state.cache[key] = (version, response.body, ctx.headers)
+            if len(state.cache) > CACHE_SIZE:
+                state.cache.popitem(last=False)
+        return response
+
+    serve.__name__ = operation.operation_id
+    return serve
+
+
+def create_app(spec_path=SPEC_PATH, db_path=None, latency=None, secret=None, today=None):
+    """The Starlette app for spec_path over the SQLite database at db_path."""
+    document = spec.load(spec_path)
+    routes = [Route(op.path, endpoint(op), methods=[op.method]) for op in spec.operations(document)]
+    app = Starlette(routes=routes, exception_handlers={HTTPException: http_exception})
+    state = app.state
+    state.db_path = db_path or os.environ.get('STUB_API_DB', 'stub_api.db')
+    state.db = store.connect(state.db_path)
+    store.create_schema(state.db)
+    if hierarchy.is_empty(state.db):
+        hierarchy.rebuild(state.db)
+    if inbox.is_empty(state.db):
+        inbox.rebuild(state.db)
+    if scheduler.is_empty(state.db):
+        scheduler.rebuild(state.db, today or datetime.date.today())
+    if rollups.is_empty(state.db):
+        rollups.rebuild(state.db, today or datetime.date.today())
+    state.latency = parse_latency(latency if latency is not None else os.environ.get('STUB_API_LATENCY'))
+    state.secret = (secret or os.environ.get('STUB_API_SECRET') or secrets.token_hex(16)).encode()
+    state.today = today
+    state.default_password = store.DEFAULT_PASSWORD
+    state.writes = 0
+    state.cache = OrderedDict()
+    state.rng = random.Random()
+    return app
+
+
+def app_from_env():
+    """create_app configured from STUB_API_* variables, for uvicorn --factory."""
+    today = os.environ.get('STUB_API_TODAY')
+    return create_app(os.environ.get('STUB_API_SPEC', SPEC_PATH),
+                      today=datetime.date.fromisoformat(today) if today else None)
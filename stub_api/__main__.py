@@ -0,0 +1,88 @@
+"""Run the stand-in API server.
+
+    python -m stub_api --db /tmp/perfmetric.db --employees 2000 --tasks 200000 --workers 4
+
+The database is seeded first when it does not exist (or with --reseed).
+--rebuild-rollups recounts the dashboard rollups from the task table (to
+backfill a database from before them, or after editing tasks by hand) and
+--check-rollups compares them with a recount, exiting 1 on any difference.
+Workers share one signing secret, so a token from any worker works on all.
+"""
+import argparse
+import datetime
+import os
+import secrets
+import sys
+import time
+
+import uvicorn
+
+from . import rollups, store
+
+
+def maintain_rollups(args):
+    """Run --rebuild-rollups and/or --check-rollups; returns the exit status."""
+    connection = store.connect(args.db)
+    store.create_schema(connection)
+    status = 0
+    if args.rebuild_rollups:
+        today = datetime.date.fromisoformat(args.today) if args.today else datetime.date.today()
+        started = time.perf_counter()
+        connection.execute('BEGIN IMMEDIATE')
+        rows = rollups.rebuild(connection, today)
+        connection.execute('COMMIT')
+        print(f'Rebuilt {rows} employee-day rollups as of {today} in {time.perf_counter() - started:.1f}s')
+    if args.check_rollups:
+        connection.execute('BEGIN')
+        differences = rollups.check(connection)
+        connection.execute('COMMIT')
+        for table, key, counter, stored, recounted in differences[:20]:
+            print(f'{table} {key} {counter}: {stored} stored, {recounted} recounted')
+        print(f'{len(differences)} differences between the rollups and the task table')
+        status = 1 if differences else 0
+    connection.close()
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='stub_api.db')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--spec', help='OpenAPI document (default: openapi.json at the repo root)')
+    parser.add_argument('--latency', help='e.g. "GET /reports/*=200:50,POST /tasks/*=30"')
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument('--seed-only', action='store_true', help='seed the database and exit')
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=20_000)
+    parser.add_argument('--notifications', type=int, default=20, help='per person')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--today', help='date the seed data and dashboards treat as today')
+    parser.add_argument('--rebuild-rollups', action='store_true', help='recount the dashboard rollups and exit')
+    parser.add_argument('--check-rollups', action='store_true',
+                        help='compare the dashboard rollups with a recount and exit')
+    args = parser.parse_args()
+
+    if args.reseed or not os.path.exists(args.db):
+        today = datetime.date.fromisoformat(args.today) if args.today else None
+        started = time.perf_counter()
+        people = store.seed(args.db, args.employees, args.tasks, args.notifications, args.seed, today)
+        print(f'Seeded {people} people and {args.tasks} tasks in {args.db} '
+              f'in {time.perf_counter() - started:.1f}s')
+    if args.rebuild_rollups or args.check_rollups:
+        sys.exit(maintain_rollups(args))
+    if args.seed_only:
+        return
+    os.environ['STUB_API_DB'] = args.db
+    os.environ.setdefault('STUB_API_SECRET', secrets.token_hex(16))
+    for name, value in (('STUB_API_SPEC', args.spec), ('STUB_API_LATENCY', args.latency),
+                        ('STUB_API_TODAY', args.today)):
+        if value:
+            os.environ[name] = value
+    uvicorn.run('stub_api:app_from_env', factory=True, host=args.host, port=args.port,
+                workers=args.workers, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
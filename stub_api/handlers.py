@@ -0,0 +1,1405 @@
+"""Handlers for the operations in openapi.json.
+
+Each handler is registered with @route(method, path) using the spec's own
+path template and receives a Context. Returning a dict or list sends JSON
+with any ctx.headers; returning a Response sends it as is; raising HTTPError
+sends {"detail": ...} with that status, like the FastAPI backend. The
+computations follow the real backend's behaviour closely enough for the
+dashboards to render and for load tests to exercise realistic query shapes.
+"""
+import base64
+import contextlib
+import datetime
+import hashlib
+import hmac
+
+from starlette.responses import Response
+
+from . import hierarchy, inbox, reports, rollups, scheduler, store
+from .store import OPEN_STATUSES, now
+
+ROUTES = {}
+MANAGER_ROLES = ('MANAGER', 'CFO', 'ADMIN')
+ORG_ROLES = ('CFO', 'ADMIN')
+TRANSITIONS = {
+    'START': (('NEW', 'REWORK'), 'IN_PROGRESS'),
+    'SUBMIT': (('IN_PROGRESS',), 'SUBMITTED'),
+    'APPROVE': (('SUBMITTED',), 'APPROVED'),
+    'REWORK': (('SUBMITTED',), 'REWORK'),
+    'CANCEL': (OPEN_STATUSES, 'CANCELLED'),
+    'RESTART': (('CANCELLED',), 'NEW'),
+}
+TRANSITION_NOTICES = {'SUBMIT': 'TASK_SUBMITTED', 'APPROVE': 'TASK_APPROVED', 'REWORK': 'TASK_REWORK'}
+COMPLETED_TARGET = 10
+
+STATS_SQL = '''
+    COUNT(*) AS total_tasks,
+    COALESCE(SUM(status = 'APPROVED'), 0) AS approved_tasks,
+    COALESCE(SUM(status = 'IN_PROGRESS'), 0) AS in_progress_tasks,
+    COALESCE(SUM(status = 'SUBMITTED'), 0) AS submitted_tasks,
+    COALESCE(SUM(status = 'REWORK'), 0) AS rework_tasks,
+    COALESCE(SUM(status = 'NEW'), 0) AS new_tasks,
+    COALESCE(SUM(status = 'CANCELLED'), 0) AS cancelled_tasks,
+    COALESCE(SUM(status IN ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'REWORK') AND due_date < :today), 0)
+        AS overdue_tasks,
+    COALESCE(SUM(status = 'APPROVED' AND rework_count = 0), 0) AS no_rework_tasks,
+    COALESCE(SUM(status = 'APPROVED' AND completed_date <= due_date), 0) AS on_time_tasks
+'''
+TASK_SQL = '''
+    SELECT t.*, e.name AS assigned_to_name, e.role AS assignee_role, d.name AS department_name,
+           p.title AS parent_task_title,
+           (SELECT COUNT(*) FROM task s WHERE s.parent_task_id = t.task_id) AS subtask_count
+    FROM task t
+    LEFT JOIN employee e ON e.emp_id = t.assigned_to_emp_id
+    LEFT JOIN department d ON d.dept_id = t.department_id
+    LEFT JOIN task p ON p.task_id = t.parent_task_id
+'''
+class HTTPError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class Context:
+    """Everything a handler needs for one request."""
+
+    def __init__(self, request, db, user, params, body):
+        self.request = request
+        self.db = db
+        self.user = user
+        self.params = params
+        self.body = body
+        self.state = request.app.state
+        self.headers = {}
+
+    @property
+    def today(self):
+        return self.state.today or datetime.date.today()
+
+    def rows(self, sql, args=()):
+        return [dict(row) for row in self.db.execute(sql, args)]
+
+    def row(self, sql, args=(), missing=None):
+        found = self.db.execute(sql, args).fetchone()
+        if found is None and missing:
+            raise HTTPError(404, missing)
+        return dict(found) if found is not None else None
+
+    def write(self, sql, args=()):
+        self.state.writes += 1
+        return self.db.execute(sql, args)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    def require(self, *roles):
+        if self.user['role'] not in roles:
+            raise HTTPError(403, 'Not enough permissions')
+
+
+def route(method, path):
+    def register(handler):
+        ROUTES[method, path] = handler
+        return handler
+    return register
+
+
+# -- tokens ----------------------------------------------------------------
+
+def issue_token(secret, emp_id):
+    payload = base64.urlsafe_b64encode(emp_id.encode()).decode().rstrip('=')
+    signature = hmac.new(secret, payload.encode(), hashlib.sha256).hexdigest()[:32]
+    return f'stub.{payload}.{signature}'
+
+
+def token_subject(secret, token):
+    try:
+        prefix, payload, signature = token.split('.')
+    except ValueError:
+        return None
+    expected = hmac.new(secret, payload.encode(), hashlib.sha256).hexdigest()[:32]
+    if prefix != 'stub' or not hmac.compare_digest(signature, expected):
+        return None
+    return base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)).decode()
+
+
+# -- shared helpers --------------------------------------------------------
+
+def month_start(day, back=0):
+    month = day.month - 1 - back
+    return datetime.date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def period(ctx):
+    """(from, to, previous_from, previous_to) as ISO dates; defaults to this month."""
+    to_date = ctx.params.get('to_date') or ctx.today.isoformat()
+    from_date = ctx.params.get('from_date') or month_start(ctx.today).isoformat()
+    first = month_start(datetime.date.fromisoformat(from_date))
+    previous_from = month_start(first, 1)
+    return from_date, to_date, previous_from.isoformat(), (first - datetime.timedelta(days=1)).isoformat()
+
+
+def score(stats):
+    """performanceEngine.js weighting for one stats row; None without tasks."""
+    assigned, approved = stats['total_tasks'], stats['approved_tasks']
+    if not assigned:
+        return None
+    completion = approved / assigned * 100
+    quality = stats['no_rework_tasks'] / approved * 100 if approved else 0
+    timeliness = stats['on_time_tasks'] / approved * 100 if approved else 0
+    productivity = min(approved / COMPLETED_TARGET * 100, 100)
+    return round(completion * 0.40 + quality * 0.25 + timeliness * 0.20 + productivity * 0.15, 2)
+
+
+def completion_pct(stats):
+    return round(stats['approved_tasks'] / stats['total_tasks'] * 100, 2) if stats['total_tasks'] else 0.0
+
+
+def average(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def team_scope(ctx, manager=None, department_id=None, include_inactive=False):
+    """(SQL, args) selecting the emp_ids under a manager (inclusive) from the
+    hierarchy index, or everyone for CFO/admin; use as `col IN (<sql>)`."""
+    manager = manager or ctx.user['emp_id']
+    where, args = ['1'], []
+    if not include_inactive:
+        where.append('e.active = 1')
+    if department_id:
+        where.append('e.department_id = ?')
+        args.append(department_id)
+    condition = ' AND '.join(where)
+    if ctx.user['role'] in ORG_ROLES and manager == ctx.user['emp_id']:
+        return f'SELECT e.emp_id FROM employee e WHERE {condition}', args
+    return (f'SELECT c.descendant_emp_id FROM employee_closure c JOIN employee e ON e.emp_id = c.descendant_emp_id '
+            f'WHERE c.ancestor_emp_id = ? AND {condition}', [manager, *args])
+
+
+def team_members(ctx, manager=None, department_id=None, include_inactive=False):
+    """The employee rows team_scope() selects."""
+    sql, args = team_scope(ctx, manager, department_id, include_inactive)
+    return ctx.rows(f'SELECT * FROM employee WHERE emp_id IN ({sql}) ORDER BY emp_id', args)
+
+
+def in_clause(values):
+    return ', '.join('?' * len(values)) or 'NULL'
+
+
+def grouped(ctx, source, counters, group, where, args, from_date, to_date, having=''):
+    """counters selected from source grouped by a column expression, keyed
+    by its value; a tuple of expressions gives tuple keys."""
+    columns = (group,) if isinstance(group, str) else group
+    conditions, values = [where], list(args)
+    if from_date:
+        conditions.append('assigned_date >= ?')
+        values.append(from_date)
+    if to_date:
+        conditions.append('assigned_date <= ?')
+        values.append(to_date)
+    keys = ', '.join(f'{column} AS grp{n}' for n, column in enumerate(columns))
+    order = ', '.join(f'grp{n}' for n in range(len(columns)))
+    rows = ctx.db.execute(f'SELECT {keys}, {counters} FROM {source} '
+                          f'WHERE {" AND ".join(conditions)} GROUP BY {order} {having} ORDER BY {order}',
+                          values)
+    width = len(columns)
+    result = {}
+    for row in rows:
+        key = tuple(row[:width])
+        result[key[0] if width == 1 else key] = dict(zip(row.keys()[width:], row[width:]))
+    return result
+
+
+def stats_by(ctx, group, where='1', args=(), from_date=None, to_date=None):
+    """STATS_SQL over task, grouped() by group."""
+    return grouped(ctx, 'task', STATS_SQL.replace(':today', '?'), group, where, [ctx.today.isoformat(), *args],
+                   from_date, to_date)
+
+
+def rollup_stats(ctx, group, where='1', args=(), from_date=None, to_date=None):
+    """stats_by() answered from the daily rollups, which carry only
+    assigned_to_emp_id, department_id and assigned_date to group and filter on."""
+    if rollups.as_of(ctx.db) != ctx.today.isoformat():
+        with ctx.transaction():
+            ctx.state.writes += 1
+            rollups.age(ctx.db, ctx.today)
+    columns = (group,) if isinstance(group, str) else group
+    keys = tuple(rollups.READ_KEYS.get(column, column) for column in columns)
+    return grouped(ctx, rollups.source(where, *columns), rollups.TOTALS,
+                   keys[0] if isinstance(group, str) else keys, where, args, from_date, to_date,
+                   'HAVING SUM(total_tasks) > 0')
+
+
+def empty_stats():
+    return dict.fromkeys(('total_tasks', 'approved_tasks', 'in_progress_tasks', 'submitted_tasks',
+                          'rework_tasks', 'new_tasks', 'cancelled_tasks', 'overdue_tasks',
+                          'no_rework_tasks', 'on_time_tasks'), 0)
+
+
+def total_stats(groups):
+    total = empty_stats()
+    for stats in groups.values():
+        for key in total:
+            total[key] += stats[key]
+    return total
+
+
+def task_json(row):
+    row = dict(row)
+    row['id'] = row['task_id']
+    row['employee_id'] = row['assigned_to_emp_id']
+    row['assigned_by'] = row['assigned_by_emp_id']
+    row['severity'] = row['priority'].title()
+    row['is_parent'] = bool(row.get('subtask_count'))
+    row['is_reassigned'] = bool(row['reassignment_count'])
+    return row
+
+
+def get_task(ctx, task_id):
+    return task_json(ctx.row(TASK_SQL + 'WHERE t.task_id = ?', (task_id,), missing='Task not found'))
+
+
+def employee_json(row):
+    row = dict(row)
+    row.pop('password', None)
+    row['active'] = bool(row['active'])
+    row['id'] = row['emp_id']
+    return row
+
+
+def get_employee(ctx, emp_id):
+    return employee_json(ctx.row('SELECT * FROM employee WHERE emp_id = ?', (emp_id,),
+                                 missing='Employee not found'))
+
+
+def department_json(row):
+    row = dict(row)
+    row['active'] = bool(row['active'])
+    row['id'] = row['dept_id']
+    return row
+
+
+def notify(ctx, rows):
+    """Send notifications given as (emp_id, type, message, task_id) rows."""
+    ctx.state.writes += 1
+    inbox.fan_out(ctx.db, rows)
+
+
+def insert_task(ctx, values, parent_task_id=None):
+    assignee = get_employee(ctx, values['assigned_to_emp_id'])
+    created = now()
+    with ctx.transaction():
+        cursor = ctx.write(
+            'INSERT INTO task (title, description, priority, status, assigned_to_emp_id, assigned_by_emp_id, '
+            'department_id, parent_task_id, assigned_date, due_date, created_at, updated_at) '
+            "VALUES (?, ?, ?, 'NEW', ?, ?, ?, ?, ?, ?, ?, ?)",
+            (values['title'], values.get('description'), values['priority'], assignee['emp_id'],
+             ctx.user['emp_id'], assignee['department_id'], parent_task_id or values.get('parent_task_id'),
+             ctx.today.isoformat(), values['due_date'], created, created))
+        task_id = cursor.lastrowid
+        rollups.apply(ctx.db, 1, 'task_id = ?', (task_id,))
+        ctx.write('INSERT INTO task_history (task_id, action, to_status, actor_emp_id, created_at) '
+                  "VALUES (?, 'CREATE', 'NEW', ?, ?)", (task_id, ctx.user['emp_id'], created))
+        notify(ctx, [(assignee['emp_id'], 'TASK_ASSIGNED', f'New task assigned: {values["title"]}', task_id)])
+        scheduler.remind(ctx.db, [(task_id, values['due_date'])])
+    return get_task(ctx, task_id)
+
+
+# -- auth ------------------------------------------------------------------
+
+def login(ctx, emp_id, password):
+    user = ctx.row('SELECT * FROM employee WHERE emp_id = ? AND active = 1', (emp_id,))
+    if user is None or not hmac.compare_digest(user['password'], password):
+        raise HTTPError(401, 'Invalid credentials')
+    return {'access_token': issue_token(ctx.state.secret, user['emp_id']), 'token_type': 'bearer',
+            'role': user['role'], 'emp_id': user['emp_id']}
+
+
+@route('POST', '/auth/login-json')
+async def login_json(ctx):
+    return login(ctx, ctx.body['emp_id'], ctx.body['password'])
+
+
+@route('POST', '/auth/login')
+async def login_form(ctx):
+    return login(ctx, ctx.body['username'], ctx.body['password'])
+
+
+@route('GET', '/auth/me')
+async def me(ctx):
+    user = employee_json(ctx.user)
+    department = ctx.row('SELECT name FROM department WHERE dept_id = ?', (user['department_id'],))
+    user['department_name'] = department['name'] if department else None
+    return user
+
+
+@route('POST', '/auth/change-password')
+async def change_password(ctx):
+    if not hmac.compare_digest(ctx.user['password'], ctx.body['current_password']):
+        raise HTTPError(400, 'Current password is incorrect')
+    ctx.write('UPDATE employee SET password = ? WHERE emp_id = ?',
+              (ctx.body['new_password'], ctx.user['emp_id']))
+    return {'message': 'Password changed successfully'}
+
+
+# -- departments -----------------------------------------------------------
+
+DEPARTMENT_SQL = '''
+    SELECT d.*, (SELECT COUNT(*) FROM employee e WHERE e.department_id = d.dept_id AND e.active = 1)
+        AS employee_count
+    FROM department d
+'''
+
+
+@route('GET', '/departments')
+async def list_departments(ctx):
+    return [department_json(row) for row in ctx.rows(DEPARTMENT_SQL + 'WHERE d.active = 1 ORDER BY d.name')]
+
+
+@route('DELETE', '/departments/departments/{dept_id}')
+async def delete_department(ctx):
+    ctx.require(*ORG_ROLES)
+    if not ctx.write('UPDATE department SET active = 0 WHERE dept_id = ?', (ctx.params['dept_id'],)).rowcount:
+        raise HTTPError(404, 'Department not found')
+    return {'message': 'Department deactivated', 'dept_id': ctx.params['dept_id']}
+
+
+@route('GET', '/admin/departments')
+async def admin_departments(ctx):
+    ctx.require(*ORG_ROLES)
+    return [department_json(row) for row in ctx.rows(DEPARTMENT_SQL + 'ORDER BY d.name')]
+
+
+@route('POST', '/admin/departments')
+async def create_department(ctx):
+    ctx.require(*ORG_ROLES)
+    body = ctx.body
+    if ctx.row('SELECT 1 FROM department WHERE dept_id = ?', (body['dept_id'],)):
+        raise HTTPError(409, 'Department already exists')
+    ctx.write('INSERT INTO department VALUES (?, ?, ?, ?)',
+              (body['dept_id'], body['name'], body.get('manager_emp_id'), int(body.get('active', True))))
+    return department_json(ctx.row(DEPARTMENT_SQL + 'WHERE d.dept_id = ?', (body['dept_id'],)))
+
+
+@route('GET', '/admin/departments/{dept_id}')
+async def get_department(ctx):
+    return department_json(ctx.row(DEPARTMENT_SQL + 'WHERE d.dept_id = ?', (ctx.params['dept_id'],),
+                                   missing='Department not found'))
+
+
+@route('PATCH', '/admin/departments/{dept_id}')
+async def update_department(ctx):
+    ctx.require(*ORG_ROLES)
+    await get_department(ctx)
+    changes = {key: value for key, value in ctx.body.items() if key in ('name', 'manager_emp_id', 'active')}
+    if changes:
+        assignments = ', '.join(f'{key} = ?' for key in changes)
+        ctx.write(f'UPDATE department SET {assignments} WHERE dept_id = ?',
+                  [*changes.values(), ctx.params['dept_id']])
+    return await get_department(ctx)
+
+
+# -- employees -------------------------------------------------------------
+
+def employee_filters(ctx, conditions, args):
+    if ctx.params.get('department_id'):
+        conditions.append('department_id = ?')
+        args.append(ctx.params['department_id'])
+    if ctx.params.get('search'):
+        conditions.append('(name LIKE ? OR emp_id LIKE ?)')
+        args += [f'%{ctx.params["search"]}%'] * 2
+
+
+@route('GET', '/employees')
+async def list_employees(ctx):
+    conditions, args = ['1'], []
+    if ctx.params.get('role'):
+        conditions.append('role = ?')
+        args.append(ctx.params['role'].upper())
+    if ctx.params.get('active') is not None:
+        conditions.append('active = ?')
+        args.append(int(ctx.params['active']))
+    employee_filters(ctx, conditions, args)
+    return [employee_json(row) for row in
+            ctx.rows(f'SELECT * FROM employee WHERE {" AND ".join(conditions)} ORDER BY emp_id', args)]
+
+
+@route('POST', '/employees')
+async def create_employee(ctx):
+    ctx.require(*ORG_ROLES)
+    body = ctx.body
+    if ctx.row('SELECT 1 FROM employee WHERE emp_id = ?', (body['emp_id'],)):
+        raise HTTPError(409, 'Employee already exists')
+    if body.get('manager_emp_id'):
+        get_employee(ctx, body['manager_emp_id'])
+    with ctx.transaction():
+        ctx.write('INSERT INTO employee VALUES (?, ?, ?, ?, ?, ?, 1, ?)',
+                  (body['emp_id'], body['name'], body['email'], body['role'], body['department_id'],
+                   body.get('manager_emp_id'), ctx.state.default_password))
+        hierarchy.add(ctx.db, body['emp_id'], body.get('manager_emp_id'))
+    return get_employee(ctx, body['emp_id'])
+
+
+@route('GET', '/employees/assignable')
+async def assignable_employees(ctx):
+    ctx.require(*MANAGER_ROLES)
+    members = team_members(ctx, department_id=ctx.params.get('department_id'))
+    search = (ctx.params.get('search') or '').lower()
+    return [employee_json(row) for row in members
+            if row['role'] in ('EMPLOYEE', 'MANAGER')
+            and (not search or search in row['name'].lower() or search in row['emp_id'].lower())][:200]
+
+
+def set_active(ctx, active):
+    ctx.require(*ORG_ROLES)
+    if not ctx.write('UPDATE employee SET active = ? WHERE emp_id = ?', (active, ctx.params['emp_id'])).rowcount:
+        raise HTTPError(404, 'Employee not found')
+    return get_employee(ctx, ctx.params['emp_id'])
+
+
+@route('POST', '/employees/{emp_id}/deactivate')
+async def deactivate_employee(ctx):
+    return set_active(ctx, 0)
+
+
+@route('POST', '/employees/{emp_id}/activate')
+async def activate_employee(ctx):
+    return set_active(ctx, 1)
+
+
+@route('GET', '/employees/{emp_id}')
+async def employee_detail(ctx):
+    return get_employee(ctx, ctx.params['emp_id'])
+
+
+@route('PATCH', '/employees/{emp_id}')
+async def update_employee(ctx):
+    ctx.require(*ORG_ROLES)
+    current = get_employee(ctx, ctx.params['emp_id'])
+    fields = ('name', 'email', 'role', 'department_id', 'manager_emp_id', 'active')
+    changes = {key: value for key, value in ctx.body.items() if key in fields}
+    moved = 'manager_emp_id' in changes and changes['manager_emp_id'] != current['manager_emp_id']
+    if moved and changes['manager_emp_id']:
+        get_employee(ctx, changes['manager_emp_id'])
+    if changes:
+        assignments = ', '.join(f'{key} = ?' for key in changes)
+        with ctx.transaction():
+            ctx.write(f'UPDATE employee SET {assignments} WHERE emp_id = ?',
+                      [*changes.values(), ctx.params['emp_id']])
+            if moved:
+                try:
+                    hierarchy.move(ctx.db, current['emp_id'], changes['manager_emp_id'])
+                except hierarchy.CycleError as exc:
+                    raise HTTPError(400, f'Invalid manager: {exc}')
+    return get_employee(ctx, ctx.params['emp_id'])
+
+
+@route('POST', '/employees/{emp_id}/reset-password')
+async def reset_password(ctx):
+    ctx.require(*ORG_ROLES)
+    if not ctx.write('UPDATE employee SET password = ? WHERE emp_id = ?',
+                     (ctx.body['new_password'], ctx.params['emp_id'])).rowcount:
+        raise HTTPError(404, 'Employee not found')
+    return {'message': 'Password reset successfully', 'emp_id': ctx.params['emp_id']}
+
+
+# -- org tree --------------------------------------------------------------
+
+@route('GET', '/org/tree')
+async def org_tree(ctx):
+    root_id = ctx.params.get('root_emp_id')
+    if root_id is None:
+        top = ctx.row("SELECT emp_id FROM employee WHERE role = 'CFO' ORDER BY emp_id")
+        root_id = ctx.user['emp_id'] if ctx.user['role'] == 'MANAGER' or top is None else top['emp_id']
+    depth, include_inactive = ctx.params['depth'], ctx.params['include_inactive']
+    rows = ctx.rows(f'''
+        SELECT e.emp_id, e.name, e.role, e.department_id, e.manager_emp_id, e.active, c.depth AS level,
+               (SELECT COUNT(*) FROM employee_closure k JOIN employee m ON m.emp_id = k.descendant_emp_id
+                WHERE k.ancestor_emp_id = e.emp_id AND k.depth = 1
+                {'' if include_inactive else 'AND m.active = 1'}) AS children_count
+        FROM employee_closure c JOIN employee e ON e.emp_id = c.descendant_emp_id
+        WHERE c.ancestor_emp_id = ? AND c.depth <= ? ORDER BY c.depth, e.emp_id''', (root_id, depth))
+    if not rows:
+        raise HTTPError(404, 'Employee not found')
+    nodes = {}
+    for row in rows:
+        level = row.pop('level')
+        parent = nodes.get(row['manager_emp_id']) if level else None
+        # an inactive manager hides their whole subtree, as the old walk did
+        if level and (parent is None or not (row['active'] or include_inactive)):
+            continue
+        node = dict(row, active=bool(row['active']), department_id=row['department_id'] or '', children=[])
+        nodes[node['emp_id']] = node
+        if parent is not None:
+            parent['children'].append(node)
+    return {'root': nodes[root_id]}
+
+
+# -- tasks -----------------------------------------------------------------
+
+def task_filters(ctx, conditions, args, prefix='t.'):
+    params = ctx.params
+    if params.get('status'):
+        conditions.append(f'{prefix}status = ?')
+        args.append(params['status'].upper())
+    if params.get('department_id'):
+        conditions.append(f'{prefix}department_id = ?')
+        args.append(params['department_id'])
+    if params.get('priority') or params.get('severity'):
+        conditions.append(f'{prefix}priority = ?')
+        args.append((params.get('priority') or params.get('severity')).upper())
+    if params.get('search'):
+        conditions.append(f'{prefix}title LIKE ?')
+        args.append(f'%{params["search"]}%')
+    if params.get('from_date'):
+        conditions.append(f'{prefix}due_date >= ?')
+        args.append(params['from_date'])
+    if params.get('to_date'):
+        conditions.append(f'{prefix}due_date <= ?')
+        args.append(params['to_date'])
+
+
+@route('GET', '/tasks')
+async def list_tasks(ctx):
+    conditions, args = ['1'], []
+    scope = ctx.params['scope']
+    if scope == 'mine':
+        conditions.append('t.assigned_to_emp_id = ?')
+        args.append(ctx.user['emp_id'])
+    elif scope == 'department':
+        ctx.require(*MANAGER_ROLES)
+        if ctx.user['role'] == 'MANAGER':
+            conditions.append('t.department_id = ?')
+            args.append(ctx.user['department_id'])
+    else:
+        ctx.require(*ORG_ROLES)
+    due = ctx.params.get('due')
+    if due == 'today':
+        conditions.append('t.due_date = ?')
+        args.append(ctx.today.isoformat())
+    elif due == 'overdue':
+        conditions.append(f"t.due_date < ? AND t.status IN ({in_clause(OPEN_STATUSES)})")
+        args += [ctx.today.isoformat(), *OPEN_STATUSES]
+    task_filters(ctx, conditions, args)
+    args += [ctx.params['limit'], ctx.params['offset']]
+    return [task_json(row) for row in ctx.rows(
+        TASK_SQL + f'WHERE {" AND ".join(conditions)} ORDER BY t.due_date DESC, t.task_id DESC '
+        'LIMIT ? OFFSET ?', args)]
+
+
+@route('POST', '/tasks')
+async def create_task(ctx):
+    return insert_task(ctx, ctx.body)
+
+
+@route('GET', '/tasks/team')
+async def team_tasks(ctx):
+    ctx.require(*MANAGER_ROLES)
+    scope, args = team_scope(ctx)
+    conditions = [f't.assigned_to_emp_id IN ({scope})']
+    task_filters(ctx, conditions, args)
+    where = ' AND '.join(conditions)
+    total = ctx.row(f'SELECT COUNT(*) AS n FROM task t WHERE {where}', args)['n']
+    page, limit = ctx.params['page'], ctx.params['limit']
+    items = ctx.rows(TASK_SQL + f'WHERE {where} ORDER BY t.due_date DESC, t.task_id DESC LIMIT ? OFFSET ?',
+                     args + [limit, (page - 1) * limit])
+    return {'items': [task_json(row) for row in items], 'total': total, 'page': page, 'limit': limit}
+
+
+@route('GET', '/tasks/{task_id}')
+async def task_detail(ctx):
+    return get_task(ctx, ctx.params['task_id'])
+
+
+@route('POST', '/tasks/{task_id}/transition')
+async def transition_task(ctx):
+    task = get_task(ctx, ctx.params['task_id'])
+    action = ctx.body['action']
+    sources, target = TRANSITIONS[action]
+    if task['status'] not in sources:
+        raise HTTPError(400, f"Cannot {action} a task in status {task['status']}")
+    completed = ctx.today.isoformat() if target == 'APPROVED' else None
+    stamp = now()
+    with ctx.transaction():
+        with rollups.changing(ctx.db, task['task_id']):
+            ctx.write('UPDATE task SET status = ?, completed_date = ?, rework_count = rework_count + ?, '
+                      'updated_at = ? WHERE task_id = ?',
+                      (target, completed, int(action == 'REWORK'), stamp, task['task_id']))
+        ctx.write('INSERT INTO task_history (task_id, action, from_status, to_status, actor_emp_id, comment, '
+                  'created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                  (task['task_id'], action, task['status'], target, ctx.user['emp_id'],
+                   ctx.body.get('comment'), stamp))
+        if target in OPEN_STATUSES and task['status'] not in OPEN_STATUSES:
+            scheduler.remind(ctx.db, [(task['task_id'], task['due_date'])])
+        elif target not in OPEN_STATUSES:
+            ctx.write('DELETE FROM task_reminder WHERE task_id = ?', (task['task_id'],))
+        if action in TRANSITION_NOTICES:
+            recipient = task['assigned_by_emp_id'] if action == 'SUBMIT' else task['assigned_to_emp_id']
+            notify(ctx, [(recipient, TRANSITION_NOTICES[action],
+                          f"{task['title']} is now {target.replace('_', ' ').lower()}", task['task_id'])])
+    return get_task(ctx, task['task_id'])
+
+
+@route('GET', '/tasks/{task_id}/history')
+async def task_history(ctx):
+    get_task(ctx, ctx.params['task_id'])
+    return ctx.rows('SELECT h.*, e.name AS actor_name FROM task_history h '
+                    'LEFT JOIN employee e ON e.emp_id = h.actor_emp_id '
+                    'WHERE h.task_id = ? ORDER BY h.history_id', (ctx.params['task_id'],))
+
+
+@route('GET', '/tasks/{parent_id}/subtasks')
+async def list_subtasks(ctx):
+    get_task(ctx, ctx.params['parent_id'])
+    return [task_json(row) for row in
+            ctx.rows(TASK_SQL + 'WHERE t.parent_task_id = ? ORDER BY t.task_id', (ctx.params['parent_id'],))]
+
+
+@route('POST', '/tasks/{parent_id}/subtasks')
+async def create_subtask(ctx):
+    get_task(ctx, ctx.params['parent_id'])
+    return insert_task(ctx, ctx.body, parent_task_id=ctx.params['parent_id'])
+
+
+@route('POST', '/tasks/{task_id}/reassign')
+async def reassign_task(ctx):
+    ctx.require(*MANAGER_ROLES)
+    task = get_task(ctx, ctx.params['task_id'])
+    assignee = get_employee(ctx, ctx.body['new_assigned_to_emp_id'])
+    stamp = now()
+    with ctx.transaction():
+        with rollups.changing(ctx.db, task['task_id']):
+            ctx.write('UPDATE task SET assigned_to_emp_id = ?, department_id = ?, due_date = ?, '
+                      'reassignment_count = reassignment_count + 1, updated_at = ? WHERE task_id = ?',
+                      (assignee['emp_id'], assignee['department_id'], ctx.body['new_due_date'], stamp,
+                       task['task_id']))
+        ctx.write('INSERT INTO task_history (task_id, action, from_status, to_status, actor_emp_id, comment, '
+                  "created_at) VALUES (?, 'REASSIGN', ?, ?, ?, ?, ?)",
+                  (task['task_id'], task['status'], task['status'], ctx.user['emp_id'], ctx.body.get('reason'),
+                   stamp))
+        notify(ctx, [(assignee['emp_id'], 'TASK_ASSIGNED', f"Task reassigned to you: {task['title']}",
+                      task['task_id'])])
+        if task['status'] in OPEN_STATUSES:
+            scheduler.remind(ctx.db, [(task['task_id'], ctx.body['new_due_date'])])
+    result = get_task(ctx, task['task_id'])
+    result['reassigned_from'] = task['assigned_to_emp_id']
+    result['reassigned_to_emp_id'] = assignee['emp_id']
+    return result
+
+
+ATTACHMENT_COLUMNS = 'attachment_id, task_id, filename, content_type, size, uploaded_by, created_at'
+
+
+@route('POST', '/tasks/{task_id}/attachments')
+async def upload_attachment(ctx):
+    get_task(ctx, ctx.params['task_id'])
+    upload = ctx.body['file']
+    content = await upload.read()
+    cursor = ctx.write('INSERT INTO attachment (task_id, filename, content_type, size, content, uploaded_by, '
+                       'created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (ctx.params['task_id'], upload.filename, upload.content_type, len(content), content,
+                        ctx.user['emp_id'], now()))
+    return ctx.row(f'SELECT {ATTACHMENT_COLUMNS} FROM attachment WHERE attachment_id = ?', (cursor.lastrowid,))
+
+
+@route('GET', '/tasks/{task_id}/attachments')
+async def list_attachments(ctx):
+    get_task(ctx, ctx.params['task_id'])
+    return ctx.rows(f'SELECT {ATTACHMENT_COLUMNS} FROM attachment WHERE task_id = ? ORDER BY attachment_id',
+                    (ctx.params['task_id'],))
+
+
+@route('GET', '/tasks/{task_id}/attachments/{attachment_id}')
+async def download_attachment(ctx):
+    row = ctx.row('SELECT * FROM attachment WHERE task_id = ? AND attachment_id = ?',
+                  (ctx.params['task_id'], ctx.params['attachment_id']), missing='Attachment not found')
+    return Response(row['content'], media_type=row['content_type'] or 'application/octet-stream',
+                    headers={'Content-Disposition': f'attachment; filename="{row["filename"]}"'})
+
+
+@route('DELETE', '/tasks/{task_id}/attachments/{attachment_id}')
+async def delete_attachment(ctx):
+    if not ctx.write('DELETE FROM attachment WHERE task_id = ? AND attachment_id = ?',
+                     (ctx.params['task_id'], ctx.params['attachment_id'])).rowcount:
+        raise HTTPError(404, 'Attachment not found')
+    return {'message': 'Attachment deleted'}
+
+
+# -- dashboards ------------------------------------------------------------
+
+def today_tasks(ctx, scope):
+    sql, args = scope
+    rows = ctx.rows(TASK_SQL + f'WHERE t.assigned_to_emp_id IN ({sql}) AND t.due_date <= ? '
+                    f'AND t.status IN ({in_clause(OPEN_STATUSES)}) ORDER BY t.due_date LIMIT 100',
+                    [*args, ctx.today.isoformat(), *OPEN_STATUSES])
+    return {'date': ctx.today.isoformat(), 'count': len(rows), 'items': [task_json(row) for row in rows]}
+
+
+@route('GET', '/dashboard/employee/today')
+async def employee_today(ctx):
+    return today_tasks(ctx, ('?', [ctx.user['emp_id']]))
+
+
+@route('GET', '/dashboard/manager/today')
+async def manager_today(ctx):
+    ctx.require(*MANAGER_ROLES)
+    return today_tasks(ctx, team_scope(ctx))
+
+
+@route('GET', '/dashboard/cfo/today')
+async def cfo_today(ctx):
+    ctx.require(*ORG_ROLES)
+    return today_tasks(ctx, team_scope(ctx))
+
+
+@route('GET', '/dashboard/employee')
+async def employee_dashboard(ctx):
+    from_date, to_date, _, _ = period(ctx)
+    stats = rollup_stats(ctx, 'assigned_to_emp_id', 'assigned_to_emp_id = ?', [ctx.user['emp_id']],
+                         from_date, to_date).get(ctx.user['emp_id'], empty_stats())
+    return dict(stats, emp_id=ctx.user['emp_id'], range={'from_date': from_date, 'to_date': to_date},
+                completion_rate=completion_pct(stats), performance_score=score(stats) or 0.0)
+
+
+def member_stats(ctx, scope, from_date, to_date):
+    sql, args = scope
+    return rollup_stats(ctx, 'assigned_to_emp_id', f'assigned_to_emp_id IN ({sql})', args, from_date, to_date)
+
+
+def manager_analytics(ctx):
+    scope = team_scope(ctx, department_id=ctx.params.get('department_id'))
+    from_date, to_date, previous_from, previous_to = period(ctx)
+    current = member_stats(ctx, scope, from_date, to_date)
+    previous = member_stats(ctx, scope, previous_from, previous_to)
+    me = ctx.user['emp_id']
+    scores = {emp_id: score(stats) for emp_id, stats in current.items()}
+    previous_scores = {emp_id: score(stats) for emp_id, stats in previous.items()}
+    team_current = average(value for key, value in scores.items() if key != me)
+    team_previous = average(value for key, value in previous_scores.items() if key != me)
+    manager_current = average([team_current, scores.get(me)])
+    manager_previous = average([team_previous, previous_scores.get(me)])
+    ranking = sorted(({'emp_id': emp_id, 'score': value} for emp_id, value in scores.items()
+                      if value is not None), key=lambda row: -row['score'])
+    overall = member_stats(ctx, scope, None, None)
+    open_tasks = {emp_id: stats['new_tasks'] + stats['in_progress_tasks'] + stats['submitted_tasks']
+                  + stats['rework_tasks'] for emp_id, stats in overall.items()}
+    workload = [{'emp_id': emp_id, 'open_tasks': count}
+                for emp_id, count in sorted(open_tasks.items(), key=lambda item: (-item[1], item[0])) if count]
+    totals = total_stats(overall)
+    delta = None
+    if manager_current is not None and manager_previous:
+        delta = (manager_current - manager_previous) / manager_previous * 100
+    return dict(
+        total_stats(current),
+        department_id=ctx.params.get('department_id') or ctx.user['department_id'],
+        range={'from_date': from_date, 'to_date': to_date},
+        previous_range={'from_date': previous_from, 'to_date': previous_to},
+        team_score_current=team_current, team_score_previous=team_previous,
+        manager_personal_score_current=scores.get(me), manager_personal_score_previous=previous_scores.get(me),
+        manager_score_current=round(manager_current, 2) if manager_current is not None else None,
+        manager_score_previous=round(manager_previous, 2) if manager_previous is not None else None,
+        manager_score_delta_percent=delta,
+        team_pending_count=totals['submitted_tasks'] + totals['new_tasks'] + totals['in_progress_tasks'],
+        team_overdue_count=totals['overdue_tasks'],
+        employee_ranking=ranking,
+        graphs={'workload_distribution_employee_wise': workload, 'performance_index_employee_wise': ranking},
+    )
+
+
+@route('GET', '/dashboard/manager')
+async def manager_dashboard(ctx):
+    ctx.require(*MANAGER_ROLES)
+    return manager_analytics(ctx)
+
+
+@route('GET', '/dashboard/manager/analytics')
+async def manager_dashboard_analytics(ctx):
+    ctx.require(*MANAGER_ROLES)
+    return manager_analytics(ctx)
+
+
+def department_stats(ctx, from_date=None, to_date=None, department_id=None):
+    where, args = ('department_id = ?', [department_id]) if department_id else ('1', [])
+    groups = rollup_stats(ctx, 'department_id', where, args, from_date, to_date)
+    names = {row['dept_id']: row['name'] for row in ctx.rows('SELECT dept_id, name FROM department')}
+    people = {row['emp_id']: row['name'] for row in ctx.rows('SELECT emp_id, name FROM employee')}
+    tops = {}
+    for (dept_id, emp_id), stats in rollup_stats(ctx, ('department_id', 'assigned_to_emp_id'), where, args,
+                                                 from_date, to_date).items():
+        value = score(stats)
+        best = tops.get(dept_id)
+        if value is not None and (best is None or value > best['score']):
+            tops[dept_id] = {'emp_id': emp_id, 'name': people.get(emp_id, emp_id), 'score': value}
+    return [dict(stats, department_id=dept_id, department_name=names.get(dept_id, dept_id),
+                 completed_tasks=stats['approved_tasks'], completion_pct=completion_pct(stats),
+                 top_performer=tops.get(dept_id))
+            for dept_id, stats in groups.items()]
+
+
+@route('GET', '/dashboard/cfo')
+async def cfo_dashboard(ctx):
+    ctx.require(*ORG_ROLES)
+    from_date, to_date, _, _ = period(ctx)
+    departments = department_stats(ctx, from_date, to_date)
+    totals = total_stats({row['department_id']: row for row in departments})
+    return dict(totals, range={'from_date': from_date, 'to_date': to_date},
+                completion_pct=completion_pct(totals), department_stats=departments)
+
+
+@route('GET', '/dashboard/employee/activities')
+async def employee_activities(ctx):
+    return ctx.rows('SELECT h.*, t.title FROM task_history h JOIN task t USING (task_id) '
+                    'WHERE t.assigned_to_emp_id = ? ORDER BY h.created_at DESC, h.history_id DESC LIMIT ?',
+                    (ctx.user['emp_id'], ctx.params['limit']))
+
+
+def trend_rows(ctx, group, where, args, since):
+    rows = []
+    for key, stats in rollup_stats(ctx, group, where, args, since, ctx.today.isoformat()).items():
+        rows.append(dict(stats, period=key, completion_rate=completion_pct(stats),
+                         on_time_rate=round(stats['on_time_tasks'] / stats['approved_tasks'] * 100, 2)
+                         if stats['approved_tasks'] else 0.0,
+                         performance_score=score(stats) or 0.0))
+    return rows
+
+
+@route('GET', '/dashboard/cfo/trends')
+async def cfo_trends(ctx):
+    ctx.require(*ORG_ROLES)
+    since = month_start(ctx.today, ctx.params['months'] - 1).isoformat()
+    rows = trend_rows(ctx, 'substr(assigned_date, 1, 7)', '1', [], since)
+    for row in rows:
+        row['month'] = row['period']
+    return rows
+
+
+@route('GET', '/dashboard/cfo/departments')
+async def cfo_departments(ctx):
+    ctx.require(*ORG_ROLES)
+    return department_stats(ctx)
+
+
+@route('GET', '/dashboard/cfo/employees-performance')
+async def cfo_employees_performance(ctx):
+    ctx.require(*ORG_ROLES)
+    from_date, to_date, _, _ = period(ctx)
+    people = {row['emp_id']: row for row in ctx.rows('SELECT emp_id, name, department_id FROM employee')}
+    rows = []
+    for emp_id, stats in rollup_stats(ctx, 'assigned_to_emp_id', '1', [], from_date, to_date).items():
+        rows.append(dict(people.get(emp_id, {'emp_id': emp_id}), tasks_assigned=stats['total_tasks'],
+                         completed=stats['approved_tasks'], completion_rate=completion_pct(stats),
+                         performance_score=score(stats) or 0.0))
+    rows.sort(key=lambda row: -row['performance_score'])
+    return rows[:ctx.params['limit']]
+
+
+@route('GET', '/dashboard/cfo/org-metrics')
+async def cfo_org_metrics(ctx):
+    ctx.require(*ORG_ROLES)
+    totals = total_stats(rollup_stats(ctx, "'all'"))
+    approved = totals['approved_tasks']
+    counts = ctx.row("SELECT COUNT(*) AS employees, (SELECT COUNT(*) FROM department WHERE active = 1) "
+                     "AS departments FROM employee WHERE active = 1")
+    return dict(totals, total_employees=counts['employees'], active_departments=counts['departments'],
+                org_avg_completion_rate=completion_pct(totals),
+                org_avg_on_time_pct=round(totals['on_time_tasks'] / approved * 100, 2) if approved else 0.0,
+                org_avg_rework_rate=round((approved - totals['no_rework_tasks']) / approved * 100, 2)
+                if approved else 0.0)
+
+
+@route('GET', '/dashboard/manager/trends')
+async def manager_trends(ctx):
+    ctx.require(*MANAGER_ROLES)
+    sql, args = team_scope(ctx, department_id=ctx.params.get('department_id'))
+    since = (ctx.today - datetime.timedelta(days=ctx.params['days'] - 1)).isoformat()
+    rows = trend_rows(ctx, 'assigned_date', f'assigned_to_emp_id IN ({sql})', args, since)
+    for row in rows:
+        row['date'] = row['period']
+    return rows
+
+
+@route('GET', '/dashboard/manager/team-performance')
+async def team_performance(ctx):
+    ctx.require(*MANAGER_ROLES)
+    scope = team_scope(ctx, department_id=ctx.params.get('department_id'))
+    members = team_members(ctx, department_id=ctx.params.get('department_id'))
+    stats = member_stats(ctx, scope, None, None)
+    rows = []
+    for member in members:
+        row = stats.get(member['emp_id'], empty_stats())
+        rows.append({'emp_id': member['emp_id'], 'name': member['name'],
+                     'is_manager': member['role'] == 'MANAGER', 'tasks_assigned': row['total_tasks'],
+                     'in_progress': row['in_progress_tasks'], 'pending_review': row['submitted_tasks'],
+                     'overdue': row['overdue_tasks'], 'completed': row['approved_tasks'],
+                     'completion_rate': completion_pct(row), 'performance_score': score(row) or 0.0})
+    rows.sort(key=lambda row: -row['tasks_assigned'])
+    return rows[:ctx.params['limit']]
+
+
+def risk_status(stats, value):
+    if not stats['total_tasks']:
+        return 'NO_DATA'
+    overdue_share = stats['overdue_tasks'] / stats['total_tasks']
+    if overdue_share >= 0.5 or (value or 0) < 40:
+        return 'OFF_TRACK'
+    if overdue_share >= 0.2 or (value or 0) < 70:
+        return 'AT_RISK'
+    return 'ON_TRACK'
+
+
+@route('GET', '/dashboard/manager/employee-risk')
+async def employee_risk(ctx):
+    ctx.require(*MANAGER_ROLES)
+    scope = team_scope(ctx, department_id=ctx.params.get('department_id'))
+    members = [m for m in team_members(ctx, department_id=ctx.params.get('department_id'))
+               if m['emp_id'] != ctx.user['emp_id']]
+    stats = member_stats(ctx, scope, None, None)
+    rows = []
+    for member in members:
+        row = stats.get(member['emp_id'], empty_stats())
+        value = score(row)
+        active = row['new_tasks'] + row['in_progress_tasks'] + row['submitted_tasks'] + row['rework_tasks']
+        rows.append({'emp_id': member['emp_id'], 'name': member['name'], 'active_tasks': active,
+                     'total_tasks': row['total_tasks'], 'overdue_tasks': row['overdue_tasks'],
+                     'overdue_count': row['overdue_tasks'], 'performance_score': value or 0.0,
+                     'risk_status': risk_status(row, value), 'risk_level': risk_status(row, value)})
+    order = {'OFF_TRACK': 0, 'AT_RISK': 1, 'ON_TRACK': 2, 'NO_DATA': 3}
+    rows.sort(key=lambda row: (order[row['risk_status']], -row['overdue_tasks']))
+    return rows[:ctx.params['limit']]
+
+
+@route('GET', '/dashboard/manager/department-metrics')
+async def department_metrics(ctx):
+    ctx.require(*MANAGER_ROLES)
+    department_id = ctx.params.get('department_id') or ctx.user['department_id']
+    rows = department_stats(ctx, department_id=department_id)
+    if rows:
+        return rows[0]
+    return dict(empty_stats(), department_id=department_id, completion_pct=0.0, top_performer=None)
+
+
+# -- system and notifications ----------------------------------------------
+
+@route('GET', '/health')
+async def health(ctx):
+    return {'status': 'ok'}
+
+
+@route('GET', '/system/health')
+async def system_health(ctx):
+    ctx.row('SELECT 1')
+    return {'status': 'ok', 'database': 'ok', 'time': now()}
+
+
+@route('POST', '/system/run-reminders')
+async def run_reminders(ctx):
+    with ctx.transaction():
+        ctx.state.writes += 1
+        sent = scheduler.run_reminders(ctx.db, ctx.today)
+    return {'reminders_created': sent, 'run_at': now()}
+
+
+@route('GET', '/notifications')
+async def list_notifications(ctx):
+    # ?cursor= is not in the spec: it continues from the X-Next-Cursor of the
+    # previous page. X-Unread-Count is the badge, read from the counter.
+    try:
+        rows, following = inbox.page(ctx.db, ctx.user['emp_id'], ctx.params['limit'], ctx.params['unread_only'],
+                                     ctx.request.query_params.get('cursor'), ctx.params['offset'])
+    except inbox.CursorError:
+        raise HTTPError(400, 'Invalid cursor')
+    ctx.headers['X-Unread-Count'] = str(inbox.unread_count(ctx.db, ctx.user['emp_id']))
+    if following:
+        ctx.headers['X-Next-Cursor'] = following
+    return [dict(row, is_read=bool(row['is_read']), id=row['notification_id']) for row in rows]
+
+
+@route('POST', '/notifications/{notification_id}/read')
+async def read_notification(ctx):
+    ctx.state.writes += 1
+    if not inbox.mark_read(ctx.db, ctx.user['emp_id'], ctx.params['notification_id']):
+        raise HTTPError(404, 'Notification not found')
+    return {'message': 'Notification marked as read'}
+
+
+@route('POST', '/notifications/read-all')
+async def read_all_notifications(ctx):
+    ctx.state.writes += 1
+    updated = inbox.mark_all_read(ctx.db, ctx.user['emp_id'])
+    return {'message': 'All notifications marked as read', 'updated': updated}
+
+
+# -- reports ---------------------------------------------------------------
+
+SCORE_COLUMNS = ('emp_id', 'name', 'department_id', 'total_tasks', 'approved_tasks', 'on_time_tasks',
+                 'rework_tasks', 'overdue_tasks', 'completion_pct', 'performance_score')
+TASK_COLUMNS = ('task_id', 'title', 'assigned_to_emp_id', 'assigned_to_name', 'department_id', 'status',
+                'priority', 'assigned_date', 'due_date', 'completed_date', 'rework_count')
+
+
+class ReportSource:
+    """A private read snapshot for one export, so a long stream neither
+    blocks nor sees the writes other requests make meanwhile."""
+
+    def __init__(self, db_path, today, from_date, to_date, employee_id=None, department_id=None):
+        self.db_path = db_path
+        self.today = today
+        self.conditions = ['t.assigned_date BETWEEN ? AND ?']
+        self.args = [from_date, to_date]
+        if employee_id:
+            self.conditions.append('t.assigned_to_emp_id = ?')
+            self.args.append(employee_id)
+        if department_id:
+            self.conditions.append('t.department_id = ?')
+            self.args.append(department_id)
+        self.connection = None
+
+    def sections(self):
+        self.connection = store.connect(self.db_path)
+        self.connection.execute('BEGIN')
+        return [reports.Section('Employee scores', SCORE_COLUMNS, self.score_rows()),
+                reports.Section('Tasks', TASK_COLUMNS, self.task_rows())]
+
+    def score_rows(self):
+        stats = STATS_SQL.replace(':today', '?')
+        cursor = self.connection.execute(
+            f'SELECT t.assigned_to_emp_id AS emp_id, e.name, e.department_id, {stats} '
+            f'FROM task t LEFT JOIN employee e ON e.emp_id = t.assigned_to_emp_id '
+            f'WHERE {" AND ".join(self.conditions)} GROUP BY t.assigned_to_emp_id ORDER BY t.assigned_to_emp_id',
+            [self.today.isoformat(), *self.args])
+        for row in reports.chunked(cursor):
+            yield (row['emp_id'], row['name'], row['department_id'], row['total_tasks'], row['approved_tasks'],
+                   row['on_time_tasks'], row['rework_tasks'], row['overdue_tasks'], completion_pct(row),
+                   score(row) or 0.0)
+
+    def task_rows(self):
+        cursor = self.connection.execute(
+            'SELECT t.task_id, t.title, t.assigned_to_emp_id, e.name, t.department_id, t.status, t.priority, '
+            't.assigned_date, t.due_date, t.completed_date, t.rework_count '
+            'FROM task t LEFT JOIN employee e ON e.emp_id = t.assigned_to_emp_id '
+            f'WHERE {" AND ".join(self.conditions)} ORDER BY t.assigned_date, t.task_id', self.args)
+        for row in reports.chunked(cursor):
+            yield tuple(row)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+def performance_report(ctx, kind, scope=None):
+    employee_id = ctx.params.get('employee_id')
+    department_id = ctx.params.get('department_id')
+    if scope == 'employee':
+        employee_id = ctx.user['emp_id']
+    elif scope == 'manager':
+        ctx.require(*MANAGER_ROLES)
+        department_id = department_id or ctx.user['department_id']
+    elif scope == 'cfo':
+        ctx.require(*ORG_ROLES)
+    from_date, to_date, _, _ = period(ctx)
+    source = ReportSource(ctx.state.db_path, ctx.today, from_date, to_date, employee_id, department_id)
+    return reports.stream(kind, f'Performance report {from_date} to {to_date}', source.sections,
+                          close=source.close)
+
+
+@route('GET', '/reports/performance.csv')
+async def performance_csv(ctx):
+    return performance_report(ctx, 'csv')
+
+
+@route('GET', '/reports/performance.xlsx')
+async def performance_xlsx(ctx):
+    return performance_report(ctx, 'xlsx')
+
+
+@route('GET', '/reports/performance.pdf')
+async def performance_pdf(ctx):
+    return performance_report(ctx, 'pdf')
+
+
+@route('GET', '/reports/employee/export-csv')
+async def employee_export_csv(ctx):
+    return performance_report(ctx, 'csv', 'employee')
+
+
+@route('GET', '/reports/employee/export-pdf')
+async def employee_export_pdf(ctx):
+    return performance_report(ctx, 'pdf', 'employee')
+
+
+@route('GET', '/reports/cfo/export-excel')
+async def cfo_export_excel(ctx):
+    return performance_report(ctx, 'xlsx', 'cfo')
+
+
+@route('GET', '/reports/cfo/export-pdf')
+async def cfo_export_pdf(ctx):
+    return performance_report(ctx, 'pdf', 'cfo')
+
+
+@route('GET', '/reports/manager/export-pdf')
+async def manager_export_pdf(ctx):
+    return performance_report(ctx, 'pdf', 'manager')
+
+
+@route('GET', '/reports/manager/export-excel')
+async def manager_export_excel(ctx):
+    return performance_report(ctx, 'xlsx', 'manager')
+
+
+@route('GET', '/reports/employee/summary')
+async def employee_summary(ctx):
+    return await employee_dashboard(ctx)
+
+
+@route('GET', '/reports/employee/monthly-trend')
+async def employee_monthly_trend(ctx):
+    since = month_start(ctx.today, ctx.params['months'] - 1).isoformat()
+    rows = trend_rows(ctx, 'substr(assigned_date, 1, 7)', 'assigned_to_emp_id = ?', [ctx.user['emp_id']], since)
+    for row in rows:
+        row['month'] = row['period']
+    return rows
+
+
+@route('GET', '/reports/employee/department-top-performer')
+async def department_top_performer(ctx):
+    from_date, to_date, _, _ = period(ctx)
+    rows = department_stats(ctx, from_date, to_date, ctx.user['department_id'])
+    return {'department_id': ctx.user['department_id'], 'top_performer': rows[0]['top_performer'] if rows else None}
+
+
+def objectives(ctx, parent_task_id=None):
+    """Parent tasks with the STATS_SQL totals of their subtasks."""
+    if parent_task_id is None:
+        from_date, to_date, _, _ = period(ctx)
+        parents = ctx.rows('SELECT task_id, title, status, department_id, assigned_date, due_date FROM task '
+                           'WHERE assigned_date BETWEEN ? AND ? AND task_id IN '
+                           '(SELECT parent_task_id FROM task WHERE parent_task_id IS NOT NULL) ORDER BY task_id',
+                           (from_date, to_date))
+    else:
+        parents = ctx.rows('SELECT task_id, title, status, department_id, assigned_date, due_date FROM task '
+                           'WHERE task_id = ?', (parent_task_id,))
+    ids = [parent['task_id'] for parent in parents]
+    groups = stats_by(ctx, 'parent_task_id', f'parent_task_id IN ({in_clause(ids)})', ids)
+    rows = []
+    for parent in parents:
+        stats = groups.get(parent['task_id'], empty_stats())
+        rows.append(dict(parent, **stats, id=parent['task_id'], subtask_count=stats['total_tasks'],
+                         progress=completion_pct(stats)))
+    return rows
+
+
+@route('GET', '/reports/cfo/okr/overview')
+async def okr_overview(ctx):
+    rows = objectives(ctx)
+    return {'total_objectives': len(rows),
+            'completed_objectives': sum(1 for row in rows if row['progress'] >= 100),
+            'average_progress': round(average(row['progress'] for row in rows) or 0.0, 2),
+            'total_subtasks': sum(row['total_tasks'] for row in rows),
+            'overdue_subtasks': sum(row['overdue_tasks'] for row in rows)}
+
+
+@route('GET', '/reports/cfo/okr/objectives')
+async def okr_objectives(ctx):
+    return objectives(ctx)
+
+
+@route('GET', '/reports/cfo/okr/objectives/{parent_task_id}/summary')
+async def okr_objective_summary(ctx):
+    rows = objectives(ctx, ctx.params['parent_task_id'])
+    if not rows:
+        raise HTTPError(404, 'Objective not found')
+    return rows[0]
+
+
+@route('GET', '/reports/cfo/okr/objectives/{parent_task_id}/subtasks')
+async def okr_objective_subtasks(ctx):
+    return [task_json(row) for row in ctx.rows(TASK_SQL + 'WHERE t.parent_task_id = ? ORDER BY t.task_id',
+                                               (ctx.params['parent_task_id'],))]
+
+
+@route('GET', '/reports/cfo/okr/objectives/{parent_task_id}/departments')
+async def okr_objective_departments(ctx):
+    groups = stats_by(ctx, 'department_id', 'parent_task_id = ?', [ctx.params['parent_task_id']])
+    return [dict(stats, department_id=dept_id, completion_pct=completion_pct(stats))
+            for dept_id, stats in groups.items()]
+
+
+# -- recurring tasks -------------------------------------------------------
+
+RECURRING_FIELDS = ('title', 'description', 'department_id', 'assigned_to_emp_id', 'assigned_by_emp_id',
+                    'priority', 'frequency', 'weekly_day', 'monthly_day', 'yearly_month', 'yearly_day',
+                    'start_date', 'end_date', 'is_active')
+SUBTASK_FIELDS = ('title', 'description', 'department_id', 'assigned_to_emp_id', 'priority', 'sequence_no')
+
+
+def recurring_json(row):
+    row = dict(row)
+    row['is_active'] = bool(row['is_active'])
+    row['id'] = row['recurring_id']
+    return row
+
+
+def get_recurring(ctx, recurring_id):
+    return recurring_json(ctx.row('SELECT * FROM recurring_task WHERE recurring_id = ?', (recurring_id,),
+                                  missing='Recurring task not found'))
+
+
+def get_subtask_template(ctx):
+    return ctx.row('SELECT * FROM recurring_subtask WHERE recurring_id = ? AND subtask_template_id = ?',
+                   (ctx.params['recurring_id'], ctx.params['subtask_template_id']),
+                   missing='Subtask template not found')
+
+
+def update_columns(ctx, table, key, key_value, fields):
+    changes = {name: value for name, value in ctx.body.items() if name in fields}
+    if changes:
+        assignments = ', '.join(f'{name} = ?' for name in changes)
+        ctx.write(f'UPDATE {table} SET {assignments} WHERE {key} = ?', [*changes.values(), key_value])
+
+
+@route('POST', '/recurring-tasks')
+async def create_recurring(ctx):
+    ctx.require(*MANAGER_ROLES)
+    values = {name: ctx.body.get(name) for name in RECURRING_FIELDS if name != 'is_active'}
+    values['priority'] = values['priority'] or 'MEDIUM'
+    with ctx.transaction():
+        cursor = ctx.write(f'INSERT INTO recurring_task ({", ".join(values)}, created_at) '
+                           f'VALUES ({", ".join("?" * len(values))}, ?)', [*values.values(), now()])
+        scheduler.schedule(ctx.db, cursor.lastrowid, ctx.today)
+    return get_recurring(ctx, cursor.lastrowid)
+
+
+@route('GET', '/recurring-tasks')
+async def list_recurring(ctx):
+    conditions, args = ['1'], []
+    if ctx.params.get('department_id'):
+        conditions.append('department_id = ?')
+        args.append(ctx.params['department_id'])
+    if ctx.params.get('is_active') is not None:
+        conditions.append('is_active = ?')
+        args.append(int(ctx.params['is_active']))
+    return [recurring_json(row) for row in
+            ctx.rows(f'SELECT * FROM recurring_task WHERE {" AND ".join(conditions)} ORDER BY recurring_id', args)]
+
+
+@route('GET', '/recurring-tasks/{recurring_id}')
+async def recurring_detail(ctx):
+    return get_recurring(ctx, ctx.params['recurring_id'])
+
+
+@route('PATCH', '/recurring-tasks/{recurring_id}')
+async def update_recurring(ctx):
+    ctx.require(*MANAGER_ROLES)
+    get_recurring(ctx, ctx.params['recurring_id'])
+    with ctx.transaction():
+        update_columns(ctx, 'recurring_task', 'recurring_id', ctx.params['recurring_id'], RECURRING_FIELDS)
+        scheduler.schedule(ctx.db, ctx.params['recurring_id'], ctx.today)
+    return get_recurring(ctx, ctx.params['recurring_id'])
+
+
+def set_recurring_active(ctx, active):
+    ctx.require(*MANAGER_ROLES)
+    get_recurring(ctx, ctx.params['recurring_id'])
+    with ctx.transaction():
+        ctx.write('UPDATE recurring_task SET is_active = ? WHERE recurring_id = ?', (active, ctx.params['recurring_id']))
+        scheduler.schedule(ctx.db, ctx.params['recurring_id'], ctx.today)
+    return get_recurring(ctx, ctx.params['recurring_id'])
+
+
+@route('POST', '/recurring-tasks/{recurring_id}/activate')
+async def activate_recurring(ctx):
+    return set_recurring_active(ctx, 1)
+
+
+@route('POST', '/recurring-tasks/{recurring_id}/deactivate')
+async def deactivate_recurring(ctx):
+    return set_recurring_active(ctx, 0)
+
+
+@route('POST', '/recurring-tasks/{recurring_id}/subtasks')
+async def create_subtask_template(ctx):
+    ctx.require(*MANAGER_ROLES)
+    get_recurring(ctx, ctx.params['recurring_id'])
+    values = {name: ctx.body.get(name) for name in SUBTASK_FIELDS}
+    values['priority'] = values['priority'] or 'MEDIUM'
+    values['sequence_no'] = values['sequence_no'] or 1
+    cursor = ctx.write(f'INSERT INTO recurring_subtask (recurring_id, {", ".join(values)}) '
+                       f'VALUES (?, {", ".join("?" * len(values))})',
+                       [ctx.params['recurring_id'], *values.values()])
+    return ctx.row('SELECT * FROM recurring_subtask WHERE subtask_template_id = ?', (cursor.lastrowid,))
+
+
+@route('GET', '/recurring-tasks/{recurring_id}/subtasks')
+async def list_subtask_templates(ctx):
+    get_recurring(ctx, ctx.params['recurring_id'])
+    return ctx.rows('SELECT * FROM recurring_subtask WHERE recurring_id = ? ORDER BY sequence_no, '
+                    'subtask_template_id', (ctx.params['recurring_id'],))
+
+
+@route('GET', '/recurring-tasks/{recurring_id}/subtasks/{subtask_template_id}')
+async def subtask_template_detail(ctx):
+    return get_subtask_template(ctx)
+
+
+@route('PATCH', '/recurring-tasks/{recurring_id}/subtasks/{subtask_template_id}')
+async def update_subtask_template(ctx):
+    ctx.require(*MANAGER_ROLES)
+    get_subtask_template(ctx)
+    update_columns(ctx, 'recurring_subtask', 'subtask_template_id', ctx.params['subtask_template_id'],
+                   SUBTASK_FIELDS)
+    return get_subtask_template(ctx)
+
+
+@route('DELETE', '/recurring-tasks/{recurring_id}/subtasks/{subtask_template_id}')
+async def delete_subtask_template(ctx):
+    ctx.require(*MANAGER_ROLES)
+    get_subtask_template(ctx)
+    ctx.write('DELETE FROM recurring_subtask WHERE subtask_template_id = ?', (ctx.params['subtask_template_id'],))
+    return {'message': 'Subtask template deleted'}
+
+
+@route('POST', '/recurring-tasks/run')
+async def run_recurring(ctx):
+    ctx.require(*MANAGER_ROLES)
+    run_date = datetime.date.fromisoformat((ctx.body or {}).get('run_date') or ctx.today.isoformat())
+    with ctx.transaction():
+        ctx.state.writes += 1
+        created = scheduler.run_recurring(ctx.db, run_date, ctx.user['emp_id'])
+    return {'run_date': run_date.isoformat(), 'created': len(created), 'task_ids': created}
+
+
+@route('DELETE', '/recurring-tasks/recurring-tasks/{recurring_id}')
+async def delete_recurring(ctx):
+    ctx.require(*MANAGER_ROLES)
+    get_recurring(ctx, ctx.params['recurring_id'])
+    with ctx.transaction():
+        ctx.write('DELETE FROM recurring_subtask WHERE recurring_id = ?', (ctx.params['recurring_id'],))
+        ctx.write('DELETE FROM recurring_task WHERE recurring_id = ?', (ctx.params['recurring_id'],))
+        ctx.write('DELETE FROM recurring_schedule WHERE recurring_id = ?', (ctx.params['recurring_id'],))
+    return {'message': 'Recurring task deleted'}
+
+
+# -- admin -----------------------------------------------------------------
+
+@route('GET', '/admin/summary')
+async def admin_summary(ctx):
+    ctx.require(*ORG_ROLES)
+    roles = {row['role']: row['n'] for row in ctx.rows('SELECT role, COUNT(*) AS n FROM employee '
+                                                        'WHERE active = 1 GROUP BY role')}
+    counts = ctx.row('SELECT (SELECT COUNT(*) FROM employee) AS total_employees, '
+                     '(SELECT COUNT(*) FROM employee WHERE active = 1) AS active_employees, '
+                     '(SELECT COUNT(*) FROM department WHERE active = 1) AS departments, '
+                     '(SELECT COUNT(*) FROM task) AS total_tasks, '
+                     f"(SELECT COUNT(*) FROM task WHERE status IN ({in_clause(OPEN_STATUSES)})) AS open_tasks",
+                     OPEN_STATUSES)
+    return dict(counts, by_role=roles)
@@ -0,0 +1,101 @@
+"""Closure-table index of the reporting hierarchy.
+
+employee_closure holds one (ancestor, descendant, depth) row for every pair
+of employees on the same reporting chain, including each employee with
+itself at depth 0. Its primary key starts with (ancestor_emp_id, depth), so
+"everyone under X" and "everyone under X down to depth d" are single index
+range scans instead of recursive walks, and the descendant index answers
+"everyone above X" the same way.
+
+Rows cover inactive employees too; queries filter on employee.active, so
+deactivating or reactivating someone needs no index change. add() and
+move() keep the table current when employees are created or change
+manager; rebuild() recreates it from employee.manager_emp_id.
+"""
+import collections
+
+
+class CycleError(ValueError):
+    """Raised when a move would make an employee report to their own subordinate."""
+
+
+def rebuild(connection, batch_size=10_000):
+    """Recreate employee_closure from the manager column; returns the row count.
+
+    Employees whose manager is missing, or who sit on a manager cycle, are
+    treated as roots of their own subtree.
+    """
+    managers = dict(connection.execute('SELECT emp_id, manager_emp_id FROM employee'))
+    children = collections.defaultdict(list)
+    roots = []
+    for emp_id, manager in managers.items():
+        if manager in managers and manager != emp_id:
+            children[manager].append(emp_id)
+        else:
+            roots.append(emp_id)
+    seen = set(roots)
+    # a cycle has no root above it: break it at an arbitrary member
+    for emp_id in managers:
+        if emp_id in seen:
+            continue
+        chain, node = [], emp_id
+        while node not in seen and node not in chain:
+            chain.append(node)
+            node = managers[node]
+        if node in chain:
+            roots.append(node)
+            children[managers[node]].remove(node)
+        seen.update(chain)
+    connection.execute('DELETE FROM employee_closure')
+    insert = 'INSERT INTO employee_closure (ancestor_emp_id, descendant_emp_id, depth) VALUES (?, ?, ?)'
+    batch, total = [], 0
+    for root in roots:
+        stack = [(root, (root,))]
+        while stack:
+            emp_id, path = stack.pop()
+            depth = len(path) - 1
+            batch.extend((ancestor, emp_id, depth - index) for index, ancestor in enumerate(path))
+            stack.extend((child, path + (child,)) for child in children.get(emp_id, ()))
+            if len(batch) >= batch_size:
+                connection.executemany(insert, batch)
+                total += len(batch)
+                batch.clear()
+    connection.executemany(insert, batch)
+    return total + len(batch)
+
+
+def add(connection, emp_id, manager_emp_id=None):
+    """Index a new employee as a leaf under manager_emp_id (or as a root)."""
+    connection.execute('INSERT INTO employee_closure (ancestor_emp_id, descendant_emp_id, depth) '
+                       'VALUES (?, ?, 0)', (emp_id, emp_id))
+    if manager_emp_id:
+        connection.execute('INSERT INTO employee_closure (ancestor_emp_id, descendant_emp_id, depth) '
+                           'SELECT ancestor_emp_id, ?, depth + 1 FROM employee_closure WHERE descendant_emp_id = ?',
+                           (emp_id, manager_emp_id))
+
+
+def move(connection, emp_id, manager_emp_id=None):
+    """Re-parent emp_id and their whole subtree under manager_emp_id.
+
+    Cost is proportional to (subtree size) x (old + new chain length), not
+    to the size of the org.
+    """
+    if manager_emp_id and connection.execute(
+            'SELECT 1 FROM employee_closure WHERE ancestor_emp_id = ? AND descendant_emp_id = ?',
+            (emp_id, manager_emp_id)).fetchone():
+        raise CycleError(f'{manager_emp_id} reports to {emp_id}')
+    connection.execute('''
+        DELETE FROM employee_closure
+        WHERE descendant_emp_id IN (SELECT descendant_emp_id FROM employee_closure WHERE ancestor_emp_id = ?)
+          AND ancestor_emp_id IN (SELECT ancestor_emp_id FROM employee_closure
+                                  WHERE descendant_emp_id = ? AND depth > 0)''', (emp_id, emp_id))
+    if manager_emp_id:
+        connection.execute('''
+            INSERT INTO employee_closure (ancestor_emp_id, descendant_emp_id, depth)
+            SELECT above.ancestor_emp_id, below.descendant_emp_id, above.depth + below.depth + 1
+            FROM employee_closure above, employee_closure below
+            WHERE above.descendant_emp_id = ? AND below.ancestor_emp_id = ?''', (manager_emp_id, emp_id))
+
+
+def is_empty(connection):
+    return connection.execute('SELECT 1 FROM employee_closure LIMIT 1').fetchone() is None
@@ -0,0 +1,137 @@
+"""Notification fan-out, per-employee unread counters and keyset pages.
+
+notification_counter holds each employee's unread count, so a badge is one
+primary-key read however many notifications someone has. Everything that
+inserts notifications or marks them read goes through this module, which
+changes rows and counters under one savepoint: fan_out() for rows built in
+Python, count_since() after a set-based INSERT ... SELECT, and mark_read()
+/ mark_all_read() for reads. rebuild() recounts from the notification table.
+
+Pages are ordered newest first by (created_at, notification_id) and
+continue from an opaque cursor naming the last row seen, so page N costs
+the same as page 1; the partial index on unread rows does the same for
+unread_only.
+"""
+import base64
+import collections
+import contextlib
+import json
+
+from . import store
+
+INSERT = ('INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) '
+          'VALUES (?, ?, ?, ?, 0, ?)')
+ADD_UNREAD = ('INSERT INTO notification_counter (emp_id, unread) VALUES (?, ?) '
+              'ON CONFLICT (emp_id) DO UPDATE SET unread = unread + excluded.unread')
+
+
+class CursorError(ValueError):
+    """Raised for a page cursor this module did not issue."""
+
+
+@contextlib.contextmanager
+def savepoint(connection):
+    """Make the statements inside atomic, in or out of a transaction."""
+    connection.execute('SAVEPOINT inbox')
+    try:
+        yield
+    except BaseException:
+        connection.execute('ROLLBACK TO inbox')
+        connection.execute('RELEASE inbox')
+        raise
+    connection.execute('RELEASE inbox')
+
+
+def fan_out(connection, rows, created=None):
+    """Insert unread notifications given as (emp_id, type, message, task_id)
+    rows with one executemany, and count them in their owners' badges."""
+    created = created or store.now()
+    with savepoint(connection):
+        connection.executemany(INSERT, [row + (created,) for row in rows])
+        connection.executemany(ADD_UNREAD, collections.Counter(row[0] for row in rows).items())
+
+
+def last_id(connection):
+    return connection.execute('SELECT COALESCE(MAX(notification_id), 0) FROM notification').fetchone()[0]
+
+
+def count_since(connection, after_id):
+    """Count unread notifications with ids above after_id (taken with
+    last_id() in the same write transaction) in their owners' badges."""
+    connection.execute('INSERT INTO notification_counter (emp_id, unread) '
+                       'SELECT emp_id, COUNT(*) FROM notification WHERE notification_id > ? AND is_read = 0 '
+                       'GROUP BY emp_id ON CONFLICT (emp_id) DO UPDATE SET unread = unread + excluded.unread',
+                       (after_id,))
+
+
+def unread_count(connection, emp_id):
+    found = connection.execute('SELECT unread FROM notification_counter WHERE emp_id = ?', (emp_id,)).fetchone()
+    return found[0] if found else 0
+
+
+def mark_read(connection, emp_id, notification_id):
+    """Mark one of emp_id's notifications read; False if they have no such notification."""
+    with savepoint(connection):
+        if connection.execute('UPDATE notification SET is_read = 1 WHERE notification_id = ? AND emp_id = ? '
+                              'AND is_read = 0', (notification_id, emp_id)).rowcount:
+            connection.execute('UPDATE notification_counter SET unread = unread - 1 WHERE emp_id = ?', (emp_id,))
+            return True
+    return connection.execute('SELECT 1 FROM notification WHERE notification_id = ? AND emp_id = ?',
+                              (notification_id, emp_id)).fetchone() is not None
+
+
+def mark_all_read(connection, emp_id):
+    """Mark everything emp_id has unread as read; returns how many rows changed."""
+    with savepoint(connection):
+        updated = connection.execute('UPDATE notification SET is_read = 1 WHERE emp_id = ? AND is_read = 0',
+                                     (emp_id,)).rowcount
+        connection.execute('UPDATE notification_counter SET unread = 0 WHERE emp_id = ?', (emp_id,))
+    return updated
+
+
+def encode_cursor(row):
+    raw = json.dumps([row['created_at'], row['notification_id']], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise CursorError(cursor) from exc
+    if not isinstance(created_at, str) or not isinstance(notification_id, int):
+        raise CursorError(cursor)
+    return created_at, notification_id
+
+
+def page(connection, emp_id, limit, unread_only=False, cursor=None, offset=0):
+    """(rows, next_cursor) for emp_id, newest first; next_cursor is None on the last page.
+
+    offset is still honoured for clients that send it, but a cursor is
+    what keeps deep pages cheap.
+    """
+    conditions, args = ['emp_id = ?'], [emp_id]
+    if unread_only:
+        conditions.append('is_read = 0')
+    if cursor:
+        conditions.append('(created_at, notification_id) < (?, ?)')
+        args += decode_cursor(cursor)
+    rows = connection.execute(f'SELECT * FROM notification WHERE {" AND ".join(conditions)} '
+                              'ORDER BY created_at DESC, notification_id DESC LIMIT ? OFFSET ?',
+                              [*args, limit + 1, offset]).fetchall()
+    following = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], following
+
+
+def rebuild(connection):
+    """Recount every employee's unread notifications; returns the number of employees with any."""
+    connection.execute('DELETE FROM notification_counter')
+    return connection.execute('INSERT INTO notification_counter (emp_id, unread) '
+                              'SELECT emp_id, COUNT(*) FROM notification WHERE is_read = 0 GROUP BY emp_id').rowcount
+
+
+def is_empty(connection):
+    """True when unread notifications exist but no counters do (a database
+    created before the counters were added)."""
+    return (connection.execute('SELECT 1 FROM notification_counter LIMIT 1').fetchone() is None
+            and connection.execute('SELECT 1 FROM notification WHERE is_read = 0 LIMIT 1').fetchone() is not None)
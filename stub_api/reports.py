@@ -0,0 +1,287 @@
+"""Streaming CSV, XLSX and PDF renderings of the performance report.
+
+A report is a list of Sections, each a title, column names and an iterator
+of row tuples (normally a database cursor read CHUNK_ROWS at a time). The
+writers turn sections into a stream of bytes without holding more than one
+row, one PDF page or one deflate window at a time, and paced() groups the
+output into chunks of about FLUSH_BYTES. The preamble (CSV header, XLSX
+package parts, PDF header) is flushed before the first row is read and no
+chunk waits longer than FIRST_BYTE_BUDGET once rows are arriving, so the
+client sees the first byte within the budget however long the query runs.
+
+Everything uses the standard library: XLSX is SpreadsheetML with inline
+strings written through zipfile to an unseekable spool (entries get data
+descriptors, so nothing is rewound), and PDF is one Courier text page per
+PDF_LINES_PER_PAGE lines. The PDF cross-reference table needs one offset per
+object, so a PDF keeps two integers per page until it is finished.
+"""
+import csv
+import io
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from starlette.responses import StreamingResponse
+
+CHUNK_ROWS = 1000
+FLUSH_BYTES = 64 * 1024
+FIRST_BYTE_BUDGET = 0.25  # seconds
+PDF_LINES_PER_PAGE = 60
+MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+XML_HEAD = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIP_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+
+class Section:
+    """One table of a report: rows is any iterable of tuples in column order."""
+
+    def __init__(self, title, columns, rows):
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+
+
+def chunked(cursor, size=CHUNK_ROWS):
+    """Rows from a cursor, fetched size at a time."""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def stream(kind, title, sections, filename='performance', close=None):
+    """A StreamingResponse rendering sections as kind ('csv', 'xlsx' or 'pdf').
+
+    sections may be a callable returning them, so that opening the database
+    happens inside the stream; close, if given, runs when the stream ends.
+    """
+    body = paced(WRITERS[kind](title, sections))
+    if close is not None:
+        body = closing(body, close)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[kind],
+                             headers={'Content-Disposition': f'attachment; filename="{filename}.{kind}"'})
+
+
+def paced(pieces, size=FLUSH_BYTES, budget=FIRST_BYTE_BUDGET):
+    """Group byte pieces into chunks of about size bytes, flushing the first
+    piece at once and any pending bytes once budget seconds have passed."""
+    pending, pending_bytes = [], 0
+    flushed_at = None
+    for piece in pieces:
+        if not piece:
+            continue
+        pending.append(piece)
+        pending_bytes += len(piece)
+        now = time.monotonic()
+        if flushed_at is None or pending_bytes >= size or now - flushed_at >= budget:
+            yield b''.join(pending)
+            pending.clear()
+            pending_bytes = 0
+            flushed_at = now
+    if pending:
+        yield b''.join(pending)
+
+
+def closing(pieces, close):
+    try:
+        yield from pieces
+    finally:
+        close()
+
+
+def resolved(sections):
+    return sections() if callable(sections) else sections
+
+
+def text(value):
+    return '' if value is None else str(value)
+
+
+# -- CSV -------------------------------------------------------------------
+
+def csv_pieces(title, sections):
+    """Each section as a title line, a header and its rows; blank line between."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take():
+        value = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    yield '\ufeff'.encode('utf-8')
+    for index, section in enumerate(resolved(sections)):
+        if index:
+            writer.writerow(())
+        writer.writerow((section.title,))
+        writer.writerow(section.columns)
+        yield take()
+        for row in section.rows:
+            writer.writerow(row)
+            yield take()
+
+
+# -- XLSX ------------------------------------------------------------------
+
+class Spool(io.RawIOBase):
+    """Write-only, unseekable sink that hands back what was written so far."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def sheet_name(title, used):
+    name = ''.join(c for c in title if c not in '[]:*?/\\')[:31] or 'Sheet'
+    candidate, n = name, 2
+    while candidate in used:
+        candidate = f'{name[:28]} {n}'
+        n += 1
+    used.add(candidate)
+    return candidate
+
+
+def xlsx_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c t="n"><v>{value}</v></c>'
+    return f'<c t="inlineStr"><is><t>{escape(text(value))}</t></is></c>'
+
+
+def xlsx_row(number, values):
+    return f'<row r="{number}">{"".join(xlsx_cell(value) for value in values)}</row>'.encode('utf-8')
+
+
+def xlsx_pieces(title, sections):
+    spool = Spool()
+    with zipfile.ZipFile(spool, 'w', zipfile.ZIP_DEFLATED) as package:
+        sections = list(resolved(sections))
+        used = set()
+        names = [sheet_name(section.title, used) for section in sections]
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' for n in range(1, len(names) + 1))
+        package.writestr('[Content_Types].xml', (
+            f'{XML_HEAD}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{overrides}</Types>'))
+        package.writestr('_rels/.rels', (
+            f'{XML_HEAD}<Relationships xmlns="{PACKAGE_NS}"><Relationship Id="rId1" '
+            f'Target="xl/workbook.xml" Type="{RELATIONSHIP_NS}/officeDocument"/></Relationships>'))
+        sheets = ''.join(f'<sheet name="{escape(name)}" sheetId="{n}" r:id="rId{n}"/>'
+                         for n, name in enumerate(names, start=1))
+        package.writestr('xl/workbook.xml', (
+            f'{XML_HEAD}<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{RELATIONSHIP_NS}">'
+            f'<sheets>{sheets}</sheets></workbook>'))
+        relationships = ''.join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                                f'Type="{RELATIONSHIP_NS}/worksheet"/>' for n in range(1, len(names) + 1))
+        package.writestr('xl/_rels/workbook.xml.rels',
+                         f'{XML_HEAD}<Relationships xmlns="{PACKAGE_NS}">{relationships}</Relationships>')
+        yield spool.drain()
+        for n, section in enumerate(sections, start=1):
+            with package.open(f'xl/worksheets/sheet{n}.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(f'{XML_HEAD}<worksheet xmlns="{SPREADSHEET_NS}"><sheetData>'.encode())
+                sheet.write(xlsx_row(1, section.columns))
+                for number, row in enumerate(section.rows, start=2):
+                    sheet.write(xlsx_row(number, row))
+                    if spool.parts:
+                        yield spool.drain()
+                sheet.write(b'</sheetData></worksheet>')
+            yield spool.drain()
+    yield spool.drain()
+
+
+# -- PDF -------------------------------------------------------------------
+
+def pdf_escape(value):
+    return value.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_line(values):
+    return '  '.join(f'{text(value):<12}'[:24] for value in values)
+
+
+class PDFWriter:
+    """Objects 1-3 are the catalog, page tree and font; page n is object
+    4 + 2n with its content stream at 5 + 2n. The page tree is written last,
+    once the page count is known."""
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets = {}
+        self.pages = 0
+
+    def emit(self, data):
+        self.offset += len(data)
+        return data
+
+    def obj(self, number, content):
+        self.offsets[number] = self.offset
+        return self.emit(f'{number} 0 obj\n{content}\nendobj\n'.encode('latin-1', 'replace'))
+
+    def start(self):
+        return (self.emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+                + self.obj(1, '<< /Type /Catalog /Pages 2 0 R >>')
+                + self.obj(3, '<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>'))
+
+    def page(self, lines):
+        number = 4 + 2 * self.pages
+        self.pages += 1
+        body = ''.join(f'({pdf_escape(line)}) Tj T* ' for line in lines)
+        content = f'BT /F1 7 Tf 9 TL 24 810 Td {body}ET'
+        length = len(content.encode('latin-1', 'replace'))
+        return (self.obj(number, f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 842 842] '
+                                 f'/Resources << /Font << /F1 3 0 R >> >> /Contents {number + 1} 0 R >>')
+                + self.obj(number + 1, f'<< /Length {length} >>\nstream\n{content}\nendstream'))
+
+    def finish(self):
+        kids = ' '.join(f'{4 + 2 * n} 0 R' for n in range(self.pages))
+        tree = self.obj(2, f'<< /Type /Pages /Kids [{kids}] /Count {self.pages} >>')
+        size = max(self.offsets) + 1
+        xref = self.offset
+        table = ''.join(f'{self.offsets[n]:010d} 00000 n \n' for n in range(1, size))
+        return tree + (f'xref\n0 {size}\n0000000000 65535 f \n{table}'
+                       f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n').encode()
+
+
+def pdf_pieces(title, sections):
+    writer = PDFWriter()
+    yield writer.start()
+    lines = [title, '']
+    for section in resolved(sections):
+        header = pdf_line(section.columns)
+        lines += ['', section.title, header]
+        for row in section.rows:
+            if len(lines) >= PDF_LINES_PER_PAGE:
+                yield writer.page(lines)
+                lines = [header]
+            lines.append(pdf_line(row))
+    if lines or not writer.pages:
+        yield writer.page(lines)
+    yield writer.finish()
+
+
+WRITERS = {'csv': csv_pieces, 'xlsx': xlsx_pieces, 'pdf': pdf_pieces}
@@ -0,0 +1,147 @@
+"""Daily per-employee and per-department task rollups for the dashboards.
+
+employee_daily_stats holds, for every (assignee, assigned_date, department)
+with tasks, the STATS_SQL counters of those tasks; department_daily_stats
+holds the same per (department, assigned_date). The key columns keep the
+task table's names, so the grouping and filter expressions the dashboards
+use on task work unchanged here, summed instead of counted: a month of a
+team is a few hundred rows, the whole org by department a few thousand.
+
+Every statement that inserts or updates tasks moves the affected tasks'
+contribution with apply(): subtract the old row, change it, add the new
+one (changing() wraps an UPDATE that way). overdue_tasks depends on the
+date, so it is counted as of rollup_state.as_of and age() moves that date
+forward (or back) by adding the open tasks that fell due in between, read
+through a partial index on open tasks' due dates. rebuild() recounts both
+tables from task and check() reports every counter that disagrees with a
+recount. Callers own the transaction.
+"""
+import contextlib
+
+OPEN = "status IN ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'REWORK')"
+COUNTERS = (
+    ('total_tasks', '1'),
+    ('approved_tasks', "status = 'APPROVED'"),
+    ('in_progress_tasks', "status = 'IN_PROGRESS'"),
+    ('submitted_tasks', "status = 'SUBMITTED'"),
+    ('rework_tasks', "status = 'REWORK'"),
+    ('new_tasks', "status = 'NEW'"),
+    ('cancelled_tasks', "status = 'CANCELLED'"),
+    ('overdue_tasks', f'{OPEN} AND due_date < (SELECT as_of FROM rollup_state)'),
+    ('no_rework_tasks', "status = 'APPROVED' AND rework_count = 0"),
+    ('on_time_tasks', "status = 'APPROVED' AND completed_date <= due_date"),
+)
+TABLES = {
+    'employee_daily_stats': ('assigned_to_emp_id', 'assigned_date', 'department_id'),
+    'department_daily_stats': ('department_id', 'assigned_date'),
+}
+# A task without a department is rolled up under '': NULL never conflicts
+# with NULL in a primary key, so upserts would pile up rows instead. Reads
+# turn it back into NULL.
+TASK_KEYS = {'department_id': "COALESCE(department_id, '')"}
+READ_KEYS = {'department_id': "NULLIF(department_id, '')"}
+NAMES = ', '.join(name for name, _ in COUNTERS)
+TOTALS = ', '.join(f'COALESCE(SUM({name}), 0) AS {name}' for name, _ in COUNTERS)
+
+
+def source(*expressions):
+    """The rollup table that can answer a query using these SQL expressions."""
+    if any('assigned_to_emp_id' in expression for expression in expressions):
+        return 'employee_daily_stats'
+    return 'department_daily_stats'
+
+
+def task_keys(keys):
+    """SELECT list computing the rollup keys from task."""
+    return ', '.join(TASK_KEYS.get(key, key) for key in keys)
+
+
+def upsert(table, keys, columns, select):
+    """INSERT ... SELECT into table adding `columns` onto existing rows."""
+    key_list = ', '.join(keys)
+    return (f'INSERT INTO {table} ({key_list}, {", ".join(columns)}) {select} '
+            f'GROUP BY {", ".join(str(n) for n in range(1, len(keys) + 1))} '
+            f'ON CONFLICT ({key_list}) DO UPDATE SET '
+            + ', '.join(f'{column} = {column} + excluded.{column}' for column in columns))
+
+
+def apply(connection, sign, where='1', args=()):
+    """Add (sign 1) or subtract (sign -1) the tasks matching where."""
+    counts = ', '.join(f'{int(sign)} * COALESCE(SUM({expression}), 0)' for _, expression in COUNTERS)
+    for table, keys in TABLES.items():
+        connection.execute(upsert(table, keys, [name for name, _ in COUNTERS],
+                                  f'SELECT {task_keys(keys)}, {counts} FROM task WHERE {where}'), args)
+
+
+@contextlib.contextmanager
+def changing(connection, task_id):
+    """Move a task's contribution across an UPDATE of it made inside the block."""
+    apply(connection, -1, 'task_id = ?', (task_id,))
+    yield
+    apply(connection, 1, 'task_id = ?', (task_id,))
+
+
+def as_of(connection):
+    """The ISO date overdue_tasks is counted at, or None before rebuild()."""
+    row = connection.execute('SELECT as_of FROM rollup_state').fetchone()
+    return row[0] if row else None
+
+
+def age(connection, today):
+    """Count overdue_tasks as of today.
+
+    Only open tasks due between the old and the new date change, so a
+    dashboard read on a new day costs as much as the tasks that fell due.
+    """
+    day, previous = today.isoformat(), as_of(connection)
+    if previous is None:
+        rebuild(connection, today)
+        return
+    if previous == day:
+        return
+    low, high, sign = (previous, day, 1) if previous < day else (day, previous, -1)
+    for table, keys in TABLES.items():
+        connection.execute(upsert(table, keys, ['overdue_tasks'],
+                                  f'SELECT {task_keys(keys)}, {sign} * COUNT(*) FROM task '
+                                  f'WHERE {OPEN} AND due_date >= ? AND due_date < ?'), (low, high))
+    connection.execute('UPDATE rollup_state SET as_of = ?', (day,))
+
+
+def rebuild(connection, today):
+    """Recount both rollups from task as of today; returns the employee-day row count."""
+    for table in (*TABLES, 'rollup_state'):
+        connection.execute(f'DELETE FROM {table}')
+    connection.execute('INSERT INTO rollup_state (as_of) VALUES (?)', (today.isoformat(),))
+    apply(connection, 1)
+    return connection.execute('SELECT COUNT(*) FROM employee_daily_stats').fetchone()[0]
+
+
+def check(connection):
+    """Compare both rollups with a recount from task at the same as_of date.
+
+    Returns (table, key, counter, stored, recounted) for every difference;
+    an empty list means the rollups are consistent.
+    """
+    differences = []
+    for table, keys in TABLES.items():
+        key_list, width = ', '.join(keys), len(keys)
+        counts = ', '.join(f'COALESCE(SUM({expression}), 0)' for _, expression in COUNTERS)
+        stored = {tuple(row[:width]): tuple(row[width:]) for row in connection.execute(
+            f'SELECT {key_list}, {TOTALS} FROM {table} GROUP BY {key_list}')}
+        recounted = {tuple(row[:width]): tuple(row[width:]) for row in connection.execute(
+            f'SELECT {task_keys(keys)}, {counts} FROM task GROUP BY {", ".join(map(str, range(1, width + 1)))}')}
+        zero = (0,) * len(COUNTERS)
+        for key in sorted(stored.keys() | recounted.keys(), key=repr):
+            have, want = stored.get(key, zero), recounted.get(key, zero)
+            differences.extend((table, key, name, have[n], want[n])
+                               for n, (name, _) in enumerate(COUNTERS) if have[n] != want[n])
+    return differences
+
+
+def is_empty(connection):
+    """True when tasks exist but the rollups were never built, or hold NULL
+    department rows from before TASK_KEYS."""
+    if connection.execute('SELECT 1 FROM employee_daily_stats WHERE department_id IS NULL LIMIT 1').fetchone():
+        return True
+    return (as_of(connection) is None
+            and connection.execute('SELECT 1 FROM task LIMIT 1').fetchone() is not None)
@@ -0,0 +1,205 @@
+"""Queues of upcoming recurring-task instances and task reminders.
+
+Two tables hold the next date anything has to happen, each indexed on that
+date so a run reads only what is due:
+
+- recurring_schedule: one row per active recurring template with the next
+  day it fires;
+- task_reminder: one row per open task with the day its next reminder goes
+  out (the day before it is due, then daily until it is closed).
+
+run_recurring() loads the due templates into a heap keyed by fire date and
+pops them in date order, pushing each back with its following fire date
+while that is still on or before the run date. Every window missed during
+downtime therefore yields exactly one instance, and running the same date
+again finds the queue empty. Instances, their subtasks, history rows,
+notifications and reminders are written with executemany in one pass, and
+the new tasks are added to the dashboard rollups with one statement.
+run_reminders() collapses missed days into one reminder per task.
+
+The queues live in the database rather than in process memory so every
+worker sees the same schedule and a restart loses nothing; rebuild()
+derives both from recurring_task and task. Callers own the transaction.
+"""
+import datetime
+import heapq
+
+from . import inbox, rollups, store
+
+ONE_DAY = datetime.timedelta(days=1)
+DUE_AFTER = datetime.timedelta(days=7)
+
+
+def parse(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def next_fire(template, after):
+    """The first day after `after` on which template fires, or None once it has ended.
+
+    WEEKLY fires on isoweekday weekly_day, MONTHLY on monthly_day (skipping
+    months without that day) and YEARLY on yearly_month/yearly_day.
+    """
+    day = max(after + ONE_DAY, parse(template['start_date']))
+    if template['frequency'] == 'WEEKLY':
+        found = day + datetime.timedelta(days=((template['weekly_day'] or 1) - day.isoweekday()) % 7)
+    else:
+        if template['frequency'] == 'MONTHLY':
+            candidates = ((day.year + (day.month - 1 + n) // 12, (day.month - 1 + n) % 12 + 1,
+                           template['monthly_day'] or 1) for n in range(13))
+        else:
+            candidates = ((day.year + n, template['yearly_month'] or 1, template['yearly_day'] or 1)
+                          for n in range(9))
+        for year, month, month_day in candidates:
+            try:
+                found = datetime.date(year, month, month_day)
+            except ValueError:
+                continue
+            if found >= day:
+                break
+        else:
+            return None
+    end = parse(template['end_date'])
+    return None if end and found > end else found
+
+
+def schedule(connection, recurring_id, today):
+    """Queue a template after it is created, edited, activated or deactivated.
+
+    Windows before today are never replayed here: catching up is for
+    downtime, not for a template that was just switched on or rescheduled.
+    """
+    template = connection.execute('SELECT * FROM recurring_task WHERE recurring_id = ?', (recurring_id,)).fetchone()
+    fires = None
+    if template is not None and template['is_active']:
+        last_run = parse(template['last_run_date']) or parse(template['start_date']) - ONE_DAY
+        fires = next_fire(template, max(last_run, today - ONE_DAY))
+    if fires is None:
+        connection.execute('DELETE FROM recurring_schedule WHERE recurring_id = ?', (recurring_id,))
+    else:
+        connection.execute('INSERT OR REPLACE INTO recurring_schedule (recurring_id, next_run_date) VALUES (?, ?)',
+                           (recurring_id, fires.isoformat()))
+
+
+def remind(connection, tasks):
+    """Queue reminders for open tasks given as (task_id, due_date) pairs."""
+    connection.executemany("INSERT OR REPLACE INTO task_reminder (task_id, remind_on) VALUES (?, date(?, '-1 day'))",
+                           tasks)
+
+
+def run_recurring(connection, run_date, actor_emp_id):
+    """Create every instance due on or before run_date; returns the parent task ids.
+
+    Instances are assigned on their fire date and due DUE_AFTER later, and
+    each template's last_run_date becomes its latest fire date.
+    """
+    day = run_date.isoformat()
+    due = {row['recurring_id']: row for row in connection.execute(
+        'SELECT s.next_run_date, t.*, COALESCE(e.department_id, t.department_id) AS assignee_department_id '
+        'FROM recurring_schedule s JOIN recurring_task t USING (recurring_id) '
+        'LEFT JOIN employee e ON e.emp_id = t.assigned_to_emp_id '
+        'WHERE s.next_run_date <= ? AND t.is_active = 1', (day,))}
+    if not due:
+        return []
+    subtasks = {}
+    for row in connection.execute(
+            'SELECT st.*, COALESCE(e.department_id, st.department_id) AS assignee_department_id '
+            'FROM recurring_subtask st LEFT JOIN employee e ON e.emp_id = st.assigned_to_emp_id '
+            'WHERE st.recurring_id IN (SELECT recurring_id FROM recurring_schedule WHERE next_run_date <= ?) '
+            'ORDER BY st.sequence_no, st.subtask_template_id', (day,)):
+        subtasks.setdefault(row['recurring_id'], []).append(row)
+
+    heap = [(row['next_run_date'], recurring_id) for recurring_id, row in due.items()]
+    heapq.heapify(heap)
+    occurrences, following = [], {}
+    while heap:
+        fired, recurring_id = heapq.heappop(heap)
+        occurrences.append((parse(fired), recurring_id))
+        fires = next_fire(due[recurring_id], parse(fired))
+        if fires is not None and fires <= run_date:
+            heapq.heappush(heap, (fires.isoformat(), recurring_id))
+        else:
+            following[recurring_id] = fires
+
+    created = store.now()
+    task_id = first = connection.execute('SELECT COALESCE(MAX(task_id), 0) FROM task').fetchone()[0]
+    tasks, parents, last_run = [], [], {}
+    for fired, recurring_id in occurrences:
+        due_date = (fired + DUE_AFTER).isoformat()
+        parent = None
+        for template in [due[recurring_id], *subtasks.get(recurring_id, ())]:
+            task_id += 1
+            tasks.append((task_id, template['title'], template['description'], template['priority'], 'NEW',
+                          template['assigned_to_emp_id'], actor_emp_id, template['assignee_department_id'],
+                          parent, fired.isoformat(), due_date, None, 0, 0, created, created))
+            parent = parent or task_id
+        parents.append(parent)
+        last_run[recurring_id] = fired.isoformat()
+
+    connection.executemany(store.INSERT_TASK, tasks)
+    rollups.apply(connection, 1, 'task_id > ?', (first,))
+    connection.executemany('INSERT INTO task_history (task_id, action, to_status, actor_emp_id, created_at) '
+                           "VALUES (?, 'CREATE', 'NEW', ?, ?)", [(row[0], actor_emp_id, created) for row in tasks])
+    inbox.fan_out(connection, [(row[5], 'TASK_ASSIGNED', f'New task assigned: {row[1]}', row[0]) for row in tasks],
+                  created)
+    remind(connection, [(row[0], row[10]) for row in tasks])
+    connection.executemany('UPDATE recurring_task SET last_run_date = ? WHERE recurring_id = ?',
+                           [(fired, recurring_id) for recurring_id, fired in last_run.items()])
+    connection.executemany('UPDATE recurring_schedule SET next_run_date = ? WHERE recurring_id = ?',
+                           [(fires.isoformat(), recurring_id) for recurring_id, fires in following.items() if fires])
+    connection.executemany('DELETE FROM recurring_schedule WHERE recurring_id = ?',
+                           [(recurring_id,) for recurring_id, fires in following.items() if fires is None])
+    return parents
+
+
+def run_reminders(connection, run_date):
+    """Send the reminders due on or before run_date; returns how many were sent.
+
+    Open tasks are reminded daily from the day before they are due, as the
+    old sweep did, but at most once per day. A task that closed since it was
+    queued is dropped and one whose due date moved out is re-queued for the
+    day before it. Each step is one set-based statement, so no row passes
+    through Python.
+    """
+    args = {'day': run_date.isoformat(), 'tomorrow': (run_date + ONE_DAY).isoformat(), 'created': store.now()}
+    args.update((f'status{n}', status) for n, status in enumerate(store.OPEN_STATUSES))
+    statuses = ', '.join(f':status{n}' for n in range(len(store.OPEN_STATUSES)))
+    connection.execute(f'DELETE FROM task_reminder WHERE remind_on <= :day AND NOT EXISTS ('
+                       f'SELECT 1 FROM task t WHERE t.task_id = task_reminder.task_id AND t.status IN ({statuses}))',
+                       args)
+    due_date = '(SELECT due_date FROM task t WHERE t.task_id = task_reminder.task_id)'
+    connection.execute(f"UPDATE task_reminder SET remind_on = date({due_date}, '-1 day') "
+                       f'WHERE remind_on <= :day AND {due_date} > :tomorrow', args)
+    before = inbox.last_id(connection)
+    sent = connection.execute(
+        'INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) '
+        "SELECT t.assigned_to_emp_id, CASE WHEN t.due_date < :day THEN 'TASK_OVERDUE' ELSE 'TASK_DUE_SOON' END, "
+        "'Reminder: ' || t.title || ' is due ' || t.due_date, t.task_id, 0, :created "
+        'FROM task_reminder r JOIN task t USING (task_id) WHERE r.remind_on <= :day', args).rowcount
+    inbox.count_since(connection, before)
+    connection.execute('UPDATE task_reminder SET remind_on = :tomorrow WHERE remind_on <= :day', args)
+    return sent
+
+
+def rebuild(connection, today):
+    """Recreate both queues from recurring_task and the open tasks.
+
+    A template that has run before resumes after its last_run_date, so the
+    next run catches up whatever was missed; one that never ran starts today.
+    """
+    connection.execute('DELETE FROM recurring_schedule')
+    rows = []
+    for template in connection.execute('SELECT * FROM recurring_task WHERE is_active = 1'):
+        after = parse(template['last_run_date']) or max(parse(template['start_date']), today) - ONE_DAY
+        fires = next_fire(template, after)
+        if fires is not None:
+            rows.append((template['recurring_id'], fires.isoformat()))
+    connection.executemany('INSERT INTO recurring_schedule (recurring_id, next_run_date) VALUES (?, ?)', rows)
+    connection.execute('DELETE FROM task_reminder')
+    connection.execute(f"INSERT INTO task_reminder (task_id, remind_on) SELECT task_id, date(due_date, '-1 day') "
+                       f"FROM task WHERE status IN ({', '.join('?' * len(store.OPEN_STATUSES))})", store.OPEN_STATUSES)
+
+
+def is_empty(connection):
+    return (connection.execute('SELECT 1 FROM recurring_schedule LIMIT 1').fetchone() is None
+            and connection.execute('SELECT 1 FROM task_reminder LIMIT 1').fetchone() is None)
@@ -0,0 +1,232 @@
+"""OpenAPI document handling: operations, parameter coercion, validation and
+schema-driven example values.
+
+Only the subset of JSON Schema that openapi.json actually uses is supported
+(type, enum, anyOf, $ref, properties/required, items, min/max, minLength/
+maxLength, default and the date/email formats). Errors come back in the same
+shape FastAPI uses for a 422, so clients see what the real backend returns.
+"""
+import datetime
+import json
+import random
+import re
+
+PARAM_RE = re.compile(r'\{(\w+)\}')
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+JSON_TYPES = {'string': str, 'integer': int, 'number': (int, float), 'boolean': bool,
+              'array': list, 'object': dict}
+MISSING = object()
+
+
+class Operation:
+    """One method on one path of the spec."""
+
+    def __init__(self, spec, method, path, op):
+        self.spec = spec
+        self.method = method.upper()
+        self.path = path
+        self.operation_id = op.get('operationId', f'{method}_{path}')
+        self.parameters = [p for p in op.get('parameters', []) if p['in'] in ('path', 'query')]
+        self.secured = bool(op.get('security'))
+        content = op.get('requestBody', {}).get('content', {})
+        self.body_media, body = next(iter(content.items()), (None, {}))
+        self.body_schema = body.get('schema')
+        self.body_required = op.get('requestBody', {}).get('required', False)
+        response = op.get('responses', {}).get('200', {}).get('content', {}).get('application/json', {})
+        self.response_schema = response.get('schema') or None
+
+    def __repr__(self):
+        return f'<Operation {self.method} {self.path}>'
+
+    def coerce_parameters(self, path_params, query_params):
+        """Typed path and query values, or raise RequestValidationError."""
+        values, errors = {}, []
+        for param in self.parameters:
+            name, where, schema = param['name'], param['in'], param.get('schema', {})
+            raw = (path_params if where == 'path' else query_params).get(name, MISSING)
+            if raw is MISSING:
+                if param.get('required') or where == 'path':
+                    errors.append(_error('missing', [where, name], 'Field required', None))
+                else:
+                    values[name] = resolve(self.spec, schema).get('default')
+                continue
+            value, problems = coerce(self.spec, schema, raw, [where, name])
+            errors.extend(problems)
+            values[name] = value
+        if errors:
+            raise RequestValidationError(errors)
+        return values
+
+    def validate_body(self, body):
+        if body is MISSING or body is None:
+            if self.body_required:
+                raise RequestValidationError([_error('missing', ['body'], 'Field required', None)])
+            return None
+        if self.body_schema is not None:
+            errors = validate(self.spec, self.body_schema, body, ['body'])
+            if errors:
+                raise RequestValidationError(errors)
+        return body
+
+
+class RequestValidationError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def operations(spec):
+    """Every operation, literal paths before templated ones so that
+    /tasks/team is tried before /tasks/{task_id}."""
+    ops = [Operation(spec, method, path, op)
+           for path, methods in spec['paths'].items() for method, op in methods.items()]
+    return sorted(ops, key=lambda op: len(PARAM_RE.findall(op.path)))
+
+
+def resolve(spec, schema):
+    while '$ref' in schema:
+        node = spec
+        for part in schema['$ref'].lstrip('#/').split('/'):
+            node = node[part]
+        schema = node
+    return schema
+
+
+def _error(kind, loc, msg, value, **ctx):
+    error = {'type': kind, 'loc': loc, 'msg': msg, 'input': value}
+    if ctx:
+        error['ctx'] = ctx
+    return error
+
+
+def coerce(spec, schema, raw, loc):
+    """Convert a query/path string to the schema's type; returns (value, errors)."""
+    schema = resolve(spec, schema)
+    if 'anyOf' in schema:
+        for option in schema['anyOf']:
+            if resolve(spec, option).get('type') == 'null':
+                continue
+            value, errors = coerce(spec, option, raw, loc)
+            if not errors:
+                return value, []
+        return raw, errors
+    kind = schema.get('type')
+    value = raw
+    if kind == 'integer':
+        try:
+            value = int(raw)
+        except ValueError:
+            return raw, [_error('int_parsing', loc, 'Input should be a valid integer, '
+                                'unable to parse string as an integer', raw)]
+    elif kind == 'number':
+        try:
+            value = float(raw)
+        except ValueError:
+            return raw, [_error('float_parsing', loc, 'Input should be a valid number', raw)]
+    elif kind == 'boolean':
+        lowered = raw.lower()
+        if lowered in ('true', '1', 'yes', 'on'):
+            value = True
+        elif lowered in ('false', '0', 'no', 'off'):
+            value = False
+        else:
+            return raw, [_error('bool_parsing', loc, 'Input should be a valid boolean', raw)]
+    return value, validate(spec, schema, value, loc)
+
+
+def validate(spec, schema, value, loc):
+    """List of FastAPI-style error dicts; empty when value matches schema."""
+    schema = resolve(spec, schema)
+    if 'anyOf' in schema:
+        collected = []
+        for option in schema['anyOf']:
+            errors = validate(spec, option, value, loc)
+            if not errors:
+                return []
+            collected.extend(errors)
+        return collected[:1]
+    kind = schema.get('type')
+    if kind == 'null':
+        return [] if value is None else [_error('none_required', loc, 'Input should be None', value)]
+    if kind in JSON_TYPES:
+        expected = JSON_TYPES[kind]
+        if not isinstance(value, expected) or (kind in ('integer', 'number') and isinstance(value, bool)):
+            return [_error(f'{kind}_type', loc, f'Input should be a valid {kind}', value)]
+    if 'enum' in schema and value not in schema['enum']:
+        options = ', '.join(repr(option) for option in schema['enum'])
+        return [_error('enum', loc, f'Input should be {options}', value, expected=options)]
+    errors = []
+    if kind == 'string':
+        if len(value) < schema.get('minLength', 0):
+            errors.append(_error('string_too_short', loc, f"String should have at least "
+                                 f"{schema['minLength']} character", value))
+        if 'maxLength' in schema and len(value) > schema['maxLength']:
+            errors.append(_error('string_too_long', loc, f"String should have at most "
+                                 f"{schema['maxLength']} characters", value))
+        if schema.get('format') == 'date':
+            try:
+                datetime.date.fromisoformat(value)
+            except ValueError:
+                errors.append(_error('date_from_datetime_parsing', loc,
+                                     'Input should be a valid date', value))
+        elif schema.get('format') == 'email' and not EMAIL_RE.match(value):
+            errors.append(_error('value_error', loc, 'value is not a valid email address', value))
+    elif kind in ('integer', 'number'):
+        if 'minimum' in schema and value < schema['minimum']:
+            errors.append(_error('greater_than_equal', loc, f"Input should be greater than or "
+                                 f"equal to {schema['minimum']:g}", value))
+        if 'maximum' in schema and value > schema['maximum']:
+            errors.append(_error('less_than_equal', loc, f"Input should be less than or "
+                                 f"equal to {schema['maximum']:g}", value))
+    elif kind == 'array' and 'items' in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate(spec, schema['items'], item, loc + [index]))
+    elif kind == 'object' or 'properties' in schema:
+        if not isinstance(value, dict):
+            return [_error('model_attributes_type', loc, 'Input should be a valid dictionary', value)]
+        for name in schema.get('required', ()):
+            if name not in value:
+                errors.append(_error('missing', loc + [name], 'Field required', value))
+        for name, subschema in schema.get('properties', {}).items():
+            if name in value:
+                errors.extend(validate(spec, subschema, value[name], loc + [name]))
+    return errors
+
+
+def example(spec, schema, rng=None, depth=0, name=''):
+    """A value that validates against schema, for operations without a handler."""
+    rng = rng or random.Random(0)
+    schema = resolve(spec, schema)
+    if 'default' in schema:
+        return schema['default']
+    if 'enum' in schema:
+        return rng.choice(schema['enum'])
+    if 'anyOf' in schema:
+        options = [option for option in schema['anyOf'] if resolve(spec, option).get('type') != 'null']
+        return example(spec, options[0], rng, depth, name) if options else None
+    kind = schema.get('type', 'object')
+    if kind == 'string':
+        if schema.get('format') == 'date':
+            return (datetime.date(2026, 1, 1) + datetime.timedelta(days=rng.randrange(365))).isoformat()
+        if schema.get('format') == 'email':
+            return f'user{rng.randrange(1000)}@example.com'
+        text = f'{name or "value"}-{rng.randrange(10_000)}'
+        return text[:schema.get('maxLength', len(text))].ljust(schema.get('minLength', 0), 'x')
+    if kind == 'integer':
+        return rng.randint(int(schema.get('minimum', 0)), int(schema.get('maximum', 1000)))
+    if kind == 'number':
+        return round(rng.uniform(schema.get('minimum', 0), schema.get('maximum', 100)), 2)
+    if kind == 'boolean':
+        return rng.random() < 0.5
+    if kind == 'array':
+        if depth > 2:
+            return []
+        return [example(spec, schema.get('items', {}), rng, depth + 1, name) for _ in range(rng.randint(1, 3))]
+    properties = schema.get('properties', {})
+    return {key: example(spec, subschema, rng, depth + 1, key) for key, subschema in properties.items()
+            if depth <= 3 or key in schema.get('required', ())}
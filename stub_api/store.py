@@ -0,0 +1,341 @@
+"""SQLite store and seeded data generator for the stand-in API.
+
+    python -m stub_api --db /tmp/perfmetric.db --employees 2000 --tasks 200000 --reseed --seed-only
+
+The same --seed, sizes and --today always produce the same rows. The org
+mirrors users.json: a CFO and an admin at the top, one manager per
+department (MGR_AP, MGR_AR, ...) and executives below them (EMP_AP1, ...).
+Every seeded account uses the password the PowerShell scripts log in with.
+"""
+import datetime
+import os
+import random
+import sqlite3
+
+from . import hierarchy, inbox, rollups, scheduler
+
+DEFAULT_PASSWORD = 'Perfmetric@123'
+BATCH_SIZE = 10_000
+
+DEPARTMENTS = (
+    ('AP', 'Accounts Payables'),
+    ('AR', 'Accounts Receivables'),
+    ('CASH', 'Cash Management Team'),
+    ('FA', 'Fixed Assets'),
+    ('MIS', 'MIS Report and Internal Audit'),
+    ('TTF', 'Treasury and Trade Finance'),
+)
+TEAM_SIZE = 8
+
+TASK_COLUMNS = ('task_id', 'title', 'description', 'priority', 'status', 'assigned_to_emp_id',
+                'assigned_by_emp_id', 'department_id', 'parent_task_id', 'assigned_date', 'due_date',
+                'completed_date', 'rework_count', 'reassignment_count', 'created_at', 'updated_at')
+INSERT_TASK = f'INSERT INTO task ({", ".join(TASK_COLUMNS)}) VALUES ({", ".join("?" * len(TASK_COLUMNS))})'
+
+STATUSES = ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'APPROVED', 'REWORK', 'CANCELLED')
+STATUS_WEIGHTS = (15, 20, 10, 45, 6, 4)
+OPEN_STATUSES = ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'REWORK')
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH')
+TASK_TITLES = ('Vendor reconciliation', 'Invoice ageing review', 'Bank statement matching',
+               'Month-end accruals', 'Fixed asset tagging', 'Cash position forecast',
+               'Audit sample testing', 'FX exposure report', 'Intercompany netting',
+               'Payment run approval', 'Credit note follow-up', 'Depreciation schedule',
+               'Trade finance LC review', 'Variance analysis', 'Collections call list')
+FIRST_NAMES = ('Aarav', 'Aisha', 'Ben', 'Chen', 'Diego', 'Elena', 'Fatima', 'George',
+               'Hana', 'Ivan', 'Jia', 'Kofi', 'Leila', 'Mateo', 'Nadia', 'Omar',
+               'Priya', 'Quinn', 'Rosa', 'Sarath', 'Tariq', 'Uma', 'Victor', 'Wen')
+LAST_NAMES = ('Ahmed', 'Brown', 'Costa', 'Das', 'Evans', 'Fischer', 'Garcia', 'Haddad',
+              'Ito', 'Jones', 'Khan', 'Lopez', 'Martin', 'Nair', 'Okafor', 'Patel')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS department (
+    dept_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    manager_emp_id TEXT,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS employee (
+    emp_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    department_id TEXT,
+    manager_emp_id TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    password TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_employee_manager ON employee (manager_emp_id);
+CREATE INDEX IF NOT EXISTS ix_employee_department ON employee (department_id);
+CREATE TABLE IF NOT EXISTS employee_closure (
+    ancestor_emp_id TEXT NOT NULL,
+    descendant_emp_id TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_emp_id, depth, descendant_emp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_employee_closure_descendant ON employee_closure (descendant_emp_id, depth);
+CREATE TABLE IF NOT EXISTS task (
+    task_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    assigned_to_emp_id TEXT NOT NULL,
+    assigned_by_emp_id TEXT,
+    department_id TEXT,
+    parent_task_id INTEGER,
+    assigned_date TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    completed_date TEXT,
+    rework_count INTEGER NOT NULL DEFAULT 0,
+    reassignment_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_task_assignee ON task (assigned_to_emp_id, assigned_date);
+CREATE INDEX IF NOT EXISTS ix_task_department ON task (department_id, assigned_date);
+CREATE INDEX IF NOT EXISTS ix_task_parent ON task (parent_task_id);
+CREATE INDEX IF NOT EXISTS ix_task_open_due ON task (due_date)
+    WHERE status IN ('NEW', 'IN_PROGRESS', 'SUBMITTED', 'REWORK');
+CREATE TABLE IF NOT EXISTS task_history (
+    history_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT,
+    actor_emp_id TEXT,
+    comment TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_task_history_task ON task_history (task_id);
+CREATE TABLE IF NOT EXISTS attachment (
+    attachment_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    content_type TEXT,
+    size INTEGER NOT NULL,
+    content BLOB,
+    uploaded_by TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_attachment_task ON attachment (task_id);
+CREATE TABLE IF NOT EXISTS notification (
+    notification_id INTEGER PRIMARY KEY,
+    emp_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    task_id INTEGER,
+    is_read INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_notification_emp ON notification (emp_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_notification_unread ON notification (emp_id, created_at) WHERE is_read = 0;
+CREATE TABLE IF NOT EXISTS notification_counter (
+    emp_id TEXT PRIMARY KEY,
+    unread INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recurring_task (
+    recurring_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    department_id TEXT NOT NULL,
+    assigned_to_emp_id TEXT NOT NULL,
+    assigned_by_emp_id TEXT NOT NULL,
+    priority TEXT NOT NULL DEFAULT 'MEDIUM',
+    frequency TEXT NOT NULL,
+    weekly_day INTEGER,
+    monthly_day INTEGER,
+    yearly_month INTEGER,
+    yearly_day INTEGER,
+    start_date TEXT NOT NULL,
+    end_date TEXT,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    last_run_date TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recurring_subtask (
+    subtask_template_id INTEGER PRIMARY KEY,
+    recurring_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    department_id TEXT NOT NULL,
+    assigned_to_emp_id TEXT NOT NULL,
+    priority TEXT NOT NULL DEFAULT 'MEDIUM',
+    sequence_no INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_recurring_subtask_parent ON recurring_subtask (recurring_id);
+CREATE TABLE IF NOT EXISTS recurring_schedule (
+    recurring_id INTEGER PRIMARY KEY,
+    next_run_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_recurring_schedule_next ON recurring_schedule (next_run_date);
+CREATE TABLE IF NOT EXISTS task_reminder (
+    task_id INTEGER PRIMARY KEY,
+    remind_on TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_task_reminder_day ON task_reminder (remind_on);
+CREATE TABLE IF NOT EXISTS employee_daily_stats (
+    assigned_to_emp_id TEXT NOT NULL,
+    assigned_date TEXT NOT NULL,
+    department_id TEXT NOT NULL,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    approved_tasks INTEGER NOT NULL DEFAULT 0,
+    in_progress_tasks INTEGER NOT NULL DEFAULT 0,
+    submitted_tasks INTEGER NOT NULL DEFAULT 0,
+    rework_tasks INTEGER NOT NULL DEFAULT 0,
+    new_tasks INTEGER NOT NULL DEFAULT 0,
+    cancelled_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    no_rework_tasks INTEGER NOT NULL DEFAULT 0,
+    on_time_tasks INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (assigned_to_emp_id, assigned_date, department_id)
+);
+CREATE TABLE IF NOT EXISTS department_daily_stats (
+    department_id TEXT NOT NULL,
+    assigned_date TEXT NOT NULL,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    approved_tasks INTEGER NOT NULL DEFAULT 0,
+    in_progress_tasks INTEGER NOT NULL DEFAULT 0,
+    submitted_tasks INTEGER NOT NULL DEFAULT 0,
+    rework_tasks INTEGER NOT NULL DEFAULT 0,
+    new_tasks INTEGER NOT NULL DEFAULT 0,
+    cancelled_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    no_rework_tasks INTEGER NOT NULL DEFAULT 0,
+    on_time_tasks INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (department_id, assigned_date)
+);
+CREATE TABLE IF NOT EXISTS rollup_state (
+    as_of TEXT NOT NULL
+);
+'''
+
+
+def connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.execute('PRAGMA synchronous = NORMAL')
+    connection.execute('PRAGMA foreign_keys = OFF')
+    return connection
+
+
+def create_schema(connection):
+    connection.executescript(SCHEMA)
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat()
+
+
+def org(employees, rng):
+    """Departments and people for an org of roughly `employees` executives."""
+    count = max(len(DEPARTMENTS), -(-employees // TEAM_SIZE))
+    departments = list(DEPARTMENTS) + [(f'D{n:03d}', f'Finance Unit {n}')
+                                       for n in range(len(DEPARTMENTS) + 1, count + 1)]
+    people = [('CFO001', 'Chief Financial Officer', 'CFO', 'FIN', None),
+              ('ADMIN001', 'System Administrator', 'ADMIN', 'FIN', None)]
+    for index, (dept_id, _) in enumerate(departments):
+        manager = f'MGR_{dept_id}'
+        people.append((manager, f'{dept_id} Manager', 'MANAGER', dept_id, 'CFO001'))
+        team = employees // count + (1 if index < employees % count else 0)
+        for n in range(1, team + 1):
+            name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+            people.append((f'EMP_{dept_id}{n}', name, 'EMPLOYEE', dept_id, manager))
+    departments.insert(0, ('FIN', 'Finance Office'))
+    return departments, people
+
+
+def task_rows(count, people, today, rng):
+    """Task tuples; about one in twenty is a parent objective with subtasks."""
+    assignees = [p for p in people if p[2] in ('EMPLOYEE', 'MANAGER')]
+    created = now()
+    parents = []
+    for task_id in range(1, count + 1):
+        emp_id, _, role, dept_id, manager = rng.choice(assignees)
+        parent = None
+        if parents and rng.random() < 0.3:
+            parent = rng.choice(parents)
+        assigned = today - datetime.timedelta(days=rng.randrange(365))
+        due = assigned + datetime.timedelta(days=rng.randint(2, 30))
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        completed = None
+        if status == 'APPROVED':
+            completed = (due + datetime.timedelta(days=rng.randint(-5, 4))).isoformat()
+        rework = rng.choice((0, 0, 0, 1, 2)) if status in ('APPROVED', 'REWORK') else 0
+        yield (task_id, rng.choice(TASK_TITLES), None, rng.choice(PRIORITIES), status, emp_id,
+               manager or 'CFO001', dept_id, parent, assigned.isoformat(), due.isoformat(),
+               completed, rework, 0, created, created)
+        if parent is None and rng.random() < 0.05:
+            parents.append(task_id)
+
+
+def seed(path, employees=200, tasks=20_000, notifications=20, seed=42, today=None):
+    """(Re)create the database at path with seeded synthetic data."""
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    if os.path.exists(path):
+        os.remove(path)
+    connection = connect(path)
+    create_schema(connection)
+    connection.execute('PRAGMA synchronous = OFF')
+    departments, people = org(employees, rng)
+    created = now()
+    connection.execute('BEGIN')
+    connection.executemany('INSERT INTO department VALUES (?, ?, ?, 1)',
+                           [(d, name, 'CFO001' if d == 'FIN' else f'MGR_{d}') for d, name in departments])
+    connection.executemany(
+        'INSERT INTO employee VALUES (?, ?, ?, ?, ?, ?, 1, ?)',
+        [(emp_id, name, f'{emp_id.lower()}@perfmetric.example', role, dept, manager, DEFAULT_PASSWORD)
+         for emp_id, name, role, dept, manager in people])
+    hierarchy.rebuild(connection)
+
+    source = task_rows(tasks, people, today, rng)
+    history = []
+    while True:
+        batch = [row for _, row in zip(range(BATCH_SIZE), source)]
+        if not batch:
+            break
+        connection.executemany(INSERT_TASK, batch)
+        for row in batch:
+            history.append((row[0], 'CREATE', None, 'NEW', row[6], None, row[9]))
+            if row[4] != 'NEW':
+                history.append((row[0], 'TRANSITION', 'NEW', row[4], row[5], None, row[11] or row[9]))
+        connection.executemany('INSERT INTO task_history (task_id, action, from_status, to_status, '
+                               'actor_emp_id, comment, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)', history)
+        history.clear()
+
+    kinds = ('TASK_ASSIGNED', 'TASK_DUE_SOON', 'TASK_OVERDUE', 'TASK_APPROVED', 'TASK_REWORK')
+    connection.executemany(
+        'INSERT INTO notification (emp_id, type, message, task_id, is_read, created_at) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        [(emp_id, kind, f'{kind.replace("_", " ").title()}: task #{task_id}', task_id,
+          int(rng.random() < 0.6), (today - datetime.timedelta(days=rng.randrange(60))).isoformat())
+         for emp_id, *_ in people for kind, task_id in
+         ((rng.choice(kinds), rng.randint(1, max(tasks, 1))) for _ in range(notifications))])
+    inbox.rebuild(connection)
+
+    frequencies = ('WEEKLY', 'MONTHLY', 'YEARLY')
+    start = (today - datetime.timedelta(days=90)).isoformat()
+    for dept_id, name in departments[1:]:
+        team = [p[0] for p in people if p[3] == dept_id and p[2] == 'EMPLOYEE'] or [f'MGR_{dept_id}']
+        for frequency in rng.sample(frequencies, 2):
+            cursor = connection.execute(
+                'INSERT INTO recurring_task (title, description, department_id, assigned_to_emp_id, '
+                'assigned_by_emp_id, priority, frequency, weekly_day, monthly_day, yearly_month, '
+                'yearly_day, start_date, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (f'{frequency.title()} {name} close', None, dept_id, rng.choice(team), f'MGR_{dept_id}',
+                 rng.choice(PRIORITIES), frequency, rng.randint(1, 7), rng.randint(1, 28),
+                 rng.randint(1, 12), rng.randint(1, 28), start, created))
+            connection.executemany(
+                'INSERT INTO recurring_subtask (recurring_id, title, department_id, assigned_to_emp_id, '
+                'priority, sequence_no) VALUES (?, ?, ?, ?, ?, ?)',
+                [(cursor.lastrowid, f'Step {n}: {rng.choice(TASK_TITLES)}', dept_id, rng.choice(team),
+                  rng.choice(PRIORITIES), n) for n in range(1, rng.randint(1, 4))])
+    scheduler.rebuild(connection, today)
+    rollups.rebuild(connection, today)
+    connection.execute('COMMIT')
+    connection.execute('ANALYZE')
+    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    connection.close()
+    return len(people)
+
@@ -0,0 +1,62 @@
+"""Student management app.
+
+    from student_management import create_app
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+
+create_app() accepts a config object (see config.py) or a mapping of
+overrides on top of Config. Extensions are bound per app, so any number of
+apps with their own databases can live in one process.
+"""
+import os
+
+from flask import Flask
+from sqlalchemy import event
+
+from .config import Config
+from .database import (SQLITE_PROFILES, init_db, migrate, sqlite_engine_options,
+                       sqlite_pragma_listener)
+from .extensions import db
+from .models import LISTING_COLUMNS, Student
+
+__all__ = ['create_app', 'db', 'init_db', 'migrate', 'Student', 'LISTING_COLUMNS']
+
+
+def create_app(config=None):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    if not app.config['SQLALCHEMY_DATABASE_URI']:
+        os.makedirs(app.instance_path, exist_ok=True)
+        app.config['SQLALCHEMY_DATABASE_URI'] = (
+            'sqlite:///' + os.path.join(app.instance_path, 'students.db'))
+    app.config.setdefault('SQLITE_PRAGMAS', dict(SQLITE_PROFILES[app.config['SQLITE_PROFILE']]))
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', sqlite_engine_options(
+        app.config['SQLITE_POOL'], app.config['SQLITE_POOL_SIZE']))
+
+    db.init_app(app)
+    with app.app_context():
+        event.listen(db.engine, 'connect', sqlite_pragma_listener(app.config['SQLITE_PRAGMAS']))
+        if app.config['AUTO_MIGRATE']:
+            try:
+                init_db()
+            except RuntimeError as exc:
+                # Serve what the schema allows; `flask migrate` reports it again.
+                app.logger.error('%s', exc)
+
+    from .api import bp as api_bp
+    from .cli import register_commands
+    from .listing import init_listing_cache
+    from .views import bp
+
+    init_listing_cache(app)
+    app.register_blueprint(bp)
+    app.register_blueprint(api_bp)
+    register_commands(app)
+    if app.config['INSTRUMENTATION']:
+        from .instrumentation import init_instrumentation
+        init_instrumentation(app)
+    return app
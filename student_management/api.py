@@ -0,0 +1,155 @@
+"""JSON API for students under /api/students.
+
+List reads are plain Core selects over only the requested columns
+(`fields=name,email`; id is always included) with the listing's keyset
+pagination and filters, so no ORM objects are built. Bodies are encoded with
+orjson when it is installed and gzip-compressed for clients that accept it.
+"""
+import gzip
+import json
+
+from flask import Blueprint, Response, request, url_for
+
+from .extensions import db
+from .listing import STALE_CURSOR, StaleCursor, listing_filters, listing_rows, page_args, split_page
+from .models import LISTING_COLUMNS, Student
+from .validation import ValidationError, validate_student
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+GZIP_MIN_SIZE = 1024
+FIELDS = {column.key: column for column in LISTING_COLUMNS}
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+
+def _dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def _json(payload, status=200, headers=None):
+    return Response(_dumps(payload), status=status, headers=headers,
+                    mimetype='application/json')
+
+
+def _error(status, message, **extra):
+    return _json(dict(error=message, **extra), status)
+
+
+def _columns(args):
+    requested = [name.strip() for name in args.get('fields', '').split(',') if name.strip()]
+    unknown = [name for name in requested if name not in FIELDS]
+    if unknown:
+        return None, unknown
+    names = ['id'] + [name for name in requested if name != 'id'] if requested else list(FIELDS)
+    return [FIELDS[name] for name in names], None
+
+
+def _payload():
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+
+@bp.after_request
+def _compress(response):
+    if (response.direct_passthrough or response.status_code < 200
+            or 'Content-Encoding' in response.headers
+            or not request.accept_encodings['gzip']):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@bp.route('/students')
+def list_students():
+    columns, unknown = _columns(request.args)
+    if unknown:
+        return _error(400, 'Unknown fields.', fields=unknown)
+    after, limit, sort = page_args(request.args)
+    filters = listing_filters(request.args)
+    try:
+        rows = listing_rows(after, limit, sort, filters, columns)
+    except StaleCursor:
+        return _error(400, STALE_CURSOR)
+    rows, next_after = split_page(rows, limit)
+    keys = [column.key for column in columns]
+    return _json({
+        'data': [dict(zip(keys, row)) for row in rows],
+        'next_after': next_after,
+    })
+
+
+@bp.route('/students/<int:id>')
+def get_student(id):
+    columns, unknown = _columns(request.args)
+    if unknown:
+        return _error(400, 'Unknown fields.', fields=unknown)
+    row = db.session.execute(db.select(*columns).where(Student.id == id)).first()
+    if row is None:
+        return _error(404, 'Student not found.')
+    return _json(dict(zip((column.key for column in columns), row)))
+
+
+def _write(statement, values):
+    try:
+        result = db.session.execute(statement, values)
+        db.session.commit()
+    except db.exc.IntegrityError:
+        db.session.rollback()
+        return None, _error(409, 'Validation failed.', errors={'email': 'is already in use'})
+    return result, None
+
+
+@bp.route('/students', methods=['POST'])
+def create_student():
+    data = _payload()
+    if data is None:
+        return _error(400, 'Expected a JSON object.')
+    try:
+        values = validate_student(data)
+    except ValidationError as exc:
+        return _error(422, 'Validation failed.', errors=exc.errors)
+    result, error = _write(db.insert(Student.__table__), values)
+    if error:
+        return error
+    id = result.inserted_primary_key[0]
+    return _json(dict(values, id=id), 201,
+                 {'Location': url_for('api.get_student', id=id)})
+
+
+@bp.route('/students/<int:id>', methods=['PATCH'])
+def update_student(id):
+    data = _payload()
+    if data is None:
+        return _error(400, 'Expected a JSON object.')
+    try:
+        values = validate_student(data, partial=True)
+    except ValidationError as exc:
+        return _error(422, 'Validation failed.', errors=exc.errors)
+    if not values:
+        return _error(400, 'Nothing to update.')
+    result, error = _write(db.update(Student.__table__).where(Student.id == id), values)
+    if error:
+        return error
+    if not result.rowcount:
+        return _error(404, 'Student not found.')
+    return get_student(id)
+
+
+@bp.route('/students/<int:id>', methods=['DELETE'])
+def delete_student(id):
+    deleted = Student.query.filter_by(id=id).delete()
+    db.session.commit()
+    if not deleted:
+        return _error(404, 'Student not found.')
+    return Response(status=204)
@@ -0,0 +1,76 @@
+import click
+from flask.cli import with_appcontext
+
+from .database import init_db
+from .extensions import db
+from .importer import IMPORT_BATCH_SIZE, import_format, import_students
+from .listing import PAGE_SIZE, filtered
+from .models import LISTING_COLUMNS, Student
+from .views import SEARCH_SQL
+
+# Representative queries and the plan steps each one must have.
+PLAN_CHECKS = [
+    ('email lookup', lambda: Student.query.filter_by(email='a@example.com'),
+     ('INDEX ix_student_email ',)),
+    ('listing by course', lambda: filtered(
+        Student.query.with_entities(*LISTING_COLUMNS), {'course': 'X'}
+    ).filter(Student.id > 0).order_by(Student.id).limit(PAGE_SIZE + 1),
+     ('INDEX ix_student_course ',)),
+    ('course and age range', lambda: filtered(
+        Student.query.with_entities(*LISTING_COLUMNS),
+        {'course': 'X', 'min_age': 18, 'max_age': 25},
+    ), ('INDEX ix_student_course_age ',)),
+    # FTS5 marks a MATCH it answers from the index with M in the idxStr.
+    ('search', lambda: SEARCH_SQL.bindparams(match='"sar"*', limit=PAGE_SIZE),
+     ('SCAN student_fts VIRTUAL TABLE INDEX', ':M', 'SEARCH student USING INTEGER PRIMARY KEY')),
+]
+
+def explain(query):
+    statement = getattr(query, 'statement', query)
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    return [row[-1] for row in rows]
+
+def plan_matches(plan, steps):
+    return all(any(step in line for line in plan) for step in steps)
+
+@click.command('migrate')
+@with_appcontext
+def migrate_command():
+    """Create missing tables and apply pending schema migrations."""
+    try:
+        applied = init_db()
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(f'Applied migrations: {applied}' if applied else 'Schema is up to date.')
+
+@click.command('check-plans')
+@with_appcontext
+def check_plans_command():
+    """Fail unless the listing, lookup, filter and search queries use their indexes."""
+    failed = False
+    for label, build, steps in PLAN_CHECKS:
+        plan = explain(build())
+        ok = plan_matches(plan, steps)
+        failed = failed or not ok
+        click.echo(f"{'ok  ' if ok else 'FAIL'} {label}: {' / '.join(plan)}")
+    if failed:
+        raise SystemExit(1)
+
+@click.command('import-students')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']))
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True)
+@with_appcontext
+def import_students_command(path, fmt, batch_size):
+    """Bulk import students from a CSV or JSON-lines file."""
+    with open(path, 'rb') as stream:
+        report = import_students(stream, import_format(path, fmt), batch_size)
+    for error in report['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"Imported {report['inserted']} rows, {report['failed']} failed "
+               f"in {report['seconds']}s ({report['rows_per_sec']} rows/sec)")
+
+def register_commands(app):
+    for command in (migrate_command, check_plans_command, import_students_command):
+        app.cli.add_command(command)
@@ -0,0 +1,25 @@
+import os
+
+
+class Config:
+    # None means sqlite:///<instance path>/students.db, resolved in create_app()
+    # so the database location never depends on the working directory.
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+    SQLITE_POOL = os.environ.get('SQLITE_POOL')
+    SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', 5))
+    LISTING_CACHE_SIZE = int(os.environ.get('LISTING_CACHE_SIZE', 256))
+    INSTRUMENTATION = os.environ.get('INSTRUMENTATION', '') == '1'
+    # Create missing tables and apply pending migrations in create_app(); with
+    # AUTO_MIGRATE=0 run `flask --app app migrate` before serving.
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', '1') == '1'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '') == '1'
+
+
+class TestingConfig(Config):
+    TESTING = True
+    # Private in-memory database; Flask-SQLAlchemy pins it to one connection.
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLITE_PROFILE = 'default'
+    SQLITE_POOL = None
+    INSTRUMENTATION = False
@@ -0,0 +1,170 @@
+from flask import current_app
+from sqlalchemy import pool
+
+from .extensions import db
+
+# Connection-level settings applied to every new SQLite connection. The
+# production profile lets readers proceed while a write is in flight (WAL),
+# drops the fsync per commit to checkpoints only (synchronous=NORMAL) and
+# waits for locks instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+    },
+}
+POOL_CLASSES = {
+    'queue': pool.QueuePool,
+    'null': pool.NullPool,
+    'static': pool.StaticPool,
+    'singleton': pool.SingletonThreadPool,
+}
+
+def sqlite_engine_options(pool_name=None, pool_size=5):
+    if not pool_name:
+        return {}
+    options = {'poolclass': POOL_CLASSES[pool_name]}
+    if pool_name == 'queue':
+        options.update(pool_size=pool_size, max_overflow=pool_size)
+    return options
+
+def sqlite_pragma_listener(pragmas):
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+    return apply_pragmas
+
+DUPLICATE_EMAILS_SQL = (
+    "SELECT email, group_concat(id, ', ') FROM student WHERE email IS NOT NULL "
+    'GROUP BY email HAVING COUNT(*) > 1 ORDER BY email'
+)
+
+def email_index_is_unique(cursor):
+    """True / False for the unique flag of ix_student_email, None without it."""
+    for row in cursor.execute('PRAGMA index_list(student)').fetchall():
+        if row[1] == 'ix_student_email':
+            return bool(row[2])
+    return None
+
+def index_student_email(cursor):
+    # Rows that already share an email would make CREATE UNIQUE INDEX fail
+    # and block every later migration, so they are reported and the index
+    # is built non-unique; migrate() makes it unique once they are fixed.
+    duplicates = cursor.execute(DUPLICATE_EMAILS_SQL).fetchall()
+    for email, ids in duplicates:
+        current_app.logger.warning('Students %s share the email %s; ix_student_email stays '
+                                   'non-unique until they are fixed', ids, email)
+    unique = not duplicates
+    if email_index_is_unique(cursor) is unique:
+        return
+    cursor.execute('DROP INDEX IF EXISTS ix_student_email')
+    cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX ix_student_email ON student (email)")
+
+# Versioned schema migrations for databases created before a change to the
+# model. Each entry is applied once, in order, in its own transaction; a step
+# is SQL or a function taking the cursor. Applied numbers are recorded in
+# schema_migration, so a failing migration does not hold back the ones after
+# it (PRAGMA user_version, used before, still marks 1..N as applied). Append
+# only.
+MIGRATIONS = [
+    # 1: secondary indexes for email lookups and course / age filters
+    [
+        index_student_email,
+        'CREATE INDEX IF NOT EXISTS ix_student_course ON student (course)',
+        'CREATE INDEX IF NOT EXISTS ix_student_course_age ON student (course, age)',
+    ],
+    # 2: FTS5 index over name / email / course, kept in sync by triggers so
+    # every write path (ORM, bulk SQL, sqlite shell) updates it
+    [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+        "name, email, course, content='student', content_rowid='id', prefix='2 3')",
+        'CREATE TRIGGER IF NOT EXISTS student_fts_ai AFTER INSERT ON student BEGIN '
+        'INSERT INTO student_fts (rowid, name, email, course) '
+        'VALUES (new.id, new.name, new.email, new.course); END',
+        'CREATE TRIGGER IF NOT EXISTS student_fts_ad AFTER DELETE ON student BEGIN '
+        "INSERT INTO student_fts (student_fts, rowid, name, email, course) "
+        "VALUES ('delete', old.id, old.name, old.email, old.course); END",
+        'CREATE TRIGGER IF NOT EXISTS student_fts_au AFTER UPDATE OF name, email, course '
+        'ON student BEGIN '
+        "INSERT INTO student_fts (student_fts, rowid, name, email, course) "
+        "VALUES ('delete', old.id, old.name, old.email, old.course); "
+        'INSERT INTO student_fts (rowid, name, email, course) '
+        'VALUES (new.id, new.name, new.email, new.course); END',
+        "INSERT INTO student_fts (student_fts) VALUES ('rebuild')",
+    ],
+    # 3: table-level change counter behind the listing's ETag / Last-Modified,
+    # bumped by triggers on every write path
+    [
+        'CREATE TABLE IF NOT EXISTS student_version ('
+        'id INTEGER PRIMARY KEY CHECK (id = 1), '
+        'version INTEGER NOT NULL, updated_at REAL NOT NULL)',
+        "INSERT OR IGNORE INTO student_version VALUES "
+        "(1, 0, (julianday('now') - 2440587.5) * 86400.0)",
+    ] + [
+        f'CREATE TRIGGER IF NOT EXISTS student_version_{suffix} AFTER {operation} ON student '
+        'BEGIN UPDATE student_version SET version = version + 1, '
+        "updated_at = (julianday('now') - 2440587.5) * 86400.0 WHERE id = 1; END"
+        for suffix, operation in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE'))
+    ],
+]
+
+def applied_migrations(cursor):
+    cursor.execute('CREATE TABLE IF NOT EXISTS schema_migration (number INTEGER PRIMARY KEY)')
+    version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    cursor.executemany('INSERT OR IGNORE INTO schema_migration VALUES (?)',
+                       [(number,) for number in range(1, version + 1)])
+    return {row[0] for row in cursor.execute('SELECT number FROM schema_migration')}
+
+def migrate():
+    """Apply every pending migration; returns the numbers applied.
+
+    A failing migration is rolled back and the rest still run; RuntimeError
+    then names every failure.
+    """
+    applied, failures = [], []
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        done = applied_migrations(cursor)
+        connection.commit()
+        pending = [number for number in range(1, len(MIGRATIONS) + 1) if number not in done]
+        if email_index_is_unique(cursor) is False and 1 not in pending:
+            pending.insert(0, 1)
+        for number in pending:
+            try:
+                # Workers starting together take turns here; whoever comes
+                # second finds the migration already recorded.
+                cursor.execute('BEGIN IMMEDIATE')
+                if number not in done and cursor.execute(
+                        'SELECT 1 FROM schema_migration WHERE number = ?', (number,)).fetchone():
+                    cursor.execute('COMMIT')
+                    continue
+                for step in MIGRATIONS[number - 1]:
+                    if callable(step):
+                        step(cursor)
+                    else:
+                        cursor.execute(step)
+                cursor.execute('INSERT OR IGNORE INTO schema_migration VALUES (?)', (number,))
+                cursor.execute('COMMIT')
+            except Exception as exc:
+                connection.rollback()
+                failures.append(f'Migration {number} failed and was rolled back: {exc}')
+                continue
+            if number not in done:
+                applied.append(number)
+    finally:
+        connection.close()
+    if failures:
+        raise RuntimeError('; '.join(failures))
+    return applied
+
+def init_db():
+    """Create missing tables and bring the schema up to the latest migration."""
+    db.create_all()
+    return migrate()
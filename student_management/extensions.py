@@ -0,0 +1,5 @@
+from flask_sqlalchemy import SQLAlchemy
+
+# Bound to an application in create_app(); importing this module never
+# creates an engine or touches a database.
+db = SQLAlchemy()
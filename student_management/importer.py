@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import time
+
+from .extensions import db
+from .models import Student
+from .validation import validate_student
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+def _import_records(lines, fmt):
+    # Lazily yields (line number, raw record); nothing is read ahead beyond
+    # what the csv module / text wrapper buffers. A malformed CSV record is
+    # yielded as its csv.Error so the reader can carry on with the next one.
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # line_num has not counted the line the error was found on.
+                yield reader.line_num + 1, exc
+                continue
+            yield reader.line_num, record
+    else:
+        for number, line in enumerate(lines, start=1):
+            if line.strip():
+                yield number, line
+
+def _import_row(record):
+    if isinstance(record, csv.Error):
+        raise ValueError(f'malformed CSV: {record}')
+    if isinstance(record, str):
+        record = json.loads(record)
+        if not isinstance(record, dict):
+            raise ValueError('expected a JSON object')
+    return validate_student(record)
+
+def _insert_batch(batch, report):
+    try:
+        db.session.execute(db.insert(Student), [row for _, row in batch])
+        db.session.commit()
+        report['inserted'] += len(batch)
+        return
+    except db.exc.IntegrityError:
+        db.session.rollback()
+    # Some row in the batch violates a constraint: retry row by row inside
+    # savepoints so the good rows still land in one transaction.
+    for line, row in batch:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(db.insert(Student), row)
+            report['inserted'] += 1
+        except db.exc.IntegrityError as exc:
+            _import_error(report, line, str(exc.orig))
+    db.session.commit()
+
+def _import_error(report, line, message):
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'line': line, 'error': message})
+
+def import_students(stream, fmt, batch_size=IMPORT_BATCH_SIZE):
+    """Stream CSV / JSON-lines rows from a binary stream into the student table."""
+    report = {'inserted': 0, 'failed': 0, 'errors': []}
+    started = time.perf_counter()
+    lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    batch, line = [], 0
+    try:
+        for line, record in _import_records(lines, fmt):
+            try:
+                batch.append((line, _import_row(record)))
+            except ValueError as exc:
+                _import_error(report, line, str(exc))
+                continue
+            if len(batch) >= batch_size:
+                _insert_batch(batch, report)
+                batch = []
+    except UnicodeDecodeError as exc:
+        # The wrapper cannot decode past this point. Keep the rows read so
+        # far and report the rest of the file as one error, past the cap.
+        report['failed'] += 1
+        report['errors'].append({'line': line + 1, 'error': f'not valid UTF-8 at or after this line '
+                                                            f'({exc.reason}); the rest of the file was not imported'})
+    if batch:
+        _insert_batch(batch, report)
+    lines.detach()
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    processed = report['inserted'] + report['failed']
+    report['rows_per_sec'] = round(processed / report['seconds']) if report['seconds'] else processed
+    return report
+
+def import_format(filename, requested=None):
+    if requested in ('csv', 'jsonl'):
+        return requested
+    return 'csv' if (filename or '').lower().endswith('.csv') else 'jsonl'
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import Counter
+
+from flask import (Response, before_render_template, current_app, g, has_request_context,
+                   request, template_rendered)
+from sqlalchemy import event
+
+from .extensions import db
+
+# Opt-in per-request instrumentation (INSTRUMENTATION=1): wall time, SQL
+# statement count and time, template render time and repeated-statement
+# (N+1) detection, aggregated per endpoint and served at /_metrics in the
+# Prometheus text format. Cost per request is a handful of perf_counter()
+# calls and one lock acquisition.
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+N_PLUS_ONE_THRESHOLD = 10
+METRIC_HELP = {
+    'requests_total': ('counter', 'Requests handled.'),
+    'request_duration_seconds': ('histogram', 'Wall time per request.'),
+    'sql_statements_total': ('counter', 'SQL statements executed.'),
+    'sql_duration_seconds_total': ('counter', 'Time spent executing SQL.'),
+    'template_render_seconds_total': ('counter', 'Time spent rendering templates.'),
+    'n_plus_one_total': ('counter', 'Requests that repeated one statement '
+                                    f'{N_PLUS_ONE_THRESHOLD}+ times.'),
+}
+
+def _request_metrics():
+    if has_request_context():
+        return g.get('request_metrics')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    metrics = _request_metrics()
+    if metrics is not None:
+        metrics['sql_count'] += 1
+        metrics['sql_seconds'] += elapsed
+        metrics['statements'][statement] += 1
+
+def _handle_error(exception_context):
+    # after_cursor_execute never runs for a failed statement; drop its start
+    # so later statements are not paired with it.
+    connection = exception_context.connection
+    starts = connection.info.get('query_start') if connection is not None else None
+    if starts:
+        starts.pop()
+
+def _before_render(sender, template, context, **extra):
+    metrics = _request_metrics()
+    if metrics is not None:
+        metrics['render_started'] = time.perf_counter()
+
+def _after_render(sender, template, context, **extra):
+    metrics = _request_metrics()
+    if metrics is not None and 'render_started' in metrics:
+        metrics['render_seconds'] += time.perf_counter() - metrics.pop('render_started')
+
+def _start_request_metrics():
+    g.request_metrics = {'started': time.perf_counter(), 'sql_count': 0, 'sql_seconds': 0.0,
+                         'render_seconds': 0.0, 'statements': Counter()}
+
+def _record_request_metrics(response):
+    metrics = g.pop('request_metrics', None)
+    if metrics is None or request.endpoint == 'metrics':
+        return response
+    wall = time.perf_counter() - metrics['started']
+    statement, repeats = max(metrics['statements'].items(), key=lambda item: item[1],
+                             default=(None, 0))
+    n_plus_one = repeats >= N_PLUS_ONE_THRESHOLD
+    if n_plus_one:
+        current_app.logger.warning('Possible N+1 in %s: statement ran %d times: %s',
+                                   request.endpoint, repeats, statement)
+    endpoint = request.endpoint or 'unmatched'
+    state = current_app.extensions['request_metrics']
+    with state['lock']:
+        entry = state['endpoints'].setdefault(endpoint, {
+            'requests_total': 0, 'duration_sum': 0.0, 'buckets': [0] * len(REQUEST_BUCKETS),
+            'sql_statements_total': 0, 'sql_duration_seconds_total': 0.0,
+            'template_render_seconds_total': 0.0, 'n_plus_one_total': 0,
+        })
+        entry['requests_total'] += 1
+        entry['duration_sum'] += wall
+        for i, bound in enumerate(REQUEST_BUCKETS):
+            if wall <= bound:
+                entry['buckets'][i] += 1
+        entry['sql_statements_total'] += metrics['sql_count']
+        entry['sql_duration_seconds_total'] += metrics['sql_seconds']
+        entry['template_render_seconds_total'] += metrics['render_seconds']
+        entry['n_plus_one_total'] += n_plus_one
+    if current_app.config['SERVER_TIMING']:
+        response.headers['Server-Timing'] = ', '.join([
+            f"app;dur={wall * 1000:.2f}",
+            f"sql;dur={metrics['sql_seconds'] * 1000:.2f};desc=\"{metrics['sql_count']} queries\"",
+            f"render;dur={metrics['render_seconds'] * 1000:.2f}",
+        ])
+    return response
+
+def metrics():
+    lines = []
+    state = current_app.extensions['request_metrics']
+    with state['lock']:
+        snapshot = {endpoint: dict(entry, buckets=list(entry['buckets']))
+                    for endpoint, entry in state['endpoints'].items()}
+    for name, (kind, help_text) in METRIC_HELP.items():
+        metric = f'student_app_{name}'
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        for endpoint, entry in sorted(snapshot.items()):
+            label = f'endpoint="{endpoint}"'
+            if kind == 'histogram':
+                for bound, count in zip(REQUEST_BUCKETS, entry['buckets']):
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {entry["requests_total"]}')
+                lines.append(f'{metric}_sum{{{label}}} {entry["duration_sum"]:.6f}')
+                lines.append(f'{metric}_count{{{label}}} {entry["requests_total"]}')
+            else:
+                lines.append(f'{metric}{{{label}}} {entry[name]}')
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+def init_instrumentation(app):
+    app.extensions['request_metrics'] = {'endpoints': {}, 'lock': threading.Lock()}
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(db.engine, 'handle_error', _handle_error)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.before_request(_start_request_metrics)
+    app.after_request(_record_request_metrics)
+    app.add_url_rule('/_metrics', 'metrics', metrics)
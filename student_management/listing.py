@@ -0,0 +1,144 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import current_app, render_template
+from werkzeug.http import is_resource_modified, parse_date
+
+from .extensions import db
+from .models import LISTING_COLUMNS, Student
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+SORT_COLUMNS = ('id', 'name', 'course')
+
+def listing_filters(args):
+    filters = {
+        'course': args.get('course', '').strip() or None,
+        'min_age': args.get('min_age', type=int),
+        'max_age': args.get('max_age', type=int),
+    }
+    return {key: value for key, value in filters.items() if value is not None}
+
+def filtered(query, filters):
+    if 'course' in filters:
+        query = query.filter(Student.course == filters['course'])
+    if 'min_age' in filters:
+        query = query.filter(Student.age >= filters['min_age'])
+    if 'max_age' in filters:
+        query = query.filter(Student.age <= filters['max_age'])
+    return query
+
+def page_args(args):
+    limit = args.get('limit', PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sort = args.get('sort', 'id')
+    if sort not in SORT_COLUMNS:
+        sort = 'id'
+    return args.get('after', type=int), limit, sort
+
+STALE_CURSOR = 'The student this page starts after no longer exists; start again from the first page.'
+
+class StaleCursor(LookupError):
+    """The `after` row of a keyset page sorted by name or course is gone."""
+
+def cursor_statement(after, sort):
+    # For a non-id sort the cursor is (sort value, id) of the `after` row;
+    # its sort value is read first so a deleted row can be told apart from
+    # a NULL one. None when the page needs no lookup.
+    if after is None or sort == 'id':
+        return None
+    return db.select(getattr(Student, sort)).where(Student.id == after)
+
+def cursor_key(row, after):
+    if row is None:
+        raise StaleCursor(after)
+    return row[0]
+
+def listing_statement(after, limit, sort, filters, columns=LISTING_COLUMNS, key=None):
+    # Keyset pagination: seek past the last row of the previous page instead
+    # of OFFSET, so every page costs the same no matter how deep it is. key
+    # is the `after` row's sort value from cursor_statement(). SQLite sorts
+    # NULLs first, so after a NULL key come the remaining NULLs by id and
+    # then every non-NULL value.
+    statement = filtered(db.select(*columns), filters)
+    column = getattr(Student, sort)
+    if after is not None:
+        if sort == 'id':
+            statement = statement.where(Student.id > after)
+        elif key is None:
+            statement = statement.where(db.or_(
+                db.and_(column.is_(None), Student.id > after),
+                column.is_not(None),
+            ))
+        else:
+            statement = statement.where(db.or_(
+                column > key,
+                db.and_(column == key, Student.id > after),
+            ))
+    if sort != 'id':
+        statement = statement.order_by(column)
+    return statement.order_by(Student.id).limit(limit + 1)
+
+def split_page(rows, limit):
+    next_after = rows[limit - 1].id if len(rows) > limit else None
+    return rows[:limit], next_after
+
+def listing_rows(after, limit, sort, filters, columns=LISTING_COLUMNS):
+    """One page of rows plus one; raises StaleCursor for a deleted `after` row."""
+    key, lookup = None, cursor_statement(after, sort)
+    if lookup is not None:
+        key = cursor_key(db.session.execute(lookup).first(), after)
+    return db.session.execute(listing_statement(after, limit, sort, filters, columns, key)).all()
+
+def listing_page(after, limit, sort, filters):
+    return split_page(listing_rows(after, limit, sort, filters), limit)
+
+VERSION_SQL = db.text('SELECT version, updated_at FROM student_version WHERE id = 1')
+
+# Rendered listing pages keyed by (page, filters), one cache per app. Every
+# entry belongs to a single table version; the first request that sees a
+# newer version drops them all, so a write anywhere invalidates the cache.
+def init_listing_cache(app):
+    app.extensions['listing_cache'] = {
+        'pages': OrderedDict(), 'version': None, 'lock': threading.Lock(),
+    }
+
+def cached_listing(version, key):
+    cache = current_app.extensions['listing_cache']
+    with cache['lock']:
+        if version != cache['version']:
+            cache['pages'].clear()
+            cache['version'] = version
+        elif key in cache['pages']:
+            cache['pages'].move_to_end(key)
+            return cache['pages'][key]
+
+def cache_listing(version, key, html):
+    cache = current_app.extensions['listing_cache']
+    with cache['lock']:
+        if version == cache['version']:
+            cache['pages'][key] = html
+            while len(cache['pages']) > current_app.config['LISTING_CACHE_SIZE']:
+                cache['pages'].popitem(last=False)
+
+def listing_validators(version, updated_at, after, limit, sort, filters):
+    key = (after, limit, sort, tuple(sorted(filters.items())))
+    etag = hashlib.sha1(f'{version}:{key}'.encode()).hexdigest()[:16]
+    return key, etag, datetime.fromtimestamp(updated_at, timezone.utc)
+
+def listing_not_modified(environ, etag, updated_at):
+    # Last-Modified only has whole seconds while the version can change
+    # several times within one, so If-Modified-Since alone answers 304 only
+    # when the last change is more than a second older than the header;
+    # everything else is decided by the ETag.
+    since = parse_date(environ.get('HTTP_IF_MODIFIED_SINCE'))
+    if ('HTTP_IF_NONE_MATCH' not in environ and since is not None
+            and updated_at < since.timestamp() - 1):
+        return True
+    return not is_resource_modified(environ, etag=etag)
+
+def render_listing(students, next_after, after, limit, sort, filters):
+    return render_template('index.html', students=students, next_after=next_after,
+                           after=after, limit=limit, sort=sort, filters=filters)
@@ -0,0 +1,15 @@
+from .extensions import db
+
+
+class Student(db.Model):
+    __table_args__ = (db.Index('ix_student_course_age', 'course', 'age'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100))
+    email = db.Column(db.String(100), unique=True, index=True)
+    course = db.Column(db.String(100), index=True)
+    age = db.Column(db.Integer)
+
+# Only the columns the listing template renders; rows come back as plain
+# tuples instead of fully tracked Student objects.
+LISTING_COLUMNS = (Student.id, Student.name, Student.email, Student.course, Student.age)
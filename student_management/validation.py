@@ -0,0 +1,103 @@
+"""Validation and type coercion for Student payloads.
+
+One validator is compiled from the Student columns at import time: every
+String column gets a strip / required / max-length check sized from its
+declared length, Integer columns are coerced with int(), and a few fields
+get extra rules (email format, age range). The form routes, the bulk import
+and any JSON client share it, so bad rows are rejected before they reach
+SQLite.
+"""
+import re
+
+from sqlalchemy import Integer, String
+
+from .models import Student
+
+EMAIL_PATTERN = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s.]+')
+AGE_RANGE = (0, 150)
+
+
+class ValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__('; '.join(f'{field}: {message}' for field, message in errors.items()))
+        self.errors = errors
+
+
+def _string_field(max_length):
+    def coerce(value):
+        if value is None:
+            raise ValueError('is required')
+        value = str(value).strip()
+        if not value:
+            raise ValueError('is required')
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f'must be at most {max_length} characters')
+        return value
+    return coerce
+
+
+def _integer_field():
+    def coerce(value):
+        if isinstance(value, bool):
+            raise ValueError('must be a whole number')
+        if isinstance(value, int):
+            return value
+        try:
+            return int(str(value).strip())
+        except (TypeError, ValueError):
+            raise ValueError('must be a whole number') from None
+    return coerce
+
+
+def _email(value):
+    if not EMAIL_PATTERN.fullmatch(value):
+        raise ValueError('is not a valid email address')
+    return value.lower()
+
+
+def _age(value):
+    low, high = AGE_RANGE
+    if not low <= value <= high:
+        raise ValueError(f'must be between {low} and {high}')
+    return value
+
+
+EXTRA_RULES = {'email': _email, 'age': _age}
+
+
+def compile_validator(model, extra_rules=EXTRA_RULES):
+    """Build a fast validate(record, partial=False) function for a model."""
+    fields = []
+    for column in model.__table__.columns:
+        if column.primary_key:
+            continue
+        if isinstance(column.type, String):
+            coerce = _string_field(column.type.length)
+        elif isinstance(column.type, Integer):
+            coerce = _integer_field()
+        else:
+            continue
+        fields.append((column.key, coerce, extra_rules.get(column.key)))
+    fields = tuple(fields)
+
+    def validate(record, partial=False):
+        row, errors = {}, None
+        for name, coerce, rule in fields:
+            if partial and name not in record:
+                continue
+            try:
+                value = coerce(record.get(name))
+                row[name] = rule(value) if rule else value
+            except ValueError as exc:
+                if errors is None:
+                    errors = {}
+                errors[name] = str(exc)
+        if errors:
+            raise ValidationError(errors)
+        return row
+
+    return validate
+
+
+validate_student = compile_validator(Student)
+
@@ -0,0 +1,230 @@
+import csv
+import io
+import json
+import re
+
+from flask import (Blueprint, Response, abort, jsonify, redirect, render_template, request,
+                   stream_with_context, url_for)
+from werkzeug.exceptions import BadRequest
+
+from .extensions import db
+from .importer import import_format, import_students
+from .listing import (MAX_PAGE_SIZE, PAGE_SIZE, STALE_CURSOR, VERSION_SQL, StaleCursor,
+                      cache_listing, cached_listing, filtered, listing_filters, listing_not_modified,
+                      listing_page, listing_validators, page_args, render_listing)
+from .models import LISTING_COLUMNS, Student
+from .validation import ValidationError, validate_student
+
+bp = Blueprint('students', __name__)
+
+@bp.errorhandler(StaleCursor)
+def stale_cursor(exc):
+    return BadRequest(STALE_CURSOR).get_response()
+
+@bp.route('/')
+def index():
+    after, limit, sort = page_args(request.args)
+    filters = listing_filters(request.args)
+    try:
+        version, updated_at = db.session.execute(VERSION_SQL).one()
+    except db.exc.OperationalError:
+        # No student_version before migration 3: render without validators
+        # or the page cache.
+        db.session.rollback()
+        students, next_after = listing_page(after, limit, sort, filters)
+        return render_listing(students, next_after, after, limit, sort, filters)
+    key, etag, last_modified = listing_validators(version, updated_at, after, limit, sort, filters)
+    if listing_not_modified(request.environ, etag, updated_at):
+        response = Response(status=304)
+    else:
+        html = cached_listing(version, key)
+        if html is None:
+            students, next_after = listing_page(after, limit, sort, filters)
+            html = render_listing(students, next_after, after, limit, sort, filters)
+            cache_listing(version, key, html)
+        response = Response(html, mimetype='text/html')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+SEARCH_TERM = re.compile(r'\w+')
+SEARCH_SQL = db.text(
+    'SELECT student.id, student.name, student.email, student.course, student.age '
+    'FROM student_fts JOIN student ON student.id = student_fts.rowid '
+    'WHERE student_fts MATCH :match ORDER BY student_fts.rank LIMIT :limit'
+)
+
+def _match_expression(q):
+    # Every word must match as a prefix: "sar gma" -> "sar"* "gma"*. Quoting
+    # each term keeps FTS5 operators in user input from being interpreted.
+    return ' '.join(f'"{term}"*' for term in SEARCH_TERM.findall(q))
+
+@bp.route('/search')
+def search():
+    q = request.args.get('q', '').strip()
+    match = _match_expression(q)
+    if not match:
+        return redirect(url_for('students.index'))
+    limit = max(1, min(request.args.get('limit', PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    students = db.session.execute(SEARCH_SQL, {'match': match, 'limit': limit}).all()
+    return render_template('index.html', students=students, next_after=None,
+                           after=None, limit=limit, sort='id', filters={}, q=q)
+
+@bp.route('/import', methods=['GET', 'POST'])
+def import_view():
+    if request.method == 'GET':
+        return render_template('import_students.html', report=None)
+    upload = request.files.get('file')
+    if upload is not None and upload.filename:
+        fmt = import_format(upload.filename, request.form.get('format'))
+        stream = upload.stream
+    else:
+        # Raw request body, e.g. curl --data-binary @students.csv
+        fmt = import_format(None, request.args.get('format') or
+                             ('csv' if request.mimetype == 'text/csv' else None))
+        stream = io.BufferedReader(request.stream)
+    report = import_students(stream, fmt)
+    if request.accept_mimetypes.best == 'application/json' or upload is None:
+        return jsonify(report)
+    return render_template('import_students.html', report=report)
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = tuple(column.key for column in LISTING_COLUMNS)
+
+def _export_chunks(filters):
+    # yield_per keeps the DB cursor open and fetches fixed-size partitions,
+    # so only one chunk of rows is ever held in memory.
+    query = filtered(Student.query.with_entities(*LISTING_COLUMNS), filters)
+    result = db.session.execute(query.order_by(Student.id).statement,
+                                execution_options={'yield_per': EXPORT_CHUNK_SIZE})
+    yield from result.partitions()
+
+def _export_response(generate, mimetype, filename):
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@bp.route('/export.csv')
+def export_csv():
+    filters = listing_filters(request.args)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        # Header goes out before the query runs so the first byte is immediate.
+        yield buffer.getvalue()
+        for chunk in _export_chunks(filters):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(chunk)
+            yield buffer.getvalue()
+
+    return _export_response(generate, 'text/csv', 'students.csv')
+
+@bp.route('/export.jsonl')
+def export_jsonl():
+    filters = listing_filters(request.args)
+
+    def generate():
+        yield ''
+        for chunk in _export_chunks(filters):
+            yield ''.join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in chunk)
+
+    return _export_response(generate, 'application/x-ndjson', 'students.jsonl')
+
+def _save_student(student, form):
+    # Returns field errors, or None once the row is committed.
+    try:
+        values = validate_student(form)
+    except ValidationError as exc:
+        return exc.errors
+    for field, value in values.items():
+        setattr(student, field, value)
+    db.session.add(student)
+    try:
+        db.session.commit()
+    except db.exc.IntegrityError:
+        db.session.rollback()
+        return {'email': 'is already in use'}
+
+@bp.route('/add', methods=['GET','POST'])
+def add_student():
+    if request.method == 'POST':
+        errors = _save_student(Student(), request.form)
+        if not errors:
+            return redirect(url_for('students.index'))
+        return render_template('add_student.html', form=request.form, errors=errors), 400
+    return render_template('add_student.html', form={}, errors={})
+
+@bp.route('/edit/<int:id>', methods=['GET', 'POST'])
+def edit_student(id):
+    student = Student.query.get_or_404(id)
+
+    if request.method == 'POST':
+        errors = _save_student(student, request.form)
+        if not errors:
+            return redirect(url_for('students.index'))
+        return render_template('edit_student.html', student=request.form, errors=errors), 400
+
+    return render_template('edit_student.html', student=student, errors={})
+
+@bp.route('/delete/<int:id>')
+def delete(id):
+    deleted = Student.query.filter_by(id=id).delete()
+    db.session.commit()
+    if not deleted:
+        abort(404)
+    return redirect(url_for('students.index'))
+
+# Form field -> Student column a bulk update may set.
+BULK_UPDATE_FIELDS = {'set_course': 'course', 'set_age': 'age'}
+
+def _bulk_selection(form):
+    # Explicit ids and listing filters combine (ids within the filter);
+    # refusing an empty selection keeps a stray POST from touching every row.
+    ids = form.getlist('ids', type=int)
+    filters = listing_filters(form)
+    if not ids and not filters:
+        abort(400, 'Select students or a filter first.')
+    query = filtered(Student.query, filters)
+    if ids:
+        query = query.filter(Student.id.in_(ids))
+    return ids, filters, query
+
+def _bulk_values(form):
+    record = {column: form[field] for field, column in BULK_UPDATE_FIELDS.items()
+              if form.get(field, '').strip()}
+    if not record:
+        abort(400, 'Nothing to update.')
+    try:
+        values = validate_student(record, partial=True)
+    except ValidationError as exc:
+        abort(400, str(exc))
+    return {getattr(Student, column): value for column, value in values.items()}
+
+def _confirm_bulk(action, ids, filters, query, values=None):
+    return render_template('confirm_bulk.html', action=action, ids=ids, filters=filters,
+                           count=query.count(), values=values or {})
+
+@bp.route('/students/bulk-delete', methods=['POST'])
+def bulk_delete():
+    ids, filters, query = _bulk_selection(request.form)
+    if not request.form.get('confirm'):
+        return _confirm_bulk('bulk_delete', ids, filters, query)
+    # One set-based DELETE, one transaction, one fsync.
+    query.delete(synchronize_session=False)
+    db.session.commit()
+    return redirect(url_for('students.index'))
+
+@bp.route('/students/bulk-update', methods=['POST'])
+def bulk_update():
+    ids, filters, query = _bulk_selection(request.form)
+    values = _bulk_values(request.form)
+    if not request.form.get('confirm'):
+        form_values = {field: request.form[field] for field in BULK_UPDATE_FIELDS
+                       if request.form.get(field, '').strip()}
+        return _confirm_bulk('bulk_update', ids, filters, query, form_values)
+    query.update(values, synchronize_session=False)
+    db.session.commit()
+    return redirect(url_for('students.index'))
@@ -0,0 +1,21 @@
+"""EXPLAIN QUERY PLAN checks for the queries `flask check-plans` covers."""
+import pytest
+
+from student_management import create_app, init_db
+from student_management.cli import PLAN_CHECKS, explain, plan_matches
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    path = tmp_path_factory.mktemp('plans') / 'students.db'
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+                      'AUTO_MIGRATE': False, 'INSTRUMENTATION': False})
+    with app.app_context():
+        init_db()
+        yield app
+
+
+@pytest.mark.parametrize('label, build, steps', PLAN_CHECKS, ids=[check[0] for check in PLAN_CHECKS])
+def test_query_uses_index(app, label, build, steps):
+    plan = explain(build())
+    assert plan_matches(plan, steps), f"{label}: {' / '.join(plan)}"